@@ -1,15 +1,25 @@
+from datetime import datetime
 from decimal import Decimal
 
 from pydantic import BaseModel, Field
 
 from app.models.order import OrderStatus
 from app.models.product import ProductType
+from app.models.tag import TagMatch
 
 
 class OrderPath(BaseModel):
     order_id: str
 
 
+class AdminOrderQuery(BaseModel):
+    status: OrderStatus | None = None
+    inserted_from: datetime | None = Field(None, description="Only orders placed at or after this time")
+    inserted_to: datetime | None = Field(None, description="Only orders placed before this time")
+    limit: int | None = Field(None, ge=1, le=200, description="Page size. Every order is returned when omitted")
+    cursor: str | None = Field(None, description="`next_cursor` of the previous page")
+
+
 class OrderStatusUpdate(BaseModel):
     status: OrderStatus = Field(..., description="New order status")
 
@@ -36,6 +46,9 @@ class AdminProductQuery(BaseModel):
     search: str | None = None
     type: ProductType | None = None
     tag_ids: str | None = Field(None, description="Comma-separated list of tag IDs to filter by")
+    tag_match: TagMatch = Field(TagMatch.any, description="Match items with any or all of the tags")
+    limit: int | None = Field(None, ge=1, le=200, description="Page size. Every product is returned when omitted")
+    cursor: str | None = Field(None, description="`next_cursor` of the previous page")
 
 
 class ProductPath(BaseModel):
@@ -50,6 +63,7 @@ class ProductCreate(BaseModel):
     order: int = 0
     is_active: bool = True
     type: ProductType = ProductType.product
+    stock: int | None = Field(None, ge=0, description="Units left to sell; null to sell without tracking stock")
 
 
 class ProductUpdate(BaseModel):
@@ -60,6 +74,7 @@ class ProductUpdate(BaseModel):
     order: int | None = None
     is_active: bool | None = None
     type: ProductType | None = None
+    stock: int | None = Field(None, ge=0, description="Units left to sell; null to sell without tracking stock")
 
 
 # Translation models
@@ -86,6 +101,7 @@ class VariationCreate(BaseModel):
     image_url: str | None = None
     order: int | None = None
     is_active: bool = True
+    stock: int | None = Field(None, ge=0, description="Units left to sell; null to sell without tracking stock")
 
 
 class VariationUpdate(BaseModel):
@@ -94,6 +110,7 @@ class VariationUpdate(BaseModel):
     image_url: str | None = None
     order: int | None = None
     is_active: bool | None = None
+    stock: int | None = Field(None, ge=0, description="Units left to sell; null to sell without tracking stock")
 
 
 # Variation translation models
@@ -123,6 +140,10 @@ class ReorderRequest(BaseModel):
     items: list[ReorderItem] = Field(..., description="List of items with their new order positions")
 
 
+class CloneProductsRequest(BaseModel):
+    product_ids: list[int] = Field(..., min_length=1, max_length=500, description="IDs of the products to clone")
+
+
 # Image upload models
 class ImageUploadRequest(BaseModel):
     content_type: str = Field(..., description="MIME type of the image (e.g., 'image/jpeg')")
@@ -2,19 +2,18 @@ from http import HTTPStatus
 from typing import Any
 
 import flask
-import sqlalchemy as sa
 from dependency_injector.wiring import Provide, inject
 from flask_openapi3.blueprint import APIBlueprint
 from flask_openapi3.models.tag import Tag
 
 from app.container import ApplicationContainer
+from app.controllers import OrderController
 from app.db import db
 from app.middlewares.admin_auth import require_admin_auth
 from app.models import Order
-from app.models.order import OrderStatus
 from app.repos import OrderRepo
 
-from .models import OrderPath, OrderStatusUpdate, OrderUpdate
+from .models import AdminOrderQuery, OrderPath, OrderStatusUpdate, OrderUpdate
 
 orders_bp = APIBlueprint(
     "admin_orders",
@@ -44,46 +43,38 @@ def _order_to_admin_dict(order: Order) -> dict[str, Any]:
                 "image_url": image_url,
                 "variation_id": item.variation_id,
                 "variation_name": variation_name,
-                "unit_price": str(item.unit_price),
+                "unit_price": item.unit_price,
                 "quantity": item.quantity,
-                "subtotal": str(item.unit_price * item.quantity),
+                "subtotal": item.unit_price * item.quantity,
             }
         )
     return {
         "id": order.id,
         "label": order.display_label,
-        "status": order.status.value,
-        "total": str(order.total),
+        "status": order.status,
+        "total": order.total,
         "notes": order.notes,
         "items": items,
-        "inserted_at": order.inserted_at.isoformat() if order.inserted_at else None,
-        "updated_at": order.updated_at.isoformat() if order.updated_at else None,
+        "inserted_at": order.inserted_at,
+        "updated_at": order.updated_at,
     }
 
 
-# Define custom sort order for status
-STATUS_SORT_ORDER = {
-    OrderStatus.confirmed: 0,
-    OrderStatus.processed: 1,
-    OrderStatus.cancelled: 2,
-}
-
-
 @orders_bp.get("")
 @require_admin_auth
 @inject
 def list_orders(
+    query: AdminOrderQuery,
     order_repo: OrderRepo = Provide[ApplicationContainer.repos.order],
 ) -> tuple[flask.Response, HTTPStatus]:
-    """List all orders sorted by status (confirmed, processed, cancelled) and updated date."""
-    # Use CASE expression for custom status ordering
-    status_order = sa.case(
-        STATUS_SORT_ORDER,
-        value=Order.status,
-    )
-    orders = order_repo.get_query().order_by(status_order, Order.updated_at.desc()).all()
-    data = [_order_to_admin_dict(o) for o in orders]
-    return flask.jsonify({"data": data}), HTTPStatus.OK
+    """List orders sorted by status (confirmed, processed, cancelled) and updated date, optionally paginated.
+
+    Optionally filter by status and placement date range.
+    """
+    orders_query = order_repo.get_filtered(query.status, query.inserted_from, query.inserted_to)
+    page = order_repo.get_page_of_orders(orders_query, query.limit, query.cursor)
+    data = [_order_to_admin_dict(o) for o in page.items]
+    return flask.jsonify({"data": data, "next_cursor": page.next_cursor}), HTTPStatus.OK
 
 
 @orders_bp.get("/<string:order_id>")
@@ -107,14 +98,14 @@ def update_order_status(
     path: OrderPath,
     body: OrderStatusUpdate,
     order_repo: OrderRepo = Provide[ApplicationContainer.repos.order],
+    order_controller: OrderController = Provide[ApplicationContainer.controllers.order],
 ) -> tuple[flask.Response, HTTPStatus]:
-    """Update order status."""
+    """Update order status. Cancelling an order puts its items back into stock."""
     order = order_repo.get_by_ulid(path.order_id)
     if not order:
         return flask.jsonify({"error": "not_found", "error_description": "Order not found"}), HTTPStatus.NOT_FOUND
 
-    order.status = body.status
-    db.session.commit()
+    order = order_controller.update_status(order, body.status)
     db.session.refresh(order)
 
     return flask.jsonify(_order_to_admin_dict(order)), HTTPStatus.OK
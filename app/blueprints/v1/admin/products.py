@@ -17,9 +17,11 @@ from app.models import (
     ProductVariationTranslation,
 )
 from app.repos import ProductRepo, ProductVariationRepo
+from app.repos.product import PRODUCT_SORT_COLUMNS
 
 from .models import (
     AdminProductQuery,
+    CloneProductsRequest,
     ProductCreate,
     ProductPath,
     ProductUpdate,
@@ -44,21 +46,23 @@ products_bp = APIBlueprint(
 
 def product_to_admin_dict(product: Product) -> dict[str, Any]:
     """Convert product to dict with all translations, variations, and tags for admin."""
-    data = product.as_dict()
+    data = product.serialize()
+    data["stock"] = product.stock
     data["translations"] = [
-        {"language": t.language, "name": t.name, "description": t.description} for t in product.translations
+        {"language": t.language, "name": t.name, "description": t.description} for t in product.translations.values()
     ]
     data["variations"] = [
         {
-            **v.as_dict(),
-            "translations": [{"language": t.language, "name": t.name} for t in v.translations],
+            **v.serialize(),
+            "stock": v.stock,
+            "translations": [{"language": t.language, "name": t.name} for t in v.translations.values()],
         }
         for v in product.variations
     ]
     data["tags"] = [
         {
-            **tag.as_dict(),
-            "translations": [{"language": t.language, "label": t.label} for t in tag.translations],
+            **tag.serialize(),
+            "translations": [{"language": t.language, "label": t.label} for t in tag.translations.values()],
         }
         for tag in product.tags
     ]
@@ -75,25 +79,28 @@ def list_products(
     query: AdminProductQuery,
     product_repo: ProductRepo = Provide[ApplicationContainer.repos.product],
 ) -> tuple[flask.Response, HTTPStatus]:
-    """List all products (including inactive) for admin management. Optionally filter by type, search, or tags."""
-    products_query = product_repo.get_query().order_by(Product.order, Product.inserted_at)
+    """List all products (including inactive) for admin management, optionally paginated.
+
+    Optionally filter by type, search, or tags.
+    """
+    products_query = product_repo.get_query()
+    sort_columns = PRODUCT_SORT_COLUMNS
 
     if query.type:
         products_query = product_repo.filter_by_type(products_query, query.type)
 
     if query.search:
-        search_term = f"%{query.search.lower()}%"
-        products_query = product_repo.filter_by_search(products_query, search_term)
+        products_query, sort_columns = product_repo.search(products_query, query.search)
 
     if query.tag_ids:
         # Parse comma-separated tag IDs
         tag_id_list = [int(tid.strip()) for tid in query.tag_ids.split(",") if tid.strip().isdigit()]
         if tag_id_list:
-            products_query = product_repo.filter_by_tags(products_query, tag_id_list)
+            products_query = product_repo.filter_by_tags(products_query, tag_id_list, query.tag_match)
 
-    products = products_query.all()
-    data = [product_to_admin_dict(p) for p in products]
-    return flask.jsonify({"data": data}), HTTPStatus.OK
+    page = product_repo.get_page_of_products(products_query, query.limit, query.cursor, sort_columns)
+    data = [product_to_admin_dict(p) for p in page.items]
+    return flask.jsonify({"data": data, "next_cursor": page.next_cursor}), HTTPStatus.OK
 
 
 @products_bp.post("")
@@ -112,6 +119,7 @@ def create_product(
         order=body.order,
         is_active=body.is_active,
         type=body.type,
+        stock=body.stock,
     )
     product_repo.persist(product)
     return flask.jsonify(product_to_admin_dict(product)), HTTPStatus.CREATED
@@ -169,6 +177,18 @@ def clone_product(
     return flask.jsonify(product_to_admin_dict(cloned_product)), HTTPStatus.CREATED
 
 
+@products_bp.post("/clone")
+@require_admin_auth
+@inject
+def clone_products(
+    body: CloneProductsRequest,
+    product_controller: ProductController = Provide[ApplicationContainer.controllers.product],
+) -> tuple[flask.Response, HTTPStatus]:
+    """Clone several products at once, e.g. to start a seasonal catalog. Clones none if any product is not found."""
+    cloned_products = product_controller.clone_products(body.product_ids)
+    return flask.jsonify({"data": [product_to_admin_dict(product) for product in cloned_products]}), HTTPStatus.CREATED
+
+
 @products_bp.patch("/reorder")
 @require_admin_auth
 @inject
@@ -176,16 +196,10 @@ def reorder_products(
     body: ReorderRequest,
     product_repo: ProductRepo = Provide[ApplicationContainer.repos.product],
 ) -> tuple[flask.Response, HTTPStatus]:
-    """Bulk update product order positions."""
-    for item in body.items:
-        product = product_repo.get(item.id)
-        if product:
-            product.order = item.order
+    """Bulk update product order positions. Returns the IDs of the products that moved."""
+    updated_ids = product_repo.reorder({item.id: item.order for item in body.items})
     db.session.commit()
-
-    products = product_repo.get_query().order_by(Product.order, Product.inserted_at).all()
-    data = [product_to_admin_dict(p) for p in products]
-    return flask.jsonify({"data": data}), HTTPStatus.OK
+    return flask.jsonify({"updated_ids": updated_ids}), HTTPStatus.OK
 
 
 # ============ Product Translation Endpoints ============
@@ -205,7 +219,7 @@ def create_or_update_translation(
         return flask.jsonify({"error": "not_found", "error_description": "Product not found"}), HTTPStatus.NOT_FOUND
 
     # Check if translation exists
-    existing = next((t for t in product.translations if t.language == body.language), None)
+    existing = product.translations.get(body.language)
     if existing:
         existing.name = body.name
         existing.description = body.description
@@ -236,7 +250,7 @@ def delete_translation(
     if not product:
         return flask.jsonify({"error": "not_found", "error_description": "Product not found"}), HTTPStatus.NOT_FOUND
 
-    translation = next((t for t in product.translations if t.language == path.language), None)
+    translation = product.translations.get(path.language)
     if not translation:
         return (
             flask.jsonify({"error": "not_found", "error_description": "Translation not found"}),
@@ -272,6 +286,7 @@ def create_variation(
         image_url=body.image_url,
         order=body.order or 0,
         is_active=body.is_active,
+        stock=body.stock,
     )
     db.session.add(variation)
     db.session.commit()
@@ -337,19 +352,17 @@ def reorder_variations(
     product_repo: ProductRepo = Provide[ApplicationContainer.repos.product],
     variation_repo: ProductVariationRepo = Provide[ApplicationContainer.repos.product_variation],
 ) -> tuple[flask.Response, HTTPStatus]:
-    """Bulk update variation order positions for a product."""
+    """Bulk update variation order positions for a product. Returns the IDs of the variations that moved."""
     product = product_repo.get(path.product_id)
     if not product:
         return flask.jsonify({"error": "not_found", "error_description": "Product not found"}), HTTPStatus.NOT_FOUND
 
-    for item in body.items:
-        variation = variation_repo.get(item.id)
-        if variation and variation.product_id == product.id:
-            variation.order = item.order
+    # Variations of other products are left untouched.
+    updated_ids = variation_repo.reorder(
+        {item.id: item.order for item in body.items}, ProductVariation.product_id == product.id
+    )
     db.session.commit()
-
-    db.session.refresh(product)
-    return flask.jsonify(product_to_admin_dict(product)), HTTPStatus.OK
+    return flask.jsonify({"updated_ids": updated_ids}), HTTPStatus.OK
 
 
 # ============ Variation Translation Endpoints ============
@@ -374,7 +387,7 @@ def create_or_update_variation_translation(
         return flask.jsonify({"error": "not_found", "error_description": "Variation not found"}), HTTPStatus.NOT_FOUND
 
     # Check if translation exists
-    existing = next((t for t in variation.translations if t.language == body.language), None)
+    existing = variation.translations.get(body.language)
     if existing:
         existing.name = body.name
     else:
@@ -410,7 +423,7 @@ def delete_variation_translation(
     if not variation or variation.product_id != product.id:
         return flask.jsonify({"error": "not_found", "error_description": "Variation not found"}), HTTPStatus.NOT_FOUND
 
-    translation = next((t for t in variation.translations if t.language == path.language), None)
+    translation = variation.translations.get(path.language)
     if not translation:
         return (
             flask.jsonify({"error": "not_found", "error_description": "Translation not found"}),
@@ -90,8 +90,8 @@ class ReorderRequest(BaseModel):
 
 def tag_to_admin_dict(tag: Tag) -> dict[str, Any]:
     """Convert tag to dict with all translations for admin."""
-    data = tag.as_dict()
-    data["translations"] = [{"language": t.language, "label": t.label} for t in tag.translations]
+    data = tag.serialize()
+    data["translations"] = [{"language": t.language, "label": t.label} for t in tag.translations.values()]
     data["is_filterable"] = tag.is_filterable
     data["bg_color"] = tag.bg_color
     data["text_color"] = tag.text_color
@@ -209,16 +209,10 @@ def reorder_tags(
     body: ReorderRequest,
     tag_repo: TagRepo = Provide[ApplicationContainer.repos.tag],
 ) -> tuple[flask.Response, HTTPStatus]:
-    """Bulk update tag order positions."""
-    for item in body.items:
-        tag = tag_repo.get(item.id)
-        if tag:
-            tag.order = item.order
+    """Bulk update tag order positions. Returns the IDs of the tags that moved."""
+    updated_ids = tag_repo.reorder({item.id: item.order for item in body.items})
     db.session.commit()
-
-    tags = tag_repo.get_all().all()
-    data = [tag_to_admin_dict(t) for t in tags]
-    return flask.jsonify({"data": data}), HTTPStatus.OK
+    return flask.jsonify({"updated_ids": updated_ids}), HTTPStatus.OK
 
 
 # ============ Tag Translation Endpoints ============
@@ -238,7 +232,7 @@ def create_or_update_tag_translation(
         return flask.jsonify({"error": "not_found", "error_description": "Tag not found"}), HTTPStatus.NOT_FOUND
 
     # Check if translation exists
-    existing = next((t for t in tag.translations if t.language == body.language), None)
+    existing = tag.translations.get(body.language)
     if existing:
         existing.label = body.label
     else:
@@ -267,7 +261,7 @@ def delete_tag_translation(
     if not tag:
         return flask.jsonify({"error": "not_found", "error_description": "Tag not found"}), HTTPStatus.NOT_FOUND
 
-    translation = next((t for t in tag.translations if t.language == path.language), None)
+    translation = tag.translations.get(path.language)
     if not translation:
         return (
             flask.jsonify({"error": "not_found", "error_description": "Translation not found"}),
@@ -34,14 +34,14 @@ admin_tips_bp = APIBlueprint(
 
 def tip_to_admin_dict(tip: Tip) -> dict[str, Any]:
     """Convert tip to dict with all translations and tags for admin."""
-    data = tip.as_dict()
+    data = tip.serialize()
     data["translations"] = [
-        {"language": t.language, "title": t.title, "description": t.description} for t in tip.translations
+        {"language": t.language, "title": t.title, "description": t.description} for t in tip.translations.values()
     ]
     data["tags"] = [
         {
-            **tag.as_dict(),
-            "translations": [{"language": t.language, "label": t.label} for t in tag.translations],
+            **tag.serialize(),
+            "translations": [{"language": t.language, "label": t.label} for t in tag.translations.values()],
         }
         for tag in tip.tags
     ]
@@ -148,16 +148,10 @@ def reorder_tips(
     body: TipReorderRequest,
     tip_repo: TipRepo = Provide[ApplicationContainer.repos.tip],
 ) -> tuple[flask.Response, HTTPStatus]:
-    """Bulk update tip order positions."""
-    for item in body.items:
-        tip = tip_repo.get(item.id)
-        if tip:
-            tip.order = item.order
+    """Bulk update tip order positions. Returns the IDs of the tips that moved."""
+    updated_ids = tip_repo.reorder({item.id: item.order for item in body.items})
     db.session.commit()
-
-    tips = tip_repo.get_all().all()
-    data = [tip_to_admin_dict(t) for t in tips]
-    return flask.jsonify({"data": data}), HTTPStatus.OK
+    return flask.jsonify({"updated_ids": updated_ids}), HTTPStatus.OK
 
 
 # ============ Tip Translation Endpoints ============
@@ -177,7 +171,7 @@ def create_or_update_tip_translation(
         return flask.jsonify({"error": "not_found", "error_description": "Tip not found"}), HTTPStatus.NOT_FOUND
 
     # Check if translation exists
-    existing = next((t for t in tip.translations if t.language == body.language), None)
+    existing = tip.translations.get(body.language)
     if existing:
         existing.title = body.title
         existing.description = body.description
@@ -208,7 +202,7 @@ def delete_tip_translation(
     if not tip:
         return flask.jsonify({"error": "not_found", "error_description": "Tip not found"}), HTTPStatus.NOT_FOUND
 
-    translation = next((t for t in tip.translations if t.language == path.language), None)
+    translation = tip.translations.get(path.language)
     if not translation:
         return (
             flask.jsonify({"error": "not_found", "error_description": "Translation not found"}),
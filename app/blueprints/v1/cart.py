@@ -1,3 +1,4 @@
+from decimal import Decimal
 from http import HTTPStatus
 from typing import Any
 
@@ -15,50 +16,35 @@ from app.blueprints.v1.models import (
 )
 from app.container import ApplicationContainer
 from app.controllers import CartController
-from app.models.cart import Cart
+from app.repos import CartView
 
 cart_bp = APIBlueprint("cart", __name__, abp_tags=[Tag(name="cart")], url_prefix="/api/v1/cart")
 
 
-def _cart_to_dict(cart: Cart, language: str | None = None) -> dict[str, Any]:
+def _cart_to_dict(cart: CartView) -> dict[str, Any]:
     """Convert cart to dict with computed total."""
     items = []
-    total = 0.0
-    for item in cart.items:
-        # Use variation price if available, otherwise product price
-        unit_price = item.variation.price if item.variation and item.variation.price else item.product.price
-        item_total = float(unit_price) * item.quantity
+    total = Decimal("0.00")
+    for line in cart.lines:
+        item_total = line.unit_price * line.quantity
         total += item_total
-
-        translation = item.product.get_translation(language)
-        product_name = translation.name if translation else item.product.name
-
-        # Get variation name with translation and image
-        variation_name = None
-        image_url = item.product.image_url
-        if item.variation:
-            variation_translation = item.variation.get_translation(language)
-            variation_name = variation_translation.name if variation_translation else item.variation.name
-            if item.variation.image_url:
-                image_url = item.variation.image_url
-
         items.append(
             {
-                "id": item.id,
-                "product_id": item.product_id,
-                "product_name": product_name,
-                "image_url": image_url,
-                "variation_id": item.variation_id,
-                "variation_name": variation_name,
-                "unit_price": str(unit_price),
-                "quantity": item.quantity,
-                "subtotal": str(round(item_total, 2)),
+                "id": line.id,
+                "product_id": line.product_id,
+                "product_name": line.product_name,
+                "image_url": line.image_url,
+                "variation_id": line.variation_id,
+                "variation_name": line.variation_name,
+                "unit_price": line.unit_price,
+                "quantity": line.quantity,
+                "subtotal": item_total,
             }
         )
     return {
         "token": cart.token,
         "items": items,
-        "total": str(round(total, 2)),
+        "total": total,
     }
 
 
@@ -70,7 +56,7 @@ def create_cart(
 ) -> tuple[flask.Response, HTTPStatus]:
     """Create a new cart."""
     cart = cart_controller.get_or_create_cart(None)
-    return flask.jsonify(_cart_to_dict(cart, query.language)), HTTPStatus.CREATED
+    return flask.jsonify(_cart_to_dict(CartView(token=cart.token, lines=[]))), HTTPStatus.CREATED
 
 
 @cart_bp.get("/<string:token>")
@@ -81,8 +67,8 @@ def get_cart(
     cart_controller: CartController = Provide[ApplicationContainer.controllers.cart],
 ) -> tuple[flask.Response, HTTPStatus]:
     """Get cart by token."""
-    cart = cart_controller.get_cart(path.token)
-    return flask.jsonify(_cart_to_dict(cart, query.language)), HTTPStatus.OK
+    cart = cart_controller.get_cart_view(path.token, query.language)
+    return flask.jsonify(_cart_to_dict(cart)), HTTPStatus.OK
 
 
 @cart_bp.post("/<string:token>/items")
@@ -94,8 +80,9 @@ def add_item(
     cart_controller: CartController = Provide[ApplicationContainer.controllers.cart],
 ) -> tuple[flask.Response, HTTPStatus]:
     """Add an item to the cart."""
-    cart = cart_controller.add_item(path.token, body.product_id, body.variation_id, body.quantity)
-    return flask.jsonify(_cart_to_dict(cart, query.language)), HTTPStatus.OK
+    token = cart_controller.add_item(path.token, body.product_id, body.variation_id, body.quantity)
+    cart = cart_controller.get_cart_view(token, query.language)
+    return flask.jsonify(_cart_to_dict(cart)), HTTPStatus.OK
 
 
 @cart_bp.put("/<string:token>/items/<int:item_id>")
@@ -107,8 +94,9 @@ def update_item(
     cart_controller: CartController = Provide[ApplicationContainer.controllers.cart],
 ) -> tuple[flask.Response, HTTPStatus]:
     """Update item quantity in cart."""
-    cart = cart_controller.update_item_quantity(path.token, path.item_id, body.quantity)
-    return flask.jsonify(_cart_to_dict(cart, query.language)), HTTPStatus.OK
+    cart_controller.update_item_quantity(path.token, path.item_id, body.quantity)
+    cart = cart_controller.get_cart_view(path.token, query.language)
+    return flask.jsonify(_cart_to_dict(cart)), HTTPStatus.OK
 
 
 @cart_bp.delete("/<string:token>/items/<int:item_id>")
@@ -3,9 +3,22 @@ from http import HTTPStatus
 import flask
 from flask_openapi3.blueprint import APIBlueprint, Tag
 
+from app.db import connection_metrics, pool_metrics
+from app.middlewares.admin_auth import require_admin_auth
+
 health_bp = APIBlueprint("health", __name__, abp_tags=[Tag(name="health")], url_prefix="/api/v1/health")
 
 
 @health_bp.get("")
 def ping() -> tuple[flask.Response, HTTPStatus]:
     return flask.jsonify({"status": "success"}), HTTPStatus.OK
+
+
+@health_bp.get("/database")
+@require_admin_auth
+def database_metrics() -> tuple[flask.Response, HTTPStatus]:
+    """Get the database reconnect counters and connection pool metrics of the worker serving the request."""
+    response = flask.jsonify({"connections": connection_metrics.as_dict(), "pools": pool_metrics()})
+    # Admin only, so unlike the public health check it must not be stored by shared caches.
+    response.headers["Cache-Control"] = "no-store"
+    return response, HTTPStatus.OK
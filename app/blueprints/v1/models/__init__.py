@@ -5,7 +5,7 @@ from app.blueprints.v1.models.cart import (
     UpdateItemRequest,
 )
 from app.blueprints.v1.models.orders import CheckoutRequest, OrderPath
-from app.blueprints.v1.models.products import ProductPath, ProductQuery
+from app.blueprints.v1.models.products import ProductListQuery, ProductPath, ProductQuery
 from app.blueprints.v1.models.tips import (
     TipCreate,
     TipPath,
@@ -23,6 +23,7 @@ __all__ = [
     "CartPath",
     "CheckoutRequest",
     "OrderPath",
+    "ProductListQuery",
     "ProductPath",
     "ProductQuery",
     "TipCreate",
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 
 from app.models.product import ProductType
+from app.models.tag import TagMatch
 
 
 class ProductQuery(BaseModel):
@@ -8,7 +9,13 @@ class ProductQuery(BaseModel):
     search: str | None = None
     type: ProductType | None = None
     tag_ids: str | None = Field(None, description="Comma-separated list of tag IDs to filter by")
+    tag_match: TagMatch = Field(TagMatch.any, description="Match items with any or all of the tags")
 
 
 class ProductPath(BaseModel):
     product_id: int
+
+
+class ProductListQuery(ProductQuery):
+    limit: int | None = Field(None, ge=1, le=200, description="Page size. Every product is returned when omitted")
+    cursor: str | None = Field(None, description="`next_cursor` of the previous page")
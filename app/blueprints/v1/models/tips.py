@@ -2,6 +2,8 @@ from typing import Literal
 
 from pydantic import BaseModel, Field
 
+from app.models.tag import TagMatch
+
 
 class TipPath(BaseModel):
     tip_id: int
@@ -18,6 +20,7 @@ class TipQuery(BaseModel):
         None, description="Filter by tip type ('quick_tip' or 'business')"
     )
     tag_ids: str | None = Field(None, description="Comma-separated tag IDs to filter by")
+    tag_match: TagMatch = Field(TagMatch.any, description="Match items with any or all of the tags")
 
 
 class TipCreate(BaseModel):
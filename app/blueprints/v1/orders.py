@@ -9,6 +9,7 @@ from flask_openapi3.models.tag import Tag
 from app.blueprints.v1.models import CheckoutRequest, OrderPath, ProductQuery
 from app.container import ApplicationContainer
 from app.controllers import OrderController
+from app.middlewares.idempotency import idempotent
 from app.models.order import Order
 
 orders_bp = APIBlueprint("orders", __name__, abp_tags=[Tag(name="orders")], url_prefix="/api/v1/orders")
@@ -37,31 +38,35 @@ def _order_to_dict(order: Order, language: str | None = None) -> dict[str, Any]:
                 "image_url": image_url,
                 "variation_id": item.variation_id,
                 "variation_name": variation_name,
-                "unit_price": str(item.unit_price),
+                "unit_price": item.unit_price,
                 "quantity": item.quantity,
-                "subtotal": str(item.unit_price * item.quantity),
+                "subtotal": item.unit_price * item.quantity,
             }
         )
     return {
         "id": order.id,
         "label": order.display_label,
-        "status": order.status.value,
-        "total": str(order.total),
+        "status": order.status,
+        "total": order.total,
         "notes": order.notes,
         "items": items,
-        "inserted_at": order.inserted_at.isoformat() if order.inserted_at else None,
-        "updated_at": order.updated_at.isoformat() if order.updated_at else None,
+        "inserted_at": order.inserted_at,
+        "updated_at": order.updated_at,
     }
 
 
 @orders_bp.post("")
+@idempotent
 @inject
 def create_order(
     body: CheckoutRequest,
     query: ProductQuery,
     order_controller: OrderController = Provide[ApplicationContainer.controllers.order],
 ) -> tuple[flask.Response, HTTPStatus]:
-    """Create an order from cart (checkout)."""
+    """Create an order from cart (checkout).
+
+    Send an `Idempotency-Key` header to retry safely: retries get the original response instead of a new order.
+    """
     order = order_controller.create_order_from_cart(
         cart_token=body.cart_token,
         contact_info=body.contact_info,
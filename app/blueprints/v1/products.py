@@ -6,38 +6,56 @@ from dependency_injector.wiring import Provide, inject
 from flask_openapi3.blueprint import APIBlueprint
 from flask_openapi3.models.tag import Tag
 
-from app.blueprints.v1.models import ProductPath, ProductQuery
+from app.blueprints.v1.models import ProductListQuery, ProductPath, ProductQuery
 from app.container import ApplicationContainer
+from app.controllers import CatalogController
+from app.controllers.catalog import PRODUCT_KINDS
+from app.middlewares.conditional import catalog_etag
 from app.repos import ProductRepo
+from app.repos.product import PRODUCT_SORT_COLUMNS
 
 products_bp = APIBlueprint("products", __name__, abp_tags=[Tag(name="products")], url_prefix="/api/v1/products")
 
 
 @products_bp.get("")
+@catalog_etag(PRODUCT_KINDS)
 @inject
 def list_products(
-    query: ProductQuery,
+    query: ProductListQuery,
     product_repo: ProductRepo = Provide[ApplicationContainer.repos.product],
+    catalog_controller: CatalogController = Provide[ApplicationContainer.controllers.catalog],
 ) -> tuple[flask.Response, HTTPStatus]:
-    """Get all available products. Optionally filter by type, search term, or tags."""
-    products_query = product_repo.get_all_active(product_type=query.type)
+    """Get available products, optionally paginated. Optionally filter by type, search term, or tags."""
+    # Parse comma-separated tag IDs
+    tag_id_list: list[int] = []
+    if query.tag_ids:
+        tag_id_list = [int(tid.strip()) for tid in query.tag_ids.split(",") if tid.strip().isdigit()]
+
+    # Unfiltered listings are served straight from the pre-rendered catalog cache.
+    if not query.search and not tag_id_list:
+        if query.limit is None and query.cursor is None:
+            payload = catalog_controller.render_products(query.type, query.language)
+            return flask.Response(payload, mimetype="application/json"), HTTPStatus.OK
+
+        rendered = catalog_controller.list_products_page(query.type, query.language, query.limit, query.cursor)
+        return flask.jsonify({"data": rendered.items, "next_cursor": rendered.next_cursor}), HTTPStatus.OK
+
+    products_query = product_repo.in_language(product_repo.get_all_active(product_type=query.type), query.language)
+    sort_columns = PRODUCT_SORT_COLUMNS
 
     if query.search:
-        search_term = f"%{query.search.lower()}%"
-        products_query = product_repo.filter_by_search(products_query, search_term, query.language)
+        products_query, sort_columns = product_repo.search(products_query, query.search, query.language)
 
-    if query.tag_ids:
-        # Parse comma-separated tag IDs
-        tag_id_list = [int(tid.strip()) for tid in query.tag_ids.split(",") if tid.strip().isdigit()]
-        if tag_id_list:
-            products_query = product_repo.filter_by_tags(products_query, tag_id_list)
+    if tag_id_list:
+        products_query = product_repo.filter_by_tags(products_query, tag_id_list, query.tag_match)
 
-    products = products_query.all()
-    data: list[dict[str, Any]] = [product.to_dict_with_language(query.language) for product in products]
-    return flask.jsonify({"data": data}), HTTPStatus.OK
+    page = product_repo.get_page_of_products(products_query, query.limit, query.cursor, sort_columns)
+    data: list[dict[str, Any]] = [product.to_dict_with_language(query.language) for product in page.items]
+    return flask.jsonify({"data": data, "next_cursor": page.next_cursor}), HTTPStatus.OK
 
 
 @products_bp.get("/<int:product_id>")
+@catalog_etag(PRODUCT_KINDS)
 @inject
 def get_product(
     path: ProductPath,
@@ -45,7 +63,7 @@ def get_product(
     product_repo: ProductRepo = Provide[ApplicationContainer.repos.product],
 ) -> tuple[flask.Response, HTTPStatus]:
     """Get a specific product by ID."""
-    product = product_repo.get(str(path.product_id))
+    product = product_repo.get_in_language(path.product_id, query.language)
     if not product or not product.is_active:
         return flask.jsonify({"error": "Product not found"}), HTTPStatus.NOT_FOUND
     return flask.jsonify(product.to_dict_with_language(query.language)), HTTPStatus.OK
@@ -4,12 +4,15 @@ import flask
 from dependency_injector.wiring import Provide, inject
 from flask_openapi3.blueprint import APIBlueprint
 from flask_openapi3.models.tag import Tag as OpenApiTag
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.container import ApplicationContainer
+from app.controllers import CatalogController
+from app.controllers.catalog import PRODUCT_KINDS, TAG_KINDS
+from app.middlewares.conditional import catalog_etag
 from app.models.product import ProductType
+from app.models.tag import TagMatch
 from app.models.tip import TipType
-from app.repos import TagRepo
 
 tags_bp = APIBlueprint("tags", __name__, abp_tags=[OpenApiTag(name="tags")], url_prefix="/api/v1/tags")
 
@@ -20,19 +23,39 @@ class TagsQuery(BaseModel):
     tip_type: TipType | None = None
 
 
+class TagFacetsQuery(BaseModel):
+    language: str | None = None
+    search: str | None = None
+    type: ProductType | None = None
+    tag_ids: str | None = Field(None, description="Comma-separated list of selected tag IDs")
+    tag_match: TagMatch = Field(TagMatch.any, description="Match products with any or all of the selected tags")
+
+
 @tags_bp.get("")
+@catalog_etag(TAG_KINDS)
 @inject
 def list_tags(
     query: TagsQuery,
-    tag_repo: TagRepo = Provide[ApplicationContainer.repos.tag],
+    catalog_controller: CatalogController = Provide[ApplicationContainer.controllers.catalog],
 ) -> tuple[flask.Response, HTTPStatus]:
     """Get all tags, optionally filtered by product type or tip type."""
-    if query.type:
-        tags = tag_repo.get_tags_with_products_by_type(query.type)
-    elif query.tip_type:
-        tags = tag_repo.get_tags_with_tips_by_type(query.tip_type)
-    else:
-        tags = tag_repo.get_all().all()
-
-    data = [tag.to_dict_with_language(query.language) for tag in tags]
-    return flask.jsonify({"data": data}), HTTPStatus.OK
+    payload = catalog_controller.render_tags(query.type, query.tip_type, query.language)
+    return flask.Response(payload, mimetype="application/json"), HTTPStatus.OK
+
+
+@tags_bp.get("/facets")
+@catalog_etag(PRODUCT_KINDS)
+@inject
+def list_tag_facets(
+    query: TagFacetsQuery,
+    catalog_controller: CatalogController = Provide[ApplicationContainer.controllers.catalog],
+) -> tuple[flask.Response, HTTPStatus]:
+    """Get the filterable tags of the active products matching the current selection, with their product counts."""
+    tag_id_list: list[int] = []
+    if query.tag_ids:
+        tag_id_list = [int(tid.strip()) for tid in query.tag_ids.split(",") if tid.strip().isdigit()]
+
+    payload = catalog_controller.render_product_facets(
+        query.type, query.search, tag_id_list, query.tag_match, query.language
+    )
+    return flask.Response(payload, mimetype="application/json"), HTTPStatus.OK
@@ -8,24 +8,33 @@ from flask_openapi3.models.tag import Tag
 
 from app.blueprints.v1.models import TipQuery
 from app.container import ApplicationContainer
+from app.controllers import CatalogController
+from app.controllers.catalog import TIP_KINDS
+from app.middlewares.conditional import catalog_etag
 from app.repos.tip import TipRepo
 
 tips_bp = APIBlueprint("tips", __name__, abp_tags=[Tag(name="tips")], url_prefix="/api/v1/tips")
 
 
 @tips_bp.get("")
+@catalog_etag(TIP_KINDS)
 @inject
 def list_tips(
     query: TipQuery,
     tip_repo: TipRepo = Provide[ApplicationContainer.repos.tip],
+    catalog_controller: CatalogController = Provide[ApplicationContainer.controllers.catalog],
 ) -> tuple[flask.Response, HTTPStatus]:
     """Get all active tips, optionally filtered by tip_type and tags."""
-    tips_query = tip_repo.get_all_active(tip_type=query.tip_type)
-
+    tag_id_list: list[int] = []
     if query.tag_ids:
         tag_id_list = [int(tid.strip()) for tid in query.tag_ids.split(",") if tid.strip().isdigit()]
-        if tag_id_list:
-            tips_query = tip_repo.filter_by_tags(tips_query, tag_id_list)
+
+    if not tag_id_list:
+        payload = catalog_controller.render_tips(query.tip_type, query.language)
+        return flask.Response(payload, mimetype="application/json"), HTTPStatus.OK
+
+    tips_query = tip_repo.in_language(tip_repo.get_all_active(tip_type=query.tip_type), query.language)
+    tips_query = tip_repo.filter_by_tags(tips_query, tag_id_list, query.tag_match)
 
     tips = tips_query.all()
     data: list[dict[str, Any]] = [tip.to_dict_with_language(query.language) for tip in tips]
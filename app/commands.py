@@ -0,0 +1,25 @@
+import click
+from dependency_injector.wiring import Provide, inject
+from flask import Flask
+from flask.cli import AppGroup
+
+from app.container import ApplicationContainer
+from app.controllers import CartController
+
+carts_cli = AppGroup("carts", help="Cart maintenance jobs.")
+
+
+@carts_cli.command("merge-duplicate-lines")
+@click.option("--batch-size", default=500, show_default=True, help="Carts merged per transaction.")
+@inject
+def merge_duplicate_lines(
+    batch_size: int,
+    cart_controller: CartController = Provide[ApplicationContainer.controllers.cart],
+) -> None:
+    """Merge duplicate cart lines of products without variation."""
+    merged = cart_controller.merge_duplicate_lines(batch_size)
+    click.echo(f"Merged {merged} duplicate cart lines")
+
+
+def register_commands(app: Flask) -> None:
+    app.cli.add_command(carts_cli)
@@ -12,11 +12,11 @@ class ApplicationContainer(containers.DeclarativeContainer):
     services = cast(ServiceContainer, providers.Container(ServiceContainer))
     controllers = cast(
         ControllerContainer,
-        providers.Container(ControllerContainer, repos=repos),
+        providers.Container(ControllerContainer, repos=repos, services=services),
     )
 
 
 def get_wire_container() -> ApplicationContainer:
     container = ApplicationContainer()
-    container.wire(packages=["app.blueprints"])
+    container.wire(packages=["app.blueprints", "app.middlewares"], modules=["app.commands"])
     return container
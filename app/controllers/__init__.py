@@ -1,5 +1,6 @@
 from .cart import CartController
+from .catalog import CatalogController
 from .order import OrderController
 from .product import ProductController
 
-__all__ = ["CartController", "OrderController", "ProductController"]
+__all__ = ["CartController", "CatalogController", "OrderController", "ProductController"]
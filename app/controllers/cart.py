@@ -1,8 +1,10 @@
+from typing import NoReturn
+
 from ulid import ULID
 
 from app.exceptions import EntityNotFoundError, InvalidDataError
 from app.models import Cart, CartItem
-from app.repos import CartItemRepo, CartRepo, ProductRepo, ProductVariationRepo
+from app.repos import CartItemRepo, CartRepo, CartView, ProductRepo, ProductVariationRepo
 
 
 class CartController:
@@ -37,47 +39,38 @@ class CartController:
             raise EntityNotFoundError(f"Cart with token {token} not found")
         return cart
 
-    def add_item(
-        self, token: str, product_id: int, variation_id: int | None = None, quantity: int = 1
-    ) -> Cart:
-        """Add a product to the cart."""
+    def get_cart_view(self, token: str, language: str | None = None) -> CartView:
+        """Get what the cart endpoints render of a cart, or raise error."""
+        cart = self._cart_repo.get_view(token, language)
+        if not cart:
+            raise EntityNotFoundError(f"Cart with token {token} not found")
+        return cart
+
+    def add_item(self, token: str, product_id: int, variation_id: int | None = None, quantity: int = 1) -> str:
+        """Add a product to the cart. Returns the token of the cart, which is a new one if the token is unknown."""
         if quantity < 1:
             raise InvalidDataError("Quantity must be at least 1")
 
-        cart = self.get_or_create_cart(token)
-        product = self._product_repo.get(str(product_id))
+        if self._cart_item_repo.add_quantity(token, product_id, variation_id, quantity) is None:
+            if self._cart_repo.get_by_token(token):
+                self._raise_item_not_found(product_id, variation_id)
+            # Unknown tokens get a new cart.
+            token = self.get_or_create_cart(None).token
+            if self._cart_item_repo.add_quantity(token, product_id, variation_id, quantity) is None:
+                self._raise_item_not_found(product_id, variation_id)
 
-        if not product or not product.is_active:
-            raise EntityNotFoundError(f"Product with id {product_id} not found")
+        self._cart_item_repo.commit()
+        return token
 
-        # Validate variation if provided
-        if variation_id is not None:
-            variation = self._product_variation_repo.get(str(variation_id))
-            if not variation or not variation.is_active or variation.product_id != product_id:
-                raise EntityNotFoundError(f"Variation with id {variation_id} not found for product {product_id}")
-
-        # Check if item already exists in cart
-        existing_item = self._cart_item_repo.get_by_cart_and_product(cart.id, product_id, variation_id)
-
-        if existing_item:
-            new_quantity = existing_item.quantity + quantity
-            self._cart_item_repo.update(existing_item, {"quantity": new_quantity})
-        else:
-            cart_item = CartItem(
-                cart_id=cart.id, product_id=product_id, variation_id=variation_id, quantity=quantity
-            )
-            self._cart_item_repo.persist(cart_item)
-
-        # Refresh cart to get updated items
-        return self.get_cart(cart.token)
+    def _raise_item_not_found(self, product_id: int, variation_id: int | None) -> NoReturn:
+        product = self._product_repo.get(product_id)
+        if not product or not product.is_active or variation_id is None:
+            raise EntityNotFoundError(f"Product with id {product_id} not found")
+        raise EntityNotFoundError(f"Variation with id {variation_id} not found for product {product_id}")
 
-    def update_item_quantity(self, token: str, item_id: int, quantity: int) -> Cart:
+    def update_item_quantity(self, token: str, item_id: int, quantity: int) -> None:
         """Update the quantity of an item in the cart."""
-        cart = self.get_cart(token)
-
-        existing_item = self._cart_item_repo.get(str(item_id))
-        if not existing_item or existing_item.cart_id != cart.id:
-            raise EntityNotFoundError(f"Cart item {item_id} not found")
+        existing_item = self._get_item(token, item_id)
 
         if quantity < 1:
             # Remove item if quantity is 0 or less
@@ -85,20 +78,44 @@ class CartController:
         else:
             self._cart_item_repo.update(existing_item, {"quantity": quantity})
 
-        return self.get_cart(token)
-
     def remove_item(self, token: str, item_id: int) -> None:
         """Remove an item from the cart."""
-        cart = self.get_cart(token)
+        existing_item = self._get_item(token, item_id)
+        self._cart_item_repo.remove(existing_item, hard_delete=True)
 
-        existing_item = self._cart_item_repo.get(str(item_id))
-        if not existing_item or existing_item.cart_id != cart.id:
+    def _get_item(self, token: str, item_id: int) -> CartItem:
+        existing_item = self._cart_item_repo.get_in_cart(token, item_id)
+        if not existing_item:
+            if not self._cart_repo.get_view(token):
+                raise EntityNotFoundError(f"Cart with token {token} not found")
             raise EntityNotFoundError(f"Cart item {item_id} not found")
+        return existing_item
 
-        self._cart_item_repo.remove(existing_item, hard_delete=True)
+    def lock_cart(self, token: str) -> int:
+        """Lock a cart until the end of the transaction, or raise error. Returns its id."""
+        cart_id = self._cart_repo.lock_by_token(token)
+        if cart_id is None:
+            raise EntityNotFoundError(f"Cart with token {token} not found")
+        return cart_id
+
+    def delete_cart(self, cart_id: int) -> None:
+        """Delete a cart and its items, leaving the commit to the caller."""
+        self._cart_repo.delete_with_items(cart_id)
 
     def clear_cart(self, token: str) -> None:
         """Remove the cart and all its items."""
         cart = self.get_cart(token)
         # Deleting the cart will cascade delete all items due to relationship config
         self._cart_repo.remove(cart, hard_delete=True)
+
+    def merge_duplicate_lines(self, batch_size: int = 500) -> int:
+        """Merge duplicate lines of products without variation, committing every `batch_size` carts.
+
+        Returns the number of lines merged away.
+        """
+        merged = 0
+        carts = self._cart_repo.get_with_duplicate_lines()
+        for batch in self._cart_repo.get_in_batch(carts, batch_size):
+            # `get_in_batch` commits each batch once it's processed.
+            merged += self._cart_item_repo.merge_duplicate_lines([cart.id for cart in batch])
+        return merged
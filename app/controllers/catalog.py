@@ -0,0 +1,268 @@
+import bisect
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, cast
+
+from flask import Response, current_app
+
+from app.models import (
+    EntityTag,
+    Product,
+    ProductTranslation,
+    ProductType,
+    ProductVariation,
+    ProductVariationTranslation,
+    Tag,
+    TagTranslation,
+    Tip,
+    TipTranslation,
+)
+from app.models.base import BaseModel
+from app.models.events import local_generation
+from app.models.tag import TagMatch
+from app.models.tip import TipType
+from app.repos import CatalogVersionRepo, ProductRepo, TagRepo, TipRepo
+from app.repos.pagination import Page, decode_cursor, encode_cursor, sort_key
+from app.repos.product import PRODUCT_SORT_COLUMNS
+from app.services import SharedMemoryCache
+
+
+def _kinds(*models: type[BaseModel]) -> tuple[str, ...]:
+    return tuple(model.__tablename__ for model in models)
+
+
+# Catalog kinds each cached listing is rendered from; a write to any of them invalidates the listing.
+PRODUCT_KINDS = _kinds(
+    Product, ProductTranslation, ProductVariation, ProductVariationTranslation, Tag, TagTranslation, EntityTag
+)
+# Tag listings filtered by type only include tags used by active products or tips of that type.
+TAG_KINDS = _kinds(Tag, TagTranslation, EntityTag, Product, Tip)
+TIP_KINDS = _kinds(Tip, TipTranslation, Tag, TagTranslation, EntityTag)
+TRANSLATION_KINDS = _kinds(ProductTranslation, ProductVariationTranslation, TagTranslation, TipTranslation)
+
+# Snapshot payloads are keyed by (product type, language). `None` as the type means "all types" and `None` as the
+# language means the untranslated base payload.
+PayloadKey = tuple[ProductType | None, str | None]
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Immutable, pre-rendered view of every active product for a given catalog version."""
+
+    version: str
+    languages: frozenset[str]
+    payloads: Mapping[PayloadKey, tuple[dict[str, Any], ...]]
+    # Listing sort key of every payload item, per product type, for cursor lookups.
+    sort_keys: Mapping[ProductType | None, tuple[tuple[Any, ...], ...]]
+
+    @classmethod
+    def build(cls, version: str, products: list[Product]) -> "CatalogSnapshot":
+        """Render every product once per language and index the results by product type."""
+        languages: set[str] = set()
+        for product in products:
+            languages.update(product.translations)
+            for variation in product.variations:
+                languages.update(variation.translations)
+            for tag in product.tags:
+                languages.update(tag.translations)
+
+        keys = [sort_key(product, PRODUCT_SORT_COLUMNS) for product in products]
+        sort_keys: dict[ProductType | None, tuple[tuple[Any, ...], ...]] = {None: tuple(keys)}
+        for product_type in ProductType:
+            sort_keys[product_type] = tuple(key for key, product in zip(keys, products) if product.type == product_type)
+
+        payloads: dict[PayloadKey, tuple[dict[str, Any], ...]] = {}
+        for language in [None, *sorted(languages)]:
+            rendered = tuple(product.to_dict_with_language(language) for product in products)
+            payloads[(None, language)] = rendered
+            for product_type in ProductType:
+                payloads[(product_type, language)] = tuple(
+                    data for data, product in zip(rendered, products) if product.type == product_type
+                )
+
+        return cls(
+            version=version,
+            languages=frozenset(languages),
+            payloads=MappingProxyType(payloads),
+            sort_keys=MappingProxyType(sort_keys),
+        )
+
+    def get_products(self, product_type: ProductType | None, language: str | None) -> tuple[dict[str, Any], ...]:
+        # Languages without any translation render exactly like the base payload.
+        key_language = language if language in self.languages else None
+        return self.payloads[(product_type, key_language)]
+
+    def get_products_page(
+        self, product_type: ProductType | None, language: str | None, limit: int | None, cursor: str | None
+    ) -> Page[dict[str, Any]]:
+        products = self.get_products(product_type, language)
+        sort_keys = self.sort_keys[product_type]
+        start = 0
+        if cursor:
+            start = bisect.bisect_right(sort_keys, decode_cursor(cursor, PRODUCT_SORT_COLUMNS))
+        end = len(products) if limit is None else min(start + limit, len(products))
+        next_cursor = encode_cursor(sort_keys[end - 1]) if end < len(products) else None
+        return Page(items=list(products[start:end]), next_cursor=next_cursor)
+
+
+class CatalogController:
+    """Serves the public catalog (products, tags and tips) from caches keyed by the catalog versions.
+
+    Rendered payloads are shared between workers through the shared memory cache. Products are additionally kept
+    in an in-process snapshot so a cache miss never needs more than one catalog load per version. Versions are
+    bumped by the catalog change tracking in `app.models.events`; they're re-read from the database at most once
+    per `version_ttl_seconds`, or right away after this process commits a catalog change.
+    """
+
+    def __init__(
+        self,
+        product_repo: ProductRepo,
+        tag_repo: TagRepo,
+        tip_repo: TipRepo,
+        catalog_version_repo: CatalogVersionRepo,
+        shared_cache: SharedMemoryCache,
+        version_ttl_seconds: float,
+    ) -> None:
+        self._product_repo = product_repo
+        self._tag_repo = tag_repo
+        self._tip_repo = tip_repo
+        self._catalog_version_repo = catalog_version_repo
+        self._shared_cache = shared_cache
+        self._version_ttl_seconds = version_ttl_seconds
+        self._versions: dict[str, int] = {}
+        self._versions_loaded_at = float("-inf")
+        self._versions_generation = -1
+        # Translated languages, along with the translation version they were read at.
+        self._languages: tuple[str | None, frozenset[str]] = (None, frozenset())
+        self._snapshot: CatalogSnapshot | None = None
+        self._build_lock = threading.Lock()
+
+    def get_versions(self) -> dict[str, int]:
+        """Get the current version of every catalog kind."""
+        generation = local_generation()
+        now = time.monotonic()
+        if generation != self._versions_generation or now - self._versions_loaded_at >= self._version_ttl_seconds:
+            self._versions = self._catalog_version_repo.get_versions()
+            self._versions_loaded_at = now
+            self._versions_generation = generation
+        return self._versions
+
+    def version_token(self, kinds: tuple[str, ...]) -> str:
+        """Get an opaque token that changes whenever any of the given kinds changes."""
+        versions = self.get_versions()
+        return ".".join(str(versions.get(kind, 0)) for kind in kinds)
+
+    def known_language(self, language: str | None) -> str | None:
+        """Get `language` if the catalog has translations to it, or None, which renders the same base texts.
+
+        Cache keys are built from the known language only, so arbitrary `?language=` values can't fill the cache.
+        """
+        if not language:
+            return None
+        version = self.version_token(TRANSLATION_KINDS)
+        languages_version, languages = self._languages
+        if version != languages_version:
+            languages = frozenset(self._catalog_version_repo.get_languages())
+            self._languages = (version, languages)
+        return language if language in languages else None
+
+    def get_snapshot(self) -> CatalogSnapshot:
+        version = self.version_token(PRODUCT_KINDS)
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        with self._build_lock:
+            # Another thread may have rebuilt the snapshot while we were waiting for the lock.
+            if self._snapshot is None or self._snapshot.version != version:
+                products = self._product_repo.get_all_active().all()
+                self._snapshot = CatalogSnapshot.build(version, products)
+            return self._snapshot
+
+    def list_products(self, product_type: ProductType | None, language: str | None) -> tuple[dict[str, Any], ...]:
+        """Get the rendered active products for a type and language."""
+        return self.get_snapshot().get_products(product_type, language)
+
+    def list_products_page(
+        self, product_type: ProductType | None, language: str | None, limit: int | None, cursor: str | None
+    ) -> Page[dict[str, Any]]:
+        """Get a page of the rendered active products for a type and language."""
+        return self.get_snapshot().get_products_page(product_type, language, limit, cursor)
+
+    def render_products(self, product_type: ProductType | None, language: str | None) -> bytes:
+        """Get the serialized (unpaginated) product listing for a type and language."""
+        language = self.known_language(language)
+        return self._render(
+            f"products:{product_type}:{language}",
+            PRODUCT_KINDS,
+            lambda: {"data": self.list_products(product_type, language), "next_cursor": None},
+        )
+
+    def render_tags(self, product_type: ProductType | None, tip_type: TipType | None, language: str | None) -> bytes:
+        """Get the serialized tag listing, optionally restricted to tags used by a product or tip type."""
+        language = self.known_language(language)
+
+        def build() -> dict[str, Any]:
+            if product_type:
+                tags = self._tag_repo.get_tags_with_products_by_type(product_type, language)
+            elif tip_type:
+                tags = self._tag_repo.get_tags_with_tips_by_type(tip_type, language)
+            else:
+                tags = self._tag_repo.in_language(self._tag_repo.get_all(), language).all()
+            return {"data": [tag.to_dict_with_language(language) for tag in tags]}
+
+        return self._render(f"tags:{product_type}:{tip_type}:{language}", TAG_KINDS, build)
+
+    def render_product_facets(
+        self,
+        product_type: ProductType | None,
+        search: str | None,
+        tag_ids: list[int],
+        tag_match: TagMatch,
+        language: str | None,
+    ) -> bytes:
+        """Get the serialized filterable tags of the active products matching a selection, with their product counts.
+
+        With `all`, every selected tag narrows the products, so tags are counted within the selection. With `any`,
+        selecting a tag widens them instead, so tags are counted over the products matching the type and search only.
+        """
+
+        def build(language: str | None) -> dict[str, Any]:
+            products = self._product_repo.get_all_active(product_type)
+            if search:
+                products, _ = self._product_repo.search(products, search, language)
+            if tag_match == TagMatch.all:
+                products = self._product_repo.filter_by_tags(products, tag_ids, tag_match)
+            facets = self._tag_repo.get_product_facets(products, language)
+            return {"data": [{**tag.to_dict_with_language(language), "product_count": count} for tag, count in facets]}
+
+        if search or (tag_ids and tag_match == TagMatch.all):
+            # Search terms and tag combinations are unbounded, so their facets would crowd every other listing out
+            # of the shared cache.
+            return self._serialize(build(language))
+        language = self.known_language(language)
+        return self._render(f"facets:{product_type}:{language}", PRODUCT_KINDS, lambda: build(language))
+
+    def render_tips(self, tip_type: str | None, language: str | None) -> bytes:
+        """Get the serialized active tip listing for a tip type and language."""
+        language = self.known_language(language)
+
+        def build() -> dict[str, Any]:
+            tips = self._tip_repo.in_language(self._tip_repo.get_all_active(tip_type=tip_type), language).all()
+            return {"data": [tip.to_dict_with_language(language) for tip in tips]}
+
+        return self._render(f"tips:{tip_type}:{language}", TIP_KINDS, build)
+
+    def _render(self, key: str, kinds: tuple[str, ...], build: Callable[[], dict[str, Any]]) -> bytes:
+        version = self.version_token(kinds)
+        payload = self._shared_cache.get(key, version)
+        if payload is None:
+            payload = self._serialize(build())
+            self._shared_cache.set(key, version, payload)
+        return payload
+
+    def _serialize(self, data: dict[str, Any]) -> bytes:
+        # Serialize exactly like `flask.jsonify` so cached and uncached responses are identical.
+        return cast(Response, current_app.json.response(data)).get_data()
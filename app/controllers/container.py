@@ -3,13 +3,17 @@ from typing import cast
 from dependency_injector import containers, providers
 
 from app.controllers.cart import CartController
+from app.controllers.catalog import CatalogController
 from app.controllers.order import OrderController
 from app.controllers.product import ProductController
 from app.repos.container import RepoContainer
+from app.services.container import ServiceContainer
+from app_settings import settings
 
 
 class ControllerContainer(containers.DeclarativeContainer):
     repos = cast(RepoContainer, providers.DependenciesContainer())
+    services = cast(ServiceContainer, providers.DependenciesContainer())
 
     cart = providers.Singleton(
         CartController,
@@ -19,9 +23,20 @@ class ControllerContainer(containers.DeclarativeContainer):
         product_variation_repo=repos.product_variation,
     )
 
+    catalog = providers.Singleton(
+        CatalogController,
+        product_repo=repos.product,
+        tag_repo=repos.tag,
+        tip_repo=repos.tip,
+        catalog_version_repo=repos.catalog_version,
+        shared_cache=services.shared_cache,
+        version_ttl_seconds=settings.cache.version_ttl_seconds,
+    )
+
     order = providers.Singleton(
         OrderController,
         order_repo=repos.order,
+        product_repo=repos.product,
         cart_controller=cart,
     )
 
@@ -1,20 +1,26 @@
 from decimal import Decimal
+from typing import Iterable
 
 from ulid import ULID
 
 from app.controllers.cart import CartController
-from app.exceptions import InvalidDataError
-from app.models import Order, OrderItem, OrderStatus
-from app.repos import OrderRepo
+from app.exceptions import InternalError, InvalidDataError
+from app.models import Order, OrderStatus
+from app.repos import OrderRepo, ProductRepo
+
+# Quantities per product and per variation: items with a variation take its stock, the others their product's.
+StockQuantities = tuple[dict[int, int], dict[int, int]]
 
 
 class OrderController:
     def __init__(
         self,
         order_repo: OrderRepo,
+        product_repo: ProductRepo,
         cart_controller: CartController,
     ) -> None:
         self._order_repo = order_repo
+        self._product_repo = product_repo
         self._cart_controller = cart_controller
 
     def create_order_from_cart(
@@ -23,55 +29,47 @@ class OrderController:
         contact_info: str | None = None,
         notes: str | None = None,
     ) -> Order:
-        """Create an order from cart items."""
-        cart = self._cart_controller.get_cart(cart_token)
+        """Create an order from cart items, reserving their stock, and delete the cart.
+
+        The cart is locked first, so concurrent checkouts of the same cart run one after the other: the later ones
+        find the cart gone. Everything is left to the request's transaction, which commits it at once, or rolls it
+        back (with the reservations) when raising.
+        """
+        cart_id = self._cart_controller.lock_cart(cart_token)
+        cart = self._cart_controller.get_cart_view(cart_token)
 
-        if not cart.items:
+        if not cart.lines:
             raise InvalidDataError("Cart is empty")
 
         # Calculate total and build order items
         total = Decimal("0")
-        order_items: list[OrderItem] = []
-        order_id = str(ULID())
+        order_items: list[tuple[int, int | None, int, Decimal]] = []
+        for line in cart.lines:
+            if not line.product_is_active:
+                raise InvalidDataError(f"Product '{line.product_name}' is no longer available")
+
+            if line.variation_id is not None and not line.variation_is_active:
+                raise InvalidDataError(f"Variation '{line.variation_name}' is no longer available")
 
-        for cart_item in cart.items:
-            product = cart_item.product
-            variation = cart_item.variation
-
-            if not product.is_active:
-                raise InvalidDataError(f"Product '{product.name}' is no longer available")
-
-            if variation and not variation.is_active:
-                raise InvalidDataError(f"Variation '{variation.name}' is no longer available")
-
-            # Use variation price if available, otherwise product price
-            unit_price = variation.price if variation and variation.price else product.price
-            item_total = unit_price * cart_item.quantity
-            total += item_total
-
-            order_item = OrderItem(
-                order_id=order_id,
-                product_id=product.id,
-                variation_id=cart_item.variation_id,
-                quantity=cart_item.quantity,
-                unit_price=unit_price,
-            )
-            order_items.append(order_item)
-
-        # Create order
-        order = Order(
-            id=order_id,
-            status=OrderStatus.confirmed,
-            total=total,
-            notes=notes,
-            items=order_items,
+            total += line.unit_price * line.quantity
+            order_items.append((line.product_id, line.variation_id, line.quantity, line.unit_price))
+
+        short_product_ids, short_variation_ids = self._product_repo.reserve_stock(
+            *_stock_quantities((line.product_id, line.variation_id, line.quantity) for line in cart.lines)
         )
+        for line in cart.lines:
+            if line.variation_id is not None and line.variation_id in short_variation_ids:
+                raise InvalidDataError(f"Not enough stock of variation '{line.variation_name}'")
+            if line.variation_id is None and line.product_id in short_product_ids:
+                raise InvalidDataError(f"Not enough stock of product '{line.product_name}'")
 
-        # Save order and clear cart
-        self._order_repo.persist(order, do_commit=False)
-        self._cart_controller.clear_cart(cart_token)
-        self._order_repo.commit()
+        order_id = str(ULID())
+        self._order_repo.insert_with_items(order_id, total, notes, order_items)
+        self._cart_controller.delete_cart(cart_id)
 
+        order = self._order_repo.get_by_ulid(order_id)
+        if not order:
+            raise InternalError(f"Order {order_id} not found after inserting it")
         return order
 
     def get_order(self, order_id: str) -> Order | None:
@@ -79,7 +77,7 @@ class OrderController:
         return self._order_repo.get_by_ulid(order_id)
 
     def cancel_order(self, order_id: str) -> Order:
-        """Cancel an order."""
+        """Cancel an order, putting its items back into stock."""
         order = self._order_repo.get_by_ulid(order_id)
         if not order:
             raise InvalidDataError(f"Order {order_id} not found")
@@ -87,4 +85,31 @@ class OrderController:
         if order.status == OrderStatus.cancelled:
             raise InvalidDataError("Order is already cancelled")
 
-        return self._order_repo.update(order, {"status": OrderStatus.cancelled})
+        return self.update_status(order, OrderStatus.cancelled)
+
+    def update_status(self, order: Order, status: OrderStatus) -> Order:
+        """Update an order's status, releasing its stock when it's cancelled, and reserving it again if un-cancelled."""
+        # Concurrent updates of the order must not release or reserve its stock twice.
+        self._order_repo.lock(order)
+        if status != order.status:
+            quantities = _stock_quantities((item.product_id, item.variation_id, item.quantity) for item in order.items)
+            if status == OrderStatus.cancelled:
+                self._product_repo.release_stock(*quantities)
+            elif order.status == OrderStatus.cancelled:
+                short_product_ids, short_variation_ids = self._product_repo.reserve_stock(*quantities)
+                if short_product_ids or short_variation_ids:
+                    raise InvalidDataError("Not enough stock to restore the order")
+
+        return self._order_repo.update(order, {"status": status})
+
+
+def _stock_quantities(items: Iterable[tuple[int, int | None, int]]) -> StockQuantities:
+    """Sum the quantities of (product id, variation id, quantity) items per product and per variation to reserve."""
+    product_quantities: dict[int, int] = {}
+    variation_quantities: dict[int, int] = {}
+    for product_id, variation_id, quantity in items:
+        if variation_id is None:
+            product_quantities[product_id] = product_quantities.get(product_id, 0) + quantity
+        else:
+            variation_quantities[variation_id] = variation_quantities.get(variation_id, 0) + quantity
+    return product_quantities, variation_quantities
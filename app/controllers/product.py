@@ -1,10 +1,6 @@
 from app.db import db
-from app.models import (
-    Product,
-    ProductTranslation,
-    ProductVariation,
-    ProductVariationTranslation,
-)
+from app.exceptions import EntityNotFoundError
+from app.models import Product
 from app.repos import ProductRepo
 
 
@@ -17,59 +13,25 @@ class ProductController:
 
         Returns the cloned product or None if the original product was not found.
         """
-        product = self._product_repo.get(product_id)
-        if not product:
+        clone_ids = self._product_repo.clone_products([product_id])
+        if not clone_ids:
             return None
 
-        # Create cloned product with "(Copy)" appended to name
-        cloned_product = Product(
-            name=f"{product.name} (Copy)",
-            description=product.description,
-            price=product.price,
-            image_url=product.image_url,
-            order=product.order,
-            is_active=False,  # Start as inactive so admin can review before publishing
-            type=product.type,
-        )
-        db.session.add(cloned_product)
-        db.session.flush()  # Get the ID for the cloned product
-
-        # Clone translations
-        for translation in product.translations:
-            cloned_translation = ProductTranslation(
-                product_id=cloned_product.id,
-                language=translation.language,
-                name=f"{translation.name} (Copy)",
-                description=translation.description,
-            )
-            db.session.add(cloned_translation)
-
-        # Clone variations with their translations
-        for variation in product.variations:
-            cloned_variation = ProductVariation(
-                product_id=cloned_product.id,
-                name=variation.name,
-                price=variation.price,
-                image_url=variation.image_url,
-                order=variation.order,
-                is_active=variation.is_active,
-            )
-            db.session.add(cloned_variation)
-            db.session.flush()  # Get the ID for the cloned variation
+        db.session.commit()
+        return self._product_repo.get(clone_ids[product_id])
 
-            # Clone variation translations
-            for var_translation in variation.translations:
-                cloned_var_translation = ProductVariationTranslation(
-                    variation_id=cloned_variation.id,
-                    language=var_translation.language,
-                    name=var_translation.name,
-                )
-                db.session.add(cloned_var_translation)
+    def clone_products(self, product_ids: list[int]) -> list[Product]:
+        """Clone several products with all their translations, variations, and tag associations.
 
-        # Clone tag associations
-        for tag in product.tags:
-            cloned_product.tags.append(tag)
+        Either every product is cloned or none is. Returns the clones in the order of `product_ids`.
+        """
+        product_ids = list(dict.fromkeys(product_ids))
+        clone_ids = self._product_repo.clone_products(product_ids)
+        missing_ids = [product_id for product_id in product_ids if product_id not in clone_ids]
+        if missing_ids:
+            # Nothing was committed; the session teardown rolls the copies back.
+            raise EntityNotFoundError(f"Products with ids {missing_ids} not found")
 
         db.session.commit()
-        db.session.refresh(cloned_product)
-        return cloned_product
+        clones = {clone.id: clone for clone in self._product_repo.get_by_ids(list(clone_ids.values()))}
+        return [clones[clone_ids[product_id]] for product_id in product_ids]
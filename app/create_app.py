@@ -22,8 +22,16 @@ from app.blueprints.v1 import (
     tags_bp,
     tips_bp,
 )
-from app.db import db, reconnect_db
+from app.commands import register_commands
+from app.db import REPLICA_BIND_KEY, db, install_connection_resilience, register_write_tracking
 from app.exceptions import BaseError, ErrorType
+from app.json_provider import OrjsonProvider
+from app.middlewares.cache_control import CachePolicy, register_cache_policies
+from app.middlewares.disconnect_retry import register_disconnect_retry
+from app.middlewares.replica import register_replica_reads
+from app.middlewares.transactions import TransactionConfig, register_transaction_handling
+from app.models.events import register_catalog_change_tracking
+from app.models.search_index import register_product_search_indexing
 from app_settings import settings
 from environment import Environment
 
@@ -43,6 +51,47 @@ def _register_endpoints(app: OpenAPI) -> None:
     app.register_api(admin_tips_bp)
 
 
+def _setup_cache_policies(app: OpenAPI) -> None:
+    storefront_policy = CachePolicy(
+        public=True,
+        max_age=settings.cache.public_max_age_seconds,
+        stale_while_revalidate=settings.cache.public_stale_while_revalidate_seconds,
+        vary=("Accept-Language",),
+    )
+    health_policy = CachePolicy(public=True, max_age=settings.cache.health_max_age_seconds)
+    # Admin, cart and order routes (and anything else not listed) fall back to `no-store`.
+    register_cache_policies(
+        app,
+        {
+            health_bp.name: health_policy,
+            products_bp.name: storefront_policy,
+            tags_bp.name: storefront_policy,
+            tips_bp.name: storefront_policy,
+        },
+    )
+
+
+def _setup_transactions(app: OpenAPI) -> None:
+    storefront_timeout = settings.sqlalchemy.storefront_statement_timeout
+    admin_timeout = settings.sqlalchemy.admin_statement_timeout
+    config = TransactionConfig(
+        statement_timeout=settings.sqlalchemy.statement_timeout,
+        idle_in_transaction_timeout=settings.sqlalchemy.idle_in_transaction_session_timeout,
+        blueprint_statement_timeouts={
+            products_bp.name: storefront_timeout,
+            tags_bp.name: storefront_timeout,
+            tips_bp.name: storefront_timeout,
+            admin_auth_bp.name: admin_timeout,
+            admin_documents_bp.name: admin_timeout,
+            admin_orders_bp.name: admin_timeout,
+            admin_products_bp.name: admin_timeout,
+            admin_tags_bp.name: admin_timeout,
+            admin_tips_bp.name: admin_timeout,
+        },
+    )
+    register_transaction_handling(app, db, config)
+
+
 def _setup_error_handlers(app: OpenAPI) -> None:
     @app.errorhandler(HTTPException)
     def handle_http_error(e: HTTPException) -> tuple[Response, HTTPStatus]:
@@ -82,24 +131,31 @@ def create_app() -> OpenAPI:
         info=info,
         doc_ui=settings.environment == Environment.DEVELOPMENT,
     )
+    app.json = OrjsonProvider(app)
     app.config["SQLALCHEMY_DATABASE_URI"] = settings.sqlalchemy.database_url
+    if settings.sqlalchemy.database_replica_url:
+        app.config["SQLALCHEMY_BINDS"] = {REPLICA_BIND_KEY: settings.sqlalchemy.database_replica_url}
     app.logger.setLevel(settings.logging.level)
     app.secret_key = settings.session_key
 
     db.init_app(app)
+    with app.app_context():
+        for engine in db.engines.values():
+            install_connection_resilience(engine, settings.sqlalchemy.pool_ping_after_seconds)
     Migrate(app, db, compare_type=True)
+    register_write_tracking()
+    register_catalog_change_tracking()
+    register_product_search_indexing()
 
     _register_endpoints(app)
+    register_disconnect_retry(app, settings.sqlalchemy.disconnect_retries)
+    _setup_cache_policies(app)
     _setup_error_handlers(app)
+    _setup_transactions(app)
+    if settings.sqlalchemy.database_replica_url:
+        # Admin routes, the cart and writes stay on the primary.
+        register_replica_reads(app, db, {products_bp.name, tags_bp.name, tips_bp.name, orders_bp.name})
     CORS(app, resources={r"/api/v1/*": {"origins": "*"}})
-
-    @app.after_request
-    def after_request(response: Response) -> Response:
-        db.session.commit()
-        return response
-
-    @app.before_request
-    def ensure_db_connection() -> None:
-        reconnect_db(db)
+    register_commands(app)
 
     return app
@@ -1,9 +1,17 @@
 import logging
+import threading
+import time
+from dataclasses import dataclass, field, fields
+from typing import Any
 
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy.exc import DatabaseError
-from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.sql import select, text
+from flask_sqlalchemy.session import Session as FlaskSQLASession
+from sqlalchemy import Connection, Engine, event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import DeclarativeBase, ORMExecuteState, Session, SessionTransaction, UOWTransaction
+from sqlalchemy.pool import ConnectionPoolEntry, PoolProxiedConnection, QueuePool
 
 from app_settings import settings
 
@@ -14,17 +22,224 @@ class FlaskSQABaseModel(DeclarativeBase):
 
 logger = logging.getLogger(__name__)
 
-db = SQLAlchemy(model_class=FlaskSQABaseModel, engine_options=settings.sqlalchemy.engine_options)
+# Bind key of the read replica engine, configured when a replica URL is set.
+REPLICA_BIND_KEY = "replica"
+# Session.info key flagging that the current transaction wrote something.
+HAS_WRITES_KEY = "has_writes"
+# Session.info keys routing the session's reads to the replica, until it writes.
+READS_FROM_REPLICA_KEY = "reads_from_replica"
+PINNED_TO_PRIMARY_KEY = "pinned_to_primary"
 
 
-def reconnect_db(db: SQLAlchemy) -> None:
-    try:
-        db.session.execute(select(text("1"))).all()
-    except DatabaseError:
-        logger.warning("Database connection lost. Trying to reconnect...")
-        db.session.rollback()
-        db.session.close()
-    except Exception:
-        logger.warning("Database connection lost. Trying to reconnect...", stack_info=True)
-        db.session.rollback()
-        db.session.close()
+class RoutingSession(FlaskSQLASession):
+    """Session that sends reads to the read replica when asked to, and everything else to the primary.
+
+    Once the session writes, it sticks to the primary for the rest of its life so it reads its own writes.
+    """
+
+    def get_bind(
+        self,
+        mapper: Any | None = None,
+        clause: Any | None = None,
+        bind: Engine | Connection | None = None,
+        **kwargs: Any,
+    ) -> Engine | Connection:
+        if bind is None and self._reads_from_replica(clause):
+            replica = self._db.engines.get(REPLICA_BIND_KEY)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_from_replica(self, clause: Any | None) -> bool:
+        if not self.info.get(READS_FROM_REPLICA_KEY) or self.info.get(PINNED_TO_PRIMARY_KEY) or self._flushing:
+            return False
+        # Statements run on the bare connection (no clause) may be writes.
+        if clause is None or getattr(clause, "is_dml", False):
+            return False
+        return getattr(clause, "_for_update_arg", None) is None
+
+
+def read_from_replica(session: Session) -> None:
+    """Route the session's reads to the read replica, if there's one, until it writes."""
+    session.info[READS_FROM_REPLICA_KEY] = True
+
+
+@dataclass
+class PoolMetrics:
+    """How long requests waited to check a connection out of a pool."""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    # Includes opening a connection when the pool had none idle.
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record_checkout(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def as_dict(self) -> dict[str, float]:
+        with self._lock:
+            return {item.name: getattr(self, item.name) for item in fields(self) if not item.name.startswith("_")}
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started_at = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - started_at)
+        return entry
+
+    def status_dict(self) -> dict[str, float]:
+        return {
+            **self.metrics.as_dict(),
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+        }
+
+
+def _engine_options() -> dict[str, Any]:
+    # Meter the pool unless pooling is disabled (NullPool).
+    return {"poolclass": MeteredQueuePool, **settings.sqlalchemy.engine_options}
+
+
+db = SQLAlchemy(
+    model_class=FlaskSQABaseModel,
+    engine_options=_engine_options(),
+    session_options={"class_": RoutingSession},
+)
+
+# Connection info key holding when the connection was last returned to the pool.
+CHECKED_IN_AT_KEY = "checked_in_at"
+
+
+@dataclass
+class ConnectionMetrics:
+    """Process-wide counters of how often database connections had to be replaced."""
+
+    # Idle connections pinged on checkout, and those of them found dead and replaced.
+    stale_pings: int = 0
+    stale_reconnects: int = 0
+    # Statements that failed because the connection was lost, and requests retried because of it.
+    disconnects: int = 0
+    request_retries: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def increment(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def as_dict(self) -> dict[str, int]:
+        with self._lock:
+            return {item.name: getattr(self, item.name) for item in fields(self) if not item.name.startswith("_")}
+
+
+connection_metrics = ConnectionMetrics()
+
+
+def pool_metrics() -> dict[str, dict[str, float]]:
+    """Get the checkout metrics and current usage of each engine's pool. Needs an app context."""
+    return {
+        bind_key or "primary": engine.pool.status_dict()
+        for bind_key, engine in db.engines.items()
+        if isinstance(engine.pool, MeteredQueuePool)
+    }
+
+
+def install_connection_resilience(engine: Engine, ping_after_seconds: float) -> None:
+    """Ping pooled connections that sat idle for too long before handing them out, and count disconnects.
+
+    Unlike `pool_pre_ping`, connections reused within `ping_after_seconds` skip the round trip, which covers nearly
+    every checkout under load. Connections dropped by the server while checked out surface as disconnect errors
+    instead (see `app.middlewares.disconnect_retry`).
+    """
+
+    def on_checkin(dbapi_connection: Any, connection_record: ConnectionPoolEntry) -> None:
+        connection_record.info[CHECKED_IN_AT_KEY] = time.monotonic()
+
+    def on_checkout(
+        dbapi_connection: Any, connection_record: ConnectionPoolEntry, connection_proxy: PoolProxiedConnection
+    ) -> None:
+        checked_in_at = connection_record.info.get(CHECKED_IN_AT_KEY)
+        # Fresh connections were just opened, so there's nothing to check.
+        if checked_in_at is None or time.monotonic() - checked_in_at < ping_after_seconds:
+            return
+
+        connection_metrics.increment("stale_pings")
+        try:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+        except Exception as e:
+            connection_metrics.increment("stale_reconnects")
+            logger.warning(f"Discarding stale database connection; error: {e}")
+            # The pool discards the connection and checks out (or opens) another one.
+            raise DisconnectionError() from e
+
+    def on_error(context: ExceptionContext) -> None:
+        if context.is_disconnect:
+            connection_metrics.increment("disconnects")
+            logger.warning("Database connection lost; the pool will reconnect")
+
+    event.listen(engine, "checkin", on_checkin)
+    event.listen(engine, "checkout", on_checkout)
+    event.listen(engine, "handle_error", on_error)
+
+
+def mark_written(session: Session) -> None:
+    """Flag the session's current transaction as having written to the database, and pin its reads to the primary.
+
+    Flushes and ORM insert/update/delete statements are tracked automatically; statements executed on the session's
+    connection directly call this.
+    """
+    session.info[HAS_WRITES_KEY] = True
+    session.info[PINNED_TO_PRIMARY_KEY] = True
+
+
+def has_pending_writes(session: Session) -> bool:
+    """Whether committing the session would write anything."""
+    return bool(session.info.get(HAS_WRITES_KEY) or session.new or session.dirty or session.deleted)
+
+
+def _after_flush(session: Session, flush_context: UOWTransaction) -> None:
+    mark_written(session)
+
+
+def _do_orm_execute(orm_execute_state: ORMExecuteState) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mark_written(orm_execute_state.session)
+
+
+def _after_transaction_end(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(HAS_WRITES_KEY, None)
+
+
+def register_write_tracking() -> None:
+    """Install the session listeners. Safe to call more than once."""
+    listeners = (
+        ("after_flush", _after_flush),
+        ("do_orm_execute", _do_orm_execute),
+        ("after_transaction_end", _after_transaction_end),
+    )
+    for identifier, listener in listeners:
+        if not event.contains(Session, identifier, listener):
+            event.listen(Session, identifier, listener)
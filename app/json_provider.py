@@ -0,0 +1,44 @@
+from decimal import Decimal
+from typing import Any, cast
+
+import orjson
+from flask import Response
+from flask.json.provider import JSONProvider
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        # Keep the exact amount (e.g. "12.50") instead of going through float.
+        return str(value)
+    if hasattr(value, "__html__"):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson.
+
+    datetimes, UUIDs, dataclasses and enums (by value) are serialized natively; Decimals are sent as strings, like
+    Flask's default provider does.
+    """
+
+    sort_keys = False
+    mimetype = "application/json"
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self.dumps_bytes(obj, sort_keys=kwargs.get("sort_keys", self.sort_keys)).decode()
+
+    def dumps_bytes(self, obj: Any, sort_keys: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_default, option=option)
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        payload = self.dumps_bytes(obj, sort_keys=self.sort_keys)
+        response_class = cast(type[Response], self._app.response_class)
+        return response_class(payload + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,49 @@
+from dataclasses import dataclass
+from http import HTTPStatus
+
+import flask
+
+# Only successful and revalidated responses may be stored by browsers or shared caches.
+CACHEABLE_STATUSES = frozenset({HTTPStatus.OK, HTTPStatus.NOT_MODIFIED})
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Cache-Control policy applied to every response of a blueprint."""
+
+    public: bool = False
+    max_age: int = 0
+    stale_while_revalidate: int = 0
+    vary: tuple[str, ...] = ()
+
+    def apply(self, response: flask.Response) -> flask.Response:
+        """Set the caching headers on a response unless the view already chose its own."""
+        if "Cache-Control" in response.headers:
+            return response
+
+        if not self.public or response.status_code not in CACHEABLE_STATUSES:
+            response.headers["Cache-Control"] = "no-store"
+            return response
+
+        response.cache_control.public = True
+        response.cache_control.max_age = self.max_age
+        if self.stale_while_revalidate:
+            response.cache_control.stale_while_revalidate = self.stale_while_revalidate
+        for header in self.vary:
+            response.vary.add(header)
+        return response
+
+
+NO_STORE = CachePolicy()
+
+
+def register_cache_policies(
+    app: flask.Flask, policies: dict[str, CachePolicy], default: CachePolicy = NO_STORE
+) -> None:
+    """Apply each blueprint's cache policy to its responses, and the default policy to everything else."""
+
+    @app.after_request
+    def apply_cache_policy(response: flask.Response) -> flask.Response:
+        blueprint = flask.request.blueprint
+        policy = policies.get(blueprint, default) if blueprint else default
+        return policy.apply(response)
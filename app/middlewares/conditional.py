@@ -0,0 +1,51 @@
+import hashlib
+from functools import wraps
+from http import HTTPStatus
+from typing import Any, Callable
+
+import flask
+from dependency_injector.wiring import Provide, inject
+
+from app.container import ApplicationContainer
+from app.controllers import CatalogController
+
+
+def catalog_etag(kinds: tuple[str, ...]) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator to answer conditional GETs for a catalog route from the catalog versions of the given kinds.
+
+    The ETag is derived from the versions, the route and its query string, so a matching `If-None-Match` gets a 304
+    before the view runs, without loading or serializing anything.
+    """
+
+    def decorator(f: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(f)
+        def decorated_function(*args: Any, **kwargs: Any) -> Any:
+            etag = _compute_etag(kinds)
+            if flask.request.if_none_match.contains_weak(etag):
+                response = flask.Response(status=HTTPStatus.NOT_MODIFIED)
+                response.set_etag(etag)
+                return response
+
+            response = flask.make_response(f(*args, **kwargs))
+            if response.status_code == HTTPStatus.OK:
+                response.set_etag(etag)
+            return response
+
+        return decorated_function
+
+    return decorator
+
+
+@inject
+def _compute_etag(
+    kinds: tuple[str, ...],
+    catalog_controller: CatalogController = Provide[ApplicationContainer.controllers.catalog],
+) -> str:
+    request = flask.request
+    parts = [
+        catalog_controller.version_token(kinds),
+        str(request.endpoint),
+        repr(sorted((request.view_args or {}).items())),
+        repr(sorted(request.args.items(multi=True))),
+    ]
+    return hashlib.sha1("\n".join(parts).encode(), usedforsecurity=False).hexdigest()
@@ -0,0 +1,44 @@
+import functools
+import logging
+from typing import Any, Callable
+
+import flask
+from sqlalchemy.exc import DBAPIError
+
+from app.db import connection_metrics, db
+
+logger = logging.getLogger(__name__)
+
+# Requests that can be replayed without side effects.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def retry_on_disconnect(view: Callable[..., Any], retries: int) -> Callable[..., Any]:
+    """Replay an idempotent request when the database connection it used turns out to be dead."""
+
+    @functools.wraps(view)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        attempt = 0
+        while True:
+            try:
+                return view(*args, **kwargs)
+            except DBAPIError as e:
+                if not e.connection_invalidated or flask.request.method not in IDEMPOTENT_METHODS:
+                    raise
+                if attempt >= retries:
+                    raise
+                attempt += 1
+                connection_metrics.increment("request_retries")
+                logger.warning(f"Retrying {flask.request.method} {flask.request.path} after losing the connection")
+                # Releases the dead connection; the retry checks out a new one.
+                db.session.rollback()
+
+    return wrapper
+
+
+def register_disconnect_retry(app: flask.Flask, retries: int) -> None:
+    """Wrap every registered view so idempotent requests survive a dropped database connection."""
+    if retries <= 0:
+        return
+    for endpoint, view in app.view_functions.items():
+        app.view_functions[endpoint] = retry_on_disconnect(view, retries)
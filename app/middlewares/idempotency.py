@@ -0,0 +1,96 @@
+import hashlib
+from functools import wraps
+from http import HTTPStatus
+from typing import Any, Callable
+
+import flask
+from dependency_injector.wiring import Provide, inject
+
+from app.container import ApplicationContainer
+from app.models import IdempotencyKey
+from app.repos import IdempotencyKeyRepo
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+
+def idempotent(f: Callable[..., Any]) -> Callable[..., Any]:
+    """Decorator to replay the original response of requests retried with the same `Idempotency-Key` header.
+
+    The key is claimed in the request's transaction and its response stored in it, so both commit (or roll back) along
+    with what the view wrote. A concurrent retry waits for the original request to finish, then replays its response.
+    Failed requests aren't stored: they roll back and can be retried. Requests without the header run as usual.
+    """
+
+    @wraps(f)
+    def decorated_function(*args: Any, **kwargs: Any) -> Any:
+        key = flask.request.headers.get(IDEMPOTENCY_KEY_HEADER)
+        if not key:
+            return f(*args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return (
+                flask.jsonify(
+                    {
+                        "error": "invalid_data",
+                        "error_description": f"{IDEMPOTENCY_KEY_HEADER} is longer than {MAX_KEY_LENGTH} characters",
+                    }
+                ),
+                HTTPStatus.BAD_REQUEST,
+            )
+
+        endpoint = str(flask.request.endpoint)
+        request_hash = hashlib.sha256(flask.request.get_data()).hexdigest()
+        previous = _claim(endpoint, key, request_hash)
+        if previous is not None:
+            return _replay(previous, request_hash)
+
+        response = flask.make_response(f(*args, **kwargs))
+        if response.status_code < HTTPStatus.BAD_REQUEST:
+            _store_response(endpoint, key, response)
+        return response
+
+    return decorated_function
+
+
+def _replay(previous: IdempotencyKey, request_hash: str) -> flask.Response | tuple[flask.Response, HTTPStatus]:
+    if previous.request_hash != request_hash:
+        return (
+            flask.jsonify(
+                {
+                    "error": "invalid_data",
+                    "error_description": f"{IDEMPOTENCY_KEY_HEADER} was already used for a different request",
+                }
+            ),
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+        )
+    if previous.response_status is None:
+        # Keys are stored along with their response, so this only happens if something else claimed the key.
+        return (
+            flask.jsonify({"error": "conflict", "error_description": f"{IDEMPOTENCY_KEY_HEADER} has no response"}),
+            HTTPStatus.CONFLICT,
+        )
+    response = flask.jsonify(previous.response_body)
+    response.status_code = previous.response_status
+    response.headers[REPLAYED_HEADER] = "true"
+    return response
+
+
+@inject
+def _claim(
+    endpoint: str,
+    key: str,
+    request_hash: str,
+    idempotency_key_repo: IdempotencyKeyRepo = Provide[ApplicationContainer.repos.idempotency_key],
+) -> IdempotencyKey | None:
+    return idempotency_key_repo.claim(endpoint, key, request_hash)
+
+
+@inject
+def _store_response(
+    endpoint: str,
+    key: str,
+    response: flask.Response,
+    idempotency_key_repo: IdempotencyKeyRepo = Provide[ApplicationContainer.repos.idempotency_key],
+) -> None:
+    idempotency_key_repo.store_response(endpoint, key, response.status_code, response.get_json(silent=True))
@@ -0,0 +1,17 @@
+import flask
+from flask_sqlalchemy import SQLAlchemy
+
+from app.db import read_from_replica
+from app.middlewares.transactions import READ_ONLY_METHODS
+
+
+def register_replica_reads(app: flask.Flask, db: SQLAlchemy, blueprints: set[str]) -> None:
+    """Serve the read requests of the given blueprints from the read replica.
+
+    A request that writes anyway goes back to the primary from then on, so it still reads its own writes.
+    """
+
+    @app.before_request
+    def route_reads_to_replica() -> None:
+        if flask.request.blueprint in blueprints and flask.request.method in READ_ONLY_METHODS:
+            read_from_replica(db.session())
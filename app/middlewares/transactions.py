@@ -0,0 +1,74 @@
+from dataclasses import dataclass, field
+
+import flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import Connection, event, text
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.db import has_pending_writes
+
+# Requests that must not write, served from read-only transactions.
+READ_ONLY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+EXTENSION_KEY = "transactions"
+
+# `set_config(..., true)` is `SET LOCAL`: the settings end with the transaction, so they hold behind pgbouncer's
+# transaction pooling too. All of them are set in a single round trip.
+SET_TIMEOUTS = (
+    "set_config('statement_timeout', :statement_timeout, true), "
+    "set_config('idle_in_transaction_session_timeout', :idle_in_transaction_timeout, true)"
+)
+SET_TIMEOUTS_STATEMENT = text(f"SELECT {SET_TIMEOUTS}")
+SET_READ_ONLY_TIMEOUTS_STATEMENT = text(f"SELECT {SET_TIMEOUTS}, set_config('transaction_read_only', 'on', true)")
+
+
+@dataclass(frozen=True)
+class TransactionConfig:
+    """Postgres timeouts applied to every transaction the app opens, as Postgres settings values (e.g. "5000")."""
+
+    statement_timeout: str
+    idle_in_transaction_timeout: str
+    # Statement timeouts per blueprint, overriding the default one.
+    blueprint_statement_timeouts: dict[str, str] = field(default_factory=dict)
+
+
+def _after_begin(session: Session, transaction: SessionTransaction, connection: Connection) -> None:
+    if not flask.has_app_context():
+        return
+    config: TransactionConfig | None = flask.current_app.extensions.get(EXTENSION_KEY)
+    if config is None:
+        return
+
+    # CLI commands run in an app context only, and get the default timeouts.
+    timeout, read_only = None, False
+    if flask.has_request_context():
+        timeout = config.blueprint_statement_timeouts.get(flask.request.blueprint or "")
+        read_only = flask.request.method in READ_ONLY_METHODS
+    connection.execute(
+        SET_READ_ONLY_TIMEOUTS_STATEMENT if read_only else SET_TIMEOUTS_STATEMENT,
+        {
+            "statement_timeout": timeout or config.statement_timeout,
+            "idle_in_transaction_timeout": config.idle_in_transaction_timeout,
+        },
+    )
+
+
+def register_transaction_handling(app: flask.Flask, db: SQLAlchemy, config: TransactionConfig) -> None:
+    """Commit a request's transaction only when it wrote something, and configure every transaction the app opens.
+
+    Transactions get the statement and idle-in-transaction timeouts, those of the request's blueprint if it has its
+    own, and are read-only for read requests. Transactions opened outside requests, e.g. by CLI commands, get the
+    default timeouts.
+
+    Requests that didn't write, or failed, are left to the session teardown, which rolls back and releases the
+    connection.
+    """
+    app.extensions[EXTENSION_KEY] = config
+    if not event.contains(Session, "after_begin", _after_begin):
+        event.listen(Session, "after_begin", _after_begin)
+
+    @app.after_request
+    def commit_pending_writes(response: flask.Response) -> flask.Response:
+        if response.status_code < 400 and has_pending_writes(db.session()):
+            db.session.commit()
+        return response
@@ -1,6 +1,9 @@
 from .cart import Cart, CartItem
+from .catalog_version import CatalogVersion
+from .idempotency_key import IdempotencyKey
 from .order import Order, OrderItem, OrderStatus
 from .product import Product, ProductTranslation, ProductType
+from .product_search import ProductSearchDocument
 from .product_variation import ProductVariation, ProductVariationTranslation
 from .tag import EntityTag, EntityType, ProductTag, Tag, TagTranslation
 from .tip import Tip, TipTranslation, TipType
@@ -8,12 +11,15 @@ from .tip import Tip, TipTranslation, TipType
 __all__ = [
     "Cart",
     "CartItem",
+    "CatalogVersion",
     "EntityTag",
     "EntityType",
+    "IdempotencyKey",
     "Order",
     "OrderItem",
     "OrderStatus",
     "Product",
+    "ProductSearchDocument",
     "ProductTag",  # Alias for backward compatibility
     "ProductTranslation",
     "ProductType",
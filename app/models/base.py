@@ -2,17 +2,16 @@
 
 from __future__ import annotations
 
-import enum
 import uuid
 from datetime import datetime
 from typing import Any
 
 import sqlalchemy as sa
-from pydantic import BaseModel as PydanticBaseModel
-from sqlalchemy.orm import Mapped, Query, mapped_column
+from sqlalchemy.orm import Mapped, Mapper, Query, mapped_column
 from typing_extensions import Self
 
 from app.db import FlaskSQABaseModel, db
+from app.models.serializer import compile_serializer
 
 
 class BaseModel(FlaskSQABaseModel):
@@ -24,6 +23,11 @@ class BaseModel(FlaskSQABaseModel):
 
     query: Query[Self]
 
+    def serialize(self) -> dict[str, Any]:
+        """Get the visible columns as a dict."""
+        # Mapped classes replace this with their compiled serializer once their mapper is configured.
+        return compile_serializer(self.__mapper__)(self)
+
     def as_dict(
         self,
         levels: int = 1,
@@ -32,29 +36,7 @@ class BaseModel(FlaskSQABaseModel):
         relationships: list[str] | None = None,
     ) -> dict[str, Any]:
         # TODO: Deprecate relationship in favor of explicitly passing relationships to include.
-        data: dict[str, Any] = {}
-        for column in self.__table__.columns:
-            if column.name in self.__hidden_columns__:
-                continue
-
-            raw_value = getattr(self, column.name)
-            value = raw_value
-            if isinstance(raw_value, datetime):
-                value = raw_value.isoformat()
-            if isinstance(raw_value, enum.Enum):
-                value = raw_value.value
-            if isinstance(raw_value, list):
-                new_list = []
-                for item in raw_value:
-                    if isinstance(item, enum.Enum):
-                        new_list.append(item.value)
-                        continue
-                    new_list.append(item)
-                value = new_list
-            if isinstance(raw_value, PydanticBaseModel):
-                value = raw_value.model_dump()
-
-            data[column.name] = value
+        data = self.serialize()
 
         relationships = relationships or []
         if relationship is True or len(relationships) > 0:
@@ -72,6 +54,11 @@ class BaseModel(FlaskSQABaseModel):
         return data
 
 
+@sa.event.listens_for(BaseModel, "mapper_configured", propagate=True)
+def _compile_serializer(mapper: Mapper[BaseModel], cls: type[BaseModel]) -> None:
+    setattr(cls, "serialize", compile_serializer(mapper))
+
+
 class ModelWithId(BaseModel):
     __abstract__ = True
 
@@ -40,4 +40,13 @@ class CartItem(ModelWithId, ModelWithDates):
     product: Mapped["Product"] = relationship("Product", lazy="joined")
     variation: Mapped["ProductVariation | None"] = relationship("ProductVariation", lazy="joined")
 
-    __table_args__ = (sa.UniqueConstraint("cart_id", "product_id", "variation_id", name="uq_cart_product_variation"),)
+    __table_args__ = (
+        # NULLS NOT DISTINCT: a cart has a single line for a product without variation too.
+        sa.UniqueConstraint(
+            "cart_id",
+            "product_id",
+            "variation_id",
+            name="uq_cart_product_variation",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
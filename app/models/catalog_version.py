@@ -0,0 +1,19 @@
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import db
+from app.models.base import BaseModel
+
+
+class CatalogVersion(BaseModel):
+    """Change counter per catalog entity kind (table name), bumped automatically on every catalog write."""
+
+    __tablename__ = "catalog_versions"
+
+    kind: Mapped[str] = mapped_column(sa.String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(sa.BigInteger(), nullable=False, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(
+        sa.DateTime(), server_default=sa.text("now()"), onupdate=db.func.now(), nullable=False
+    )
@@ -0,0 +1,124 @@
+"""Automatic catalog change tracking.
+
+Every flush or bulk ORM statement touching a catalog model bumps that model's row in `catalog_versions` inside the
+same transaction, so all workers and machines observe the change as soon as it commits. Read caches key their
+entries by these versions instead of being invalidated explicitly by the write endpoints.
+"""
+
+import itertools
+import threading
+from typing import Any, Iterable, cast
+
+from sqlalchemy import Table, event, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Result
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+
+from app.db import mark_written
+from app.models.base import BaseModel
+from app.models.catalog_version import CatalogVersion
+from app.models.product import Product, ProductTranslation
+from app.models.product_variation import ProductVariation, ProductVariationTranslation
+from app.models.tag import EntityTag, Tag, TagTranslation
+from app.models.tip import Tip, TipTranslation
+
+CATALOG_MODELS: tuple[type[BaseModel], ...] = (
+    Product,
+    ProductTranslation,
+    ProductVariation,
+    ProductVariationTranslation,
+    Tag,
+    TagTranslation,
+    EntityTag,
+    Tip,
+    TipTranslation,
+)
+CATALOG_KINDS: dict[type[BaseModel], str] = {model: model.__tablename__ for model in CATALOG_MODELS}
+
+# Session.info key holding the kinds bumped in the current transaction.
+CHANGED_KINDS_KEY = "catalog_changed_kinds"
+
+_commit_counter = itertools.count(1)
+_local_generation = 0
+_generation_lock = threading.Lock()
+
+
+def local_generation() -> int:
+    """Counter incremented whenever this process commits a catalog change.
+
+    Lets in-process caches pick up their own writes immediately instead of waiting for their refresh interval.
+    """
+    return _local_generation
+
+
+def mark_catalog_changed(session: Session, kinds: Iterable[str]) -> None:
+    """Bump the versions of the given kinds within the session's current transaction.
+
+    Called automatically by the session events; statements that bypass the ORM (raw SQL) call it directly.
+    """
+    kinds = sorted(set(kinds))
+    if not kinds:
+        return
+
+    table = cast(Table, CatalogVersion.__table__)
+    statement = insert(table).values([{"kind": kind, "version": 1} for kind in kinds])
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.kind],
+        set_={"version": table.c.version + 1, "updated_at": func.now()},
+    )
+    # Use the connection directly: this may run in the middle of a flush, where ORM execution isn't allowed.
+    session.connection().execute(statement)
+    mark_written(session)
+    session.info.setdefault(CHANGED_KINDS_KEY, set()).update(kinds)
+
+
+def _after_flush(session: Session, flush_context: UOWTransaction) -> None:
+    # The new/dirty/deleted collections still reflect the pre-flush state at this point.
+    kinds: set[str] = set()
+    for obj in itertools.chain(session.new, session.deleted):
+        kind = CATALOG_KINDS.get(type(obj))
+        if kind:
+            kinds.add(kind)
+    for obj in session.dirty:
+        kind = CATALOG_KINDS.get(type(obj))
+        if kind and session.is_modified(obj, include_collections=False):
+            kinds.add(kind)
+    mark_catalog_changed(session, kinds)
+
+
+def _do_orm_execute(orm_execute_state: ORMExecuteState) -> Result[Any] | None:
+    # Bulk `query.update()` / `query.delete()` / `update(Model)` statements never go through the flush.
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return None
+    mapper = orm_execute_state.bind_mapper
+    kind = CATALOG_KINDS.get(mapper.class_) if mapper is not None else None
+    if not kind:
+        return None
+
+    result = orm_execute_state.invoke_statement()
+    mark_catalog_changed(orm_execute_state.session, [kind])
+    return result
+
+
+def _after_commit(session: Session) -> None:
+    global _local_generation
+    if session.info.pop(CHANGED_KINDS_KEY, None):
+        with _generation_lock:
+            _local_generation = next(_commit_counter)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(CHANGED_KINDS_KEY, None)
+
+
+def register_catalog_change_tracking() -> None:
+    """Install the session listeners. Safe to call more than once."""
+    listeners = (
+        ("after_flush", _after_flush),
+        ("do_orm_execute", _do_orm_execute),
+        ("after_commit", _after_commit),
+        ("after_rollback", _after_rollback),
+    )
+    for identifier, listener in listeners:
+        if not event.contains(Session, identifier, listener):
+            event.listen(Session, identifier, listener)
@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseModel
+
+
+class IdempotencyKey(BaseModel):
+    """Response of a request sent with an `Idempotency-Key` header, replayed when the request is retried."""
+
+    __tablename__ = "idempotency_keys"
+
+    # Endpoint the key was used on, so keys of different operations don't collide.
+    endpoint: Mapped[str] = mapped_column(sa.String(100), primary_key=True)
+    key: Mapped[str] = mapped_column(sa.String(255), primary_key=True)
+    # Hash of the request, to tell retries from a different request reusing the key.
+    request_hash: Mapped[str] = mapped_column(sa.String(64), nullable=False)
+    response_status: Mapped[int | None] = mapped_column(sa.SmallInteger(), nullable=True)
+    response_body: Mapped[Any | None] = mapped_column(JSONB(), nullable=True)
+    inserted_at: Mapped[datetime] = mapped_column(sa.DateTime(), server_default=sa.text("now()"), nullable=False)
@@ -3,7 +3,7 @@ from enum import Enum
 from typing import TYPE_CHECKING
 
 import sqlalchemy as sa
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, attribute_keyed_dict, mapped_column, relationship
 
 from app.models.base import ModelWithDates, ModelWithId
 from app.models.tag import EntityTag, EntityType, Tag
@@ -32,9 +32,16 @@ class Product(ModelWithId, ModelWithDates):
         nullable=False,
         server_default=ProductType.product.name,
     )
+    # Units left to sell, reserved at checkout; NULL when stock isn't tracked.
+    stock: Mapped[int | None] = mapped_column(sa.Integer(), nullable=True)
 
-    translations: Mapped[list["ProductTranslation"]] = relationship(
-        "ProductTranslation", back_populates="product", lazy="selectin", cascade="all, delete-orphan"
+    # Keyed by language.
+    translations: Mapped[dict[str, "ProductTranslation"]] = relationship(
+        "ProductTranslation",
+        back_populates="product",
+        lazy="selectin",
+        collection_class=attribute_keyed_dict("language"),
+        cascade="all, delete-orphan",
     )
     variations: Mapped[list["ProductVariation"]] = relationship(
         "ProductVariation",
@@ -51,6 +58,15 @@ class Product(ModelWithId, ModelWithDates):
         viewonly=False,
     )
 
+    __table_args__ = (
+        # Listing order, used by keyset pagination.
+        sa.Index("ix_products_order_inserted_at_id", "order", "inserted_at", "id"),
+        sa.CheckConstraint("stock >= 0", name="ck_products_stock_non_negative"),
+    )
+
+    # Stock changes on every checkout, so it's left out of the (cached) catalog payloads.
+    __hidden_columns__ = ["stock"]
+
     @property
     def tags(self) -> list["Tag"]:
         """Get all tags for this product."""
@@ -67,14 +83,11 @@ class Product(ModelWithId, ModelWithDates):
         """Get translation for a specific language."""
         if not language:
             return None
-        for translation in self.translations:
-            if translation.language == language:
-                return translation
-        return None
+        return self.translations.get(language)
 
     def to_dict_with_language(self, language: str | None = None) -> dict:
         """Convert to dict, using translated name/description if available."""
-        data = self.as_dict()
+        data = self.serialize()
         translation = self.get_translation(language)
         if translation:
             data["name"] = translation.name
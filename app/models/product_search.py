@@ -0,0 +1,44 @@
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseModel
+
+# Language of the base (untranslated) product texts.
+BASE_LANGUAGE = ""
+# Text search configuration per document language; anything else is indexed without stemming.
+SEARCH_CONFIGS = {
+    BASE_LANGUAGE: "spanish",
+    "es": "spanish",
+    "en": "english",
+    "pt": "portuguese",
+}
+DEFAULT_SEARCH_CONFIG = "simple"
+
+
+class ProductSearchDocument(BaseModel):
+    """Searchable text of a product in one language, maintained by `app.models.search_index`.
+
+    The base document holds the untranslated name, description, variation names and tag labels; each translated
+    document holds the texts translated to its language.
+    """
+
+    __tablename__ = "product_search_documents"
+
+    product_id: Mapped[int] = mapped_column(sa.ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    language: Mapped[str] = mapped_column(sa.String(5), primary_key=True)
+    # Lowercased, unaccented text, for substring and similarity matching.
+    document: Mapped[str] = mapped_column(sa.Text(), nullable=False)
+    search_vector: Mapped[Any] = mapped_column(TSVECTOR(), nullable=False)
+
+    __table_args__ = (
+        sa.Index("ix_product_search_documents_search_vector", "search_vector", postgresql_using="gin"),
+        sa.Index(
+            "ix_product_search_documents_document_trgm",
+            "document",
+            postgresql_using="gin",
+            postgresql_ops={"document": "gin_trgm_ops"},
+        ),
+    )
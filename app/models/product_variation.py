@@ -2,7 +2,7 @@ from decimal import Decimal
 from typing import TYPE_CHECKING
 
 import sqlalchemy as sa
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, attribute_keyed_dict, mapped_column, relationship
 
 from app.models.base import ModelWithDates, ModelWithId
 
@@ -19,24 +19,33 @@ class ProductVariation(ModelWithId, ModelWithDates):
     image_url: Mapped[str | None] = mapped_column(sa.String(500), nullable=True)
     order: Mapped[int] = mapped_column(sa.Integer(), nullable=False, server_default="0")
     is_active: Mapped[bool] = mapped_column(sa.Boolean(), nullable=False, server_default="true")
+    # Units left to sell, reserved at checkout; NULL when stock isn't tracked.
+    stock: Mapped[int | None] = mapped_column(sa.Integer(), nullable=True)
 
     product: Mapped["Product"] = relationship("Product", back_populates="variations")
-    translations: Mapped[list["ProductVariationTranslation"]] = relationship(
-        "ProductVariationTranslation", back_populates="variation", lazy="selectin", cascade="all, delete-orphan"
+    # Keyed by language.
+    translations: Mapped[dict[str, "ProductVariationTranslation"]] = relationship(
+        "ProductVariationTranslation",
+        back_populates="variation",
+        lazy="selectin",
+        collection_class=attribute_keyed_dict("language"),
+        cascade="all, delete-orphan",
     )
 
+    __table_args__ = (sa.CheckConstraint("stock >= 0", name="ck_product_variations_stock_non_negative"),)
+
+    # Stock changes on every checkout, so it's left out of the (cached) catalog payloads.
+    __hidden_columns__ = ["stock"]
+
     def get_translation(self, language: str | None) -> "ProductVariationTranslation | None":
         """Get translation for a specific language."""
         if not language:
             return None
-        for translation in self.translations:
-            if translation.language == language:
-                return translation
-        return None
+        return self.translations.get(language)
 
     def to_dict_with_language(self, language: str | None = None) -> dict:
         """Convert to dict, using translated name if available."""
-        data = self.as_dict()
+        data = self.serialize()
         translation = self.get_translation(language)
         if translation:
             data["name"] = translation.name
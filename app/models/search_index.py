@@ -0,0 +1,202 @@
+"""Product search index maintenance.
+
+`product_search_documents` holds, per product and language, the text the storefront search matches against. Every
+flush touching a searchable field re-renders the documents of the affected products with a single
+DELETE + INSERT ... SELECT, inside the same transaction as the write.
+"""
+
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+import sqlalchemy as sa
+from sqlalchemy import (
+    ColumnElement,
+    String,
+    Table,
+    delete,
+    event,
+    func,
+    insert,
+    inspect,
+    literal,
+    select,
+    union,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import Session, UOWTransaction
+from sqlalchemy.sql import Select
+
+from app.db import mark_written
+from app.models.base import BaseModel
+from app.models.product import Product, ProductTranslation
+from app.models.product_search import (
+    BASE_LANGUAGE,
+    DEFAULT_SEARCH_CONFIG,
+    SEARCH_CONFIGS,
+    ProductSearchDocument,
+)
+from app.models.product_variation import ProductVariation, ProductVariationTranslation
+from app.models.tag import EntityTag, EntityType, Tag, TagTranslation
+
+# Session.info key holding products whose documents must be refreshed on the next flush.
+PENDING_PRODUCT_IDS_KEY = "search_pending_product_ids"
+
+# Attributes whose changes affect the search documents; `None` means any change does.
+SEARCHABLE_ATTRIBUTES: dict[type[BaseModel], tuple[str, ...] | None] = {
+    Product: ("name", "description"),
+    ProductTranslation: ("language", "name", "description"),
+    ProductVariation: ("name",),
+    ProductVariationTranslation: ("language", "name"),
+    Tag: ("label",),
+    TagTranslation: ("language", "label"),
+    EntityTag: None,
+}
+
+
+@dataclass
+class SearchChanges:
+    product_ids: set[int] = field(default_factory=set)
+    variation_ids: set[int] = field(default_factory=set)
+    tag_ids: set[int] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return bool(self.product_ids or self.variation_ids or self.tag_ids)
+
+    def add(self, obj: Any) -> None:
+        if isinstance(obj, Product):
+            self.product_ids.add(obj.id)
+        elif isinstance(obj, (ProductTranslation, ProductVariation)):
+            self.product_ids.add(obj.product_id)
+        elif isinstance(obj, ProductVariationTranslation):
+            self.variation_ids.add(obj.variation_id)
+        elif isinstance(obj, EntityTag):
+            if obj.entity_type == EntityType.product:
+                self.product_ids.add(obj.entity_id)
+        elif isinstance(obj, Tag):
+            self.tag_ids.add(obj.id)
+        elif isinstance(obj, TagTranslation):
+            self.tag_ids.add(obj.tag_id)
+
+    def affected_product_ids(self) -> Select[tuple[int]]:
+        return cast(
+            Select[tuple[int]],
+            union(
+                select(Product.id).where(Product.id.in_(self.product_ids)),
+                select(ProductVariation.product_id).where(ProductVariation.id.in_(self.variation_ids)),
+                select(EntityTag.entity_id).where(
+                    EntityTag.entity_type == EntityType.product, EntityTag.tag_id.in_(self.tag_ids)
+                ),
+            ),
+        )
+
+
+def search_config(language: ColumnElement[str]) -> ColumnElement[Any]:
+    """Get the text search configuration of a document language column."""
+    return sa.cast(sa.case(SEARCH_CONFIGS, value=language, else_=DEFAULT_SEARCH_CONFIG), REGCONFIG)
+
+
+def refresh_statements(changes: SearchChanges) -> tuple[Any, Any]:
+    """Build the statements re-rendering the search documents of the products affected by the changes."""
+    affected = changes.affected_product_ids().cte("affected_products")
+    product_ids = select(affected.c.id)
+    base_language = literal(BASE_LANGUAGE, String)
+
+    def piece(product_id: Any, language: Any, weight: str, text: Any) -> Select[Any]:
+        return select(
+            product_id.label("product_id"),
+            language.label("language"),
+            literal(weight, String).label("weight"),
+            text.label("text"),
+        ).where(product_id.in_(product_ids), text.is_not(None))
+
+    pieces = union_all(
+        piece(Product.id, base_language, "A", Product.name),
+        piece(Product.id, base_language, "B", Product.description),
+        piece(ProductTranslation.product_id, ProductTranslation.language, "A", ProductTranslation.name),
+        piece(ProductTranslation.product_id, ProductTranslation.language, "B", ProductTranslation.description),
+        piece(ProductVariation.product_id, base_language, "C", ProductVariation.name),
+        piece(
+            ProductVariation.product_id,
+            ProductVariationTranslation.language,
+            "C",
+            ProductVariationTranslation.name,
+        ).join_from(ProductVariation, ProductVariationTranslation),
+        piece(EntityTag.entity_id, base_language, "C", Tag.label)
+        .join_from(EntityTag, Tag)
+        .where(EntityTag.entity_type == EntityType.product),
+        piece(EntityTag.entity_id, TagTranslation.language, "C", TagTranslation.label)
+        .join_from(EntityTag, TagTranslation, EntityTag.tag_id == TagTranslation.tag_id)
+        .where(EntityTag.entity_type == EntityType.product),
+    ).subquery("pieces")
+
+    config = search_config(pieces.c.language)
+
+    def weighted_vector(weight: str) -> ColumnElement[Any]:
+        text = func.string_agg(pieces.c.text, " ").filter(pieces.c.weight == weight)
+        return func.setweight(func.to_tsvector(config, func.unaccent(func.coalesce(text, ""))), weight)
+
+    documents = select(
+        pieces.c.product_id,
+        pieces.c.language,
+        func.lower(func.unaccent(func.string_agg(pieces.c.text, " "))),
+        weighted_vector("A").op("||")(weighted_vector("B")).op("||")(weighted_vector("C")),
+    ).group_by(pieces.c.product_id, pieces.c.language)
+
+    table = cast(Table, ProductSearchDocument.__table__)
+    return (
+        delete(table).where(table.c.product_id.in_(product_ids)),
+        insert(table).from_select(["product_id", "language", "document", "search_vector"], documents),
+    )
+
+
+def refresh_product_search(session: Session, changes: SearchChanges) -> None:
+    """Re-render the search documents of the affected products within the session's current transaction.
+
+    Called automatically on flush; statements that bypass the ORM call it directly.
+    """
+    if not changes:
+        return
+    connection = session.connection()
+    for statement in refresh_statements(changes):
+        connection.execute(statement)
+    mark_written(session)
+
+
+def _is_searchable_change(session: Session, obj: Any) -> bool:
+    attributes = SEARCHABLE_ATTRIBUTES[type(obj)]
+    if attributes is None:
+        return session.is_modified(obj, include_collections=False)
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+
+def _before_flush(session: Session, flush_context: UOWTransaction, instances: Any) -> None:
+    # Deleting a tag cascades to its entity tags in the database, so look up its products while they're linked.
+    tag_ids = [obj.id for obj in session.deleted if isinstance(obj, Tag)]
+    if tag_ids:
+        product_ids = session.execute(
+            select(EntityTag.entity_id).where(
+                EntityTag.entity_type == EntityType.product, EntityTag.tag_id.in_(tag_ids)
+            )
+        ).scalars()
+        session.info.setdefault(PENDING_PRODUCT_IDS_KEY, set()).update(product_ids)
+
+
+def _after_flush(session: Session, flush_context: UOWTransaction) -> None:
+    changes = SearchChanges(product_ids=session.info.pop(PENDING_PRODUCT_IDS_KEY, set()))
+    for obj in itertools.chain(session.new, session.deleted):
+        if type(obj) in SEARCHABLE_ATTRIBUTES:
+            changes.add(obj)
+    for obj in session.dirty:
+        if type(obj) in SEARCHABLE_ATTRIBUTES and _is_searchable_change(session, obj):
+            changes.add(obj)
+    refresh_product_search(session, changes)
+
+
+def register_product_search_indexing() -> None:
+    """Install the session listeners. Safe to call more than once."""
+    for identifier, listener in (("before_flush", _before_flush), ("after_flush", _after_flush)):
+        if not event.contains(Session, identifier, listener):
+            event.listen(Session, identifier, listener)
@@ -0,0 +1,89 @@
+"""Serializers compiled once per mapped class.
+
+`BaseModel.as_dict` used to walk the table columns and type-check every value of every row. The column types are
+known when the mapper is configured, so we generate a function per class that reads all the columns at once and only
+converts the ones that need it.
+"""
+
+import enum
+import operator
+from datetime import datetime
+from typing import Any, Callable
+
+import sqlalchemy as sa
+from pydantic import BaseModel as PydanticBaseModel
+from sqlalchemy.orm import Mapper
+
+from app.models.decorators.types import EnumStringType
+
+Serializer = Callable[[Any], dict[str, Any]]
+
+
+def convert_value(value: Any) -> Any:
+    """Convert a value of unknown type to its JSON-friendly form."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, list):
+        return [item.value if isinstance(item, enum.Enum) else item for item in value]
+    if isinstance(value, PydanticBaseModel):
+        return value.model_dump()
+    return value
+
+
+def enum_value(value: Any) -> Any:
+    # Attributes assigned a raw string keep it until the row is reloaded.
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+def _value_expression(column: sa.Column[Any], variable: str) -> str:
+    column_type = column.type
+    if isinstance(column_type, sa.DateTime):
+        return f"None if {variable} is None else {variable}.isoformat()"
+    if (isinstance(column_type, sa.Enum) and column_type.enum_class is not None) or isinstance(
+        column_type, EnumStringType
+    ):
+        return f"enum_value({variable})"
+    if isinstance(column_type, (sa.String, sa.Integer, sa.Numeric, sa.Boolean, sa.Uuid)):
+        return variable
+    return f"convert_value({variable})"
+
+
+def compile_serializer(mapper: Mapper[Any]) -> Serializer:
+    """Generate a function returning the visible columns of an instance of the mapped class as a dict."""
+    cls = mapper.class_
+    hidden_columns = set(getattr(cls, "__hidden_columns__", ()))
+    columns = [column for column in cls.__table__.columns if column.name not in hidden_columns]
+    if not columns:
+        return lambda instance: {}
+
+    variables = [f"v{index}" for index in range(len(columns))]
+    items = ", ".join(
+        f"{column.name!r}: {_value_expression(column, variable)}" for column, variable in zip(columns, variables)
+    )
+    # The getters return a bare value rather than a 1-tuple for a single column.
+    unpack = ", ".join(variables)
+    source = (
+        "def serialize(instance):\n"
+        "    try:\n"
+        f"        {unpack} = get_loaded(instance.__dict__)\n"
+        "    except KeyError:\n"
+        f"        {unpack} = get_columns(instance)\n"
+        f"    return {{{items}}}\n"
+    )
+
+    names = [column.name for column in columns]
+    namespace: dict[str, Any] = {
+        # Loaded values are read straight from the instance state; expired or deferred columns go through the
+        # instrumented attributes so they get loaded.
+        "get_loaded": operator.itemgetter(*names),
+        "get_columns": operator.attrgetter(*names),
+        "enum_value": enum_value,
+        "convert_value": convert_value,
+    }
+    exec(compile(source, f"<serializer {cls.__name__}>", "exec"), namespace)
+
+    serializer: Serializer = namespace["serialize"]
+    serializer.__qualname__ = f"{cls.__name__}.serialize"
+    return serializer
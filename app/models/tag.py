@@ -1,7 +1,7 @@
 from enum import Enum
 
 import sqlalchemy as sa
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, attribute_keyed_dict, mapped_column, relationship
 
 from app.models.base import ModelWithDates, ModelWithId
 
@@ -11,6 +11,13 @@ class EntityType(str, Enum):
     tip = "tip"
 
 
+class TagMatch(str, Enum):
+    """How a tag filter matches entities: having any of the tags, or every one of them."""
+
+    any = "any"
+    all = "all"
+
+
 class TagCategory(str, Enum):
     product = "product"
     tip = "tip"
@@ -30,25 +37,27 @@ class Tag(ModelWithId, ModelWithDates):
     bg_color: Mapped[str] = mapped_column(sa.String(7), nullable=False, server_default="#f5f5f4")
     text_color: Mapped[str] = mapped_column(sa.String(7), nullable=False, server_default="#57534e")
 
-    translations: Mapped[list["TagTranslation"]] = relationship(
-        "TagTranslation", back_populates="tag", lazy="selectin", cascade="all, delete-orphan"
+    # Keyed by language.
+    translations: Mapped[dict[str, "TagTranslation"]] = relationship(
+        "TagTranslation",
+        back_populates="tag",
+        lazy="selectin",
+        collection_class=attribute_keyed_dict("language"),
+        cascade="all, delete-orphan",
     )
 
     def get_translation(self, language: str | None) -> "TagTranslation | None":
         """Get translation for a specific language."""
         if not language:
             return None
-        for translation in self.translations:
-            if translation.language == language:
-                return translation
-        return None
+        return self.translations.get(language)
 
     def to_dict_with_language(self, language: str | None = None) -> dict:
         """Convert to dict, using translated label if available.
 
         Includes 'key' field with the original/base label for URL matching.
         """
-        data = self.as_dict()
+        data = self.serialize()
         data["key"] = self.label  # Original label for URL matching
         translation = self.get_translation(language)
         if translation:
@@ -1,7 +1,7 @@
 from enum import Enum
 
 import sqlalchemy as sa
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, attribute_keyed_dict, mapped_column, relationship
 
 from app.models.base import ModelWithDates, ModelWithId
 from app.models.tag import EntityTag, EntityType, Tag
@@ -28,8 +28,13 @@ class Tip(ModelWithId, ModelWithDates):
         server_default=TipType.quick_tip.name,
     )
 
-    translations: Mapped[list["TipTranslation"]] = relationship(
-        "TipTranslation", back_populates="tip", lazy="selectin", cascade="all, delete-orphan"
+    # Keyed by language.
+    translations: Mapped[dict[str, "TipTranslation"]] = relationship(
+        "TipTranslation",
+        back_populates="tip",
+        lazy="selectin",
+        collection_class=attribute_keyed_dict("language"),
+        cascade="all, delete-orphan",
     )
     _entity_tags: Mapped[list["EntityTag"]] = relationship(
         "EntityTag",
@@ -55,14 +60,11 @@ class Tip(ModelWithId, ModelWithDates):
         """Get translation for a specific language."""
         if not language:
             return None
-        for translation in self.translations:
-            if translation.language == language:
-                return translation
-        return None
+        return self.translations.get(language)
 
     def to_dict_with_language(self, language: str | None = None) -> dict:
         """Convert to dict, using translated title/description if available."""
-        data = self.as_dict()
+        data = self.serialize()
         translation = self.get_translation(language)
         if translation:
             if translation.title:
@@ -0,0 +1,24 @@
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.orm import with_loader_criteria
+
+from app.models.product import ProductTranslation
+from app.models.product_variation import ProductVariationTranslation
+from app.models.tag import TagTranslation
+from app.models.tip import TipTranslation
+
+TRANSLATION_MODELS = (ProductTranslation, ProductVariationTranslation, TagTranslation, TipTranslation)
+
+
+def translations_in(language: str | None) -> list[Any]:
+    """Loader options restricting the translations loaded along a query's entities to a single language.
+
+    They apply to every translation collection the query loads, however deep. Without a language only the base texts
+    are rendered, so no translations are loaded at all. The collections of the loaded entities are partial, so only
+    use these options to render read-only responses.
+    """
+    return [
+        with_loader_criteria(model, model.language == language if language else sa.false())
+        for model in TRANSLATION_MODELS
+    ]
@@ -1,5 +1,7 @@
-from .cart import CartItemRepo, CartRepo
+from .cart import CartItemRepo, CartLine, CartRepo, CartView
+from .catalog_version import CatalogVersionRepo
 from .entity_tag import EntityTagRepo
+from .idempotency_key import IdempotencyKeyRepo
 from .order import OrderRepo
 from .product import ProductRepo
 from .product_variation import ProductVariationRepo
@@ -8,8 +10,12 @@ from .tip import TipRepo
 
 __all__ = [
     "CartItemRepo",
+    "CartLine",
     "CartRepo",
+    "CartView",
+    "CatalogVersionRepo",
     "EntityTagRepo",
+    "IdempotencyKeyRepo",
     "OrderRepo",
     "ProductRepo",
     "ProductVariationRepo",
@@ -3,13 +3,22 @@ from datetime import datetime
 from typing import Any, Generator, Generic, Mapping, TypeVar
 
 from pydantic import BaseModel as PydanticBaseModel
-from sqlalchemy import Column
+from sqlalchemy import BigInteger, Column, ColumnElement, Integer, column, update, values
 from sqlalchemy.orm import Query
 from sqlalchemy.orm.attributes import flag_modified
 
 from app.db import db
 from app.exceptions import EntityNotFoundError
 from app.models.base import BaseModel, SoftDeletable
+from app.models.translations import translations_in
+from app.repos.pagination import (
+    Page,
+    SortColumns,
+    after_sort_key,
+    decode_cursor,
+    encode_cursor,
+    sort_key_columns,
+)
 
 ModelT = TypeVar("ModelT", bound=BaseModel)
 
@@ -27,6 +36,14 @@ class Repo(Generic[ModelT]):
         """Gets entity by primary key"""
         return self.session.get(self.model, primary_key)
 
+    def get_in_language(self, primary_key: int, language: str | None) -> ModelT | None:
+        """Gets entity by primary key, loading only its translations to `language` (see `translations_in`)."""
+        return self.session.get(self.model, primary_key, options=translations_in(language))
+
+    def in_language(self, query: Query[ModelT], language: str | None) -> Query[ModelT]:
+        """Load only the translations to `language` along the query's entities (see `translations_in`)."""
+        return query.options(*translations_in(language))
+
     def get_or_fail(self, primary_key: int) -> ModelT:
         obj = self.get(primary_key)
         if obj is None:
@@ -58,6 +75,53 @@ class Repo(Generic[ModelT]):
             i = getattr(batch_records[-1], sort_column_name)
             self.commit()
 
+    def get_page(
+        self, query: Query[ModelT], sort_columns: SortColumns, limit: int | None, cursor: str | None = None
+    ) -> Page[ModelT]:
+        """Get the page of `limit` records that follows the cursor, ordered by the sort columns.
+
+        The last sort column must be unique so every record has a distinct position. Without a limit, every record
+        after the cursor is returned.
+        """
+        query = query.order_by(None).order_by(*sort_columns)
+        if cursor:
+            query = query.filter(after_sort_key(sort_columns, decode_cursor(cursor, sort_columns)))
+
+        if limit is None:
+            return Page(items=query.all(), next_cursor=None)
+
+        # Select the sort key along with each record, since it may include computed columns (e.g. a search rank).
+        # Fetch one extra record to know whether there's a next page.
+        rows = query.add_columns(*sort_key_columns(sort_columns)).limit(limit + 1).all()
+        records = [row[0] for row in rows[:limit]]
+        if len(rows) <= limit:
+            return Page(items=records, next_cursor=None)
+        return Page(items=records, next_cursor=encode_cursor(tuple(rows[limit - 1][1:])))
+
+    def reorder(
+        self, positions: Mapping[int, int], *conditions: ColumnElement[bool], order_column_name: str = "order"
+    ) -> list[int]:
+        """Move records to new positions, given as {id: order}, with a single UPDATE ... FROM (VALUES ...).
+
+        Only records matching the conditions (e.g. belonging to a parent) whose position actually changes are
+        updated. Returns the ids of the updated records.
+        """
+        if not positions:
+            return []
+        id_column: Column[int] = getattr(self.model, "id")
+        order_column: Column[int] = getattr(self.model, order_column_name)
+        new_positions = values(column("id", BigInteger()), column("position", Integer()), name="new_positions").data(
+            list(positions.items())
+        )
+        statement = (
+            update(self.model)
+            .where(id_column == new_positions.c.id, order_column != new_positions.c.position, *conditions)
+            .values({order_column_name: new_positions.c.position})
+            .returning(id_column)
+            .execution_options(synchronize_session="fetch")
+        )
+        return list(self.session.execute(statement).scalars())
+
     def update(self, base_obj: ModelT, update_data: Mapping[str, Any], do_commit: bool = True) -> ModelT:
         for key, value in update_data.items():
             if isinstance(value, dict) or isinstance(value, PydanticBaseModel):
@@ -1,7 +1,42 @@
-from app.models import Cart, CartItem
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, cast
+
+import sqlalchemy as sa
+from sqlalchemy import CursorResult, Table, and_, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Query, aliased, lazyload
+
+from app.db import mark_written
+from app.models import Cart, CartItem, Product, ProductTranslation, ProductVariation, ProductVariationTranslation
 from app.repos.base import Repo
 
 
+@dataclass(frozen=True)
+class CartLine:
+    """A cart item as shown to the customer, with its names in the requested language."""
+
+    id: int
+    product_id: int
+    product_name: str
+    image_url: str | None
+    variation_id: int | None
+    variation_name: str | None
+    unit_price: Decimal
+    quantity: int
+    # Whether the product, and the variation if any, can still be ordered.
+    product_is_active: bool
+    variation_is_active: bool | None
+
+
+@dataclass(frozen=True)
+class CartView:
+    """Read model of a cart: exactly what the cart endpoints render, without the products' ORM graphs."""
+
+    token: str
+    lines: list[CartLine]
+
+
 class CartRepo(Repo[Cart]):
     def __init__(self) -> None:
         super().__init__(Cart)
@@ -9,6 +44,90 @@ class CartRepo(Repo[Cart]):
     def get_by_token(self, token: str) -> Cart | None:
         return self.get_query().filter(Cart.token == token).first()
 
+    def get_view(self, token: str, language: str | None = None) -> CartView | None:
+        """Get a cart's lines, with the names, prices and images to show, in a single query."""
+        product_translation = aliased(ProductTranslation)
+        variation_translation = aliased(ProductVariationTranslation)
+        product_name: Any = Product.name
+        variation_name: Any = ProductVariation.name
+        statement = (
+            select(
+                Cart.token,
+                CartItem.id,
+                CartItem.product_id,
+                CartItem.variation_id,
+                CartItem.quantity,
+                Product.is_active.label("product_is_active"),
+                ProductVariation.is_active.label("variation_is_active"),
+                # Variations without their own price or image use the product's.
+                func.coalesce(func.nullif(ProductVariation.price, 0), Product.price).label("unit_price"),
+                func.coalesce(func.nullif(ProductVariation.image_url, ""), Product.image_url).label("image_url"),
+            )
+            .select_from(Cart)
+            .outerjoin(CartItem, CartItem.cart_id == Cart.id)
+            .outerjoin(Product, Product.id == CartItem.product_id)
+            .outerjoin(ProductVariation, ProductVariation.id == CartItem.variation_id)
+            .where(Cart.token == token)
+            .order_by(CartItem.inserted_at)
+        )
+        if language:
+            statement = statement.outerjoin(
+                product_translation,
+                and_(product_translation.product_id == Product.id, product_translation.language == language),
+            ).outerjoin(
+                variation_translation,
+                and_(
+                    variation_translation.variation_id == ProductVariation.id,
+                    variation_translation.language == language,
+                ),
+            )
+            product_name = func.coalesce(product_translation.name, Product.name)
+            variation_name = func.coalesce(variation_translation.name, ProductVariation.name)
+        statement = statement.add_columns(product_name.label("product_name"), variation_name.label("variation_name"))
+
+        # The cart's row comes along even when it has no items (with null item columns).
+        rows = self.session.execute(statement).all()
+        if not rows:
+            return None
+        return CartView(
+            token=rows[0].token,
+            lines=[
+                CartLine(
+                    id=row.id,
+                    product_id=row.product_id,
+                    product_name=row.product_name,
+                    image_url=row.image_url,
+                    variation_id=row.variation_id,
+                    variation_name=row.variation_name,
+                    unit_price=row.unit_price,
+                    quantity=row.quantity,
+                    product_is_active=row.product_is_active,
+                    variation_is_active=row.variation_is_active,
+                )
+                for row in rows
+                if row.id is not None
+            ],
+        )
+
+    def lock_by_token(self, token: str) -> int | None:
+        """Lock a cart's row until the end of the transaction, e.g. to check it out. Returns its id."""
+        return self.session.execute(select(Cart.id).where(Cart.token == token).with_for_update()).scalar()
+
+    def delete_with_items(self, cart_id: int) -> None:
+        """Delete a cart and its items, without loading them."""
+        self.session.execute(delete(CartItem).where(CartItem.cart_id == cart_id))
+        self.session.execute(delete(Cart).where(Cart.id == cart_id))
+
+    def get_with_duplicate_lines(self) -> Query[Cart]:
+        """Carts holding more than one line for the same product without variation, without loading their items."""
+        duplicated = (
+            select(CartItem.cart_id)
+            .where(CartItem.variation_id.is_(None))
+            .group_by(CartItem.cart_id, CartItem.product_id)
+            .having(func.count() > 1)
+        )
+        return self.get_query().options(lazyload(Cart.items)).filter(Cart.id.in_(duplicated))
+
 
 class CartItemRepo(Repo[CartItem]):
     def __init__(self) -> None:
@@ -26,3 +145,90 @@ class CartItemRepo(Repo[CartItem]):
         else:
             query = query.filter(CartItem.variation_id == variation_id)
         return query.first()
+
+    def get_in_cart(self, token: str, item_id: int) -> CartItem | None:
+        """Get a cart's item, without loading its product and variation."""
+        return (
+            self.get_query()
+            .options(lazyload(CartItem.product), lazyload(CartItem.variation))
+            .join(Cart, Cart.id == CartItem.cart_id)
+            .filter(CartItem.id == item_id, Cart.token == token)
+            .first()
+        )
+
+    def add_quantity(self, token: str, product_id: int, variation_id: int | None, quantity: int) -> int | None:
+        """Add `quantity` units of a product (or of one of its variations) to a cart, in a single statement.
+
+        Inserts the cart's line for the product and variation, or increments it when it's already there: concurrent
+        adds of the same line meet on `uq_cart_product_variation` and are summed instead of failing. Returns the id
+        of the line, or None when the cart doesn't exist, or the product or variation doesn't exist or isn't active.
+        """
+        cart_items = _cart_items_table()
+
+        # The line to add to, if the cart, product and variation exist; the checks and the write are one statement.
+        line_variation_id = ProductVariation.id if variation_id is not None else sa.cast(sa.null(), sa.BigInteger())
+        line = select(
+            Cart.id,
+            Product.id,
+            line_variation_id,
+            sa.literal(quantity, sa.Integer()),
+        ).join_from(Cart, Product, and_(Product.id == product_id, Product.is_active.is_(True)))
+        if variation_id is not None:
+            line = line.join(
+                ProductVariation,
+                and_(
+                    ProductVariation.id == variation_id,
+                    ProductVariation.product_id == Product.id,
+                    ProductVariation.is_active.is_(True),
+                ),
+            )
+        # Share-lock the cart's key like the foreign key check would, but up front: a cart being checked out is waited
+        # for and, once deleted, skipped, instead of failing the foreign key check.
+        line = line.where(Cart.token == token).with_for_update(read=True, key_share=True, of=Cart)
+
+        upsert = insert(cart_items).from_select(["cart_id", "product_id", "variation_id", "quantity"], line)
+        upsert = upsert.on_conflict_do_update(
+            constraint="uq_cart_product_variation",
+            set_={"quantity": cart_items.c.quantity + upsert.excluded.quantity, "updated_at": func.now()},
+        )
+        item_id = self.session.execute(upsert.returning(cart_items.c.id)).scalar()
+        if item_id is not None:
+            # Plain table statements aren't tracked as writes.
+            mark_written(self.session())
+        return item_id
+
+    def merge_duplicate_lines(self, cart_ids: list[int]) -> int:
+        """Merge the carts' duplicate lines of products without variation into their oldest line, summing quantities.
+
+        Such duplicates could be inserted before `uq_cart_product_variation` treated NULL variations as equal.
+        Returns the number of lines merged away.
+        """
+        cart_items = _cart_items_table()
+        duplicates = (
+            select(func.min(cart_items.c.id).label("keep_id"), func.sum(cart_items.c.quantity).label("quantity"))
+            .where(cart_items.c.cart_id.in_(cart_ids), cart_items.c.variation_id.is_(None))
+            .group_by(cart_items.c.cart_id, cart_items.c.product_id)
+            .having(func.count() > 1)
+            .cte("duplicates")
+        )
+        merged = (
+            update(cart_items)
+            .where(cart_items.c.id == duplicates.c.keep_id)
+            .values(quantity=duplicates.c.quantity)
+            .returning(cart_items.c.id, cart_items.c.cart_id, cart_items.c.product_id)
+            .cte("merged")
+        )
+        result = self.session.execute(
+            delete(cart_items).where(
+                cart_items.c.cart_id == merged.c.cart_id,
+                cart_items.c.product_id == merged.c.product_id,
+                cart_items.c.variation_id.is_(None),
+                cart_items.c.id != merged.c.id,
+            )
+        )
+        mark_written(self.session())
+        return cast(CursorResult[Any], result).rowcount
+
+
+def _cart_items_table() -> Table:
+    return cast(Table, CartItem.__table__)
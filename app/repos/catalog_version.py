@@ -0,0 +1,20 @@
+from sqlalchemy import select, union
+
+from app.models import CatalogVersion
+from app.models.translations import TRANSLATION_MODELS
+from app.repos.base import Repo
+
+
+class CatalogVersionRepo(Repo[CatalogVersion]):
+    def __init__(self) -> None:
+        super().__init__(CatalogVersion)
+
+    def get_versions(self) -> dict[str, int]:
+        """Get the current version of every catalog entity kind."""
+        rows = self.session.query(CatalogVersion.kind, CatalogVersion.version).all()
+        return {kind: version for kind, version in rows}
+
+    def get_languages(self) -> set[str]:
+        """Get every language the catalog has translations to."""
+        statement = union(*(select(model.language).distinct() for model in TRANSLATION_MODELS))
+        return set(self.session.scalars(statement))
@@ -3,7 +3,9 @@ from dependency_injector import containers, providers
 from app.repos import (
     CartItemRepo,
     CartRepo,
+    CatalogVersionRepo,
     EntityTagRepo,
+    IdempotencyKeyRepo,
     OrderRepo,
     ProductRepo,
     ProductVariationRepo,
@@ -21,3 +23,5 @@ class RepoContainer(containers.DeclarativeContainer):
     tag = providers.Singleton(TagRepo)
     tip = providers.Singleton(TipRepo)
     entity_tag = providers.Singleton(EntityTagRepo)
+    catalog_version = providers.Singleton(CatalogVersionRepo)
+    idempotency_key = providers.Singleton(IdempotencyKeyRepo)
@@ -1,7 +1,32 @@
-from app.models.tag import EntityTag, EntityType
+from sqlalchemy import exists, func, select
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.tag import EntityTag, EntityType, TagMatch
 from app.repos.base import Repo
 
 
+def tagged_with(
+    entity_id: InstrumentedAttribute[int], entity_type: EntityType, tag_ids: list[int], match: TagMatch = TagMatch.any
+) -> ColumnElement[bool]:
+    """Build the condition matching the entities tagged with any (or all) of the given tags.
+
+    Written as semi-joins on `entity_tags` so the outer query never has to deduplicate its rows.
+    """
+    unique_tag_ids = sorted(set(tag_ids))
+    tagged = (EntityTag.entity_type == entity_type, EntityTag.tag_id.in_(unique_tag_ids))
+    if match == TagMatch.all:
+        # (entity_type, entity_id, tag_id) is unique, so counting rows counts distinct tags.
+        entities_with_all_tags = (
+            select(EntityTag.entity_id)
+            .where(*tagged)
+            .group_by(EntityTag.entity_id)
+            .having(func.count() == len(unique_tag_ids))
+        )
+        return entity_id.in_(entities_with_all_tags)
+    return exists().where(EntityTag.entity_id == entity_id, *tagged)
+
+
 class EntityTagRepo(Repo[EntityTag]):
     def __init__(self) -> None:
         super().__init__(EntityTag)
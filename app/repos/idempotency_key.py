@@ -0,0 +1,35 @@
+from typing import Any, cast
+
+from sqlalchemy import Table
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models import IdempotencyKey
+from app.repos.base import Repo
+
+
+class IdempotencyKeyRepo(Repo[IdempotencyKey]):
+    def __init__(self) -> None:
+        super().__init__(IdempotencyKey)
+
+    def claim(self, endpoint: str, key: str, request_hash: str) -> IdempotencyKey | None:
+        """Claim a key for the current transaction. Returns None once claimed, or the key's row if it was used before.
+
+        While another transaction holds the same key, this waits for it to commit (and returns its row) or to roll
+        back (and claims the key).
+        """
+        table = cast(Table, IdempotencyKey.__table__)
+        statement = (
+            insert(table)
+            .values(endpoint=endpoint, key=key, request_hash=request_hash)
+            .on_conflict_do_nothing(index_elements=[table.c.endpoint, table.c.key])
+            .returning(table.c.key)
+        )
+        if self.session.execute(statement).first() is not None:
+            return None
+        return self.session.get(IdempotencyKey, (endpoint, key), populate_existing=True)
+
+    def store_response(self, endpoint: str, key: str, status: int, body: Any) -> None:
+        """Store the response of the request that claimed a key, within its transaction."""
+        self.get_query().filter(IdempotencyKey.endpoint == endpoint, IdempotencyKey.key == key).update(
+            {"response_status": status, "response_body": body}, synchronize_session=False
+        )
@@ -1,5 +1,18 @@
-from app.models import Order
+from datetime import datetime
+from decimal import Decimal
+from typing import Sequence, cast
+
+import sqlalchemy as sa
+from sqlalchemy import Table, column, insert, select, values
+from sqlalchemy.orm import Query, selectinload
+
+from app.models import Order, OrderItem
+from app.models.order import ORDER_STATUS_RANK, OrderStatus
 from app.repos.base import Repo
+from app.repos.pagination import Page, SortColumns
+
+# Admin listing order, served by `ix_orders_status_rank_updated_at_id`.
+ORDER_SORT_COLUMNS: SortColumns = (Order.status_rank, Order.updated_at.desc(), Order.id.desc())
 
 
 class OrderRepo(Repo[Order]):
@@ -8,3 +21,70 @@ class OrderRepo(Repo[Order]):
 
     def get_by_ulid(self, ulid: str) -> Order | None:
         return self.get(ulid)
+
+    def lock(self, order: Order) -> None:
+        """Lock an order's row until the end of the transaction, reloading it."""
+        # Refreshing with FOR UPDATE would lock the eagerly joined items, products and variations too, which
+        # Postgres refuses on the nullable side of their outer joins.
+        self.session.execute(select(Order.id).where(Order.id == order.id).with_for_update())
+        self.session.refresh(order)
+
+    def get_filtered(
+        self,
+        status: OrderStatus | None = None,
+        inserted_from: datetime | None = None,
+        inserted_to: datetime | None = None,
+    ) -> Query[Order]:
+        """Get orders, optionally filtered by status and placement date range."""
+        # Items are loaded in a separate query so a LIMIT applies to orders rather than joined item rows.
+        query = self.get_query().options(selectinload(Order.items))
+        if status:
+            query = query.filter(Order.status_rank == ORDER_STATUS_RANK[status])
+        if inserted_from:
+            query = query.filter(Order.inserted_at >= inserted_from)
+        if inserted_to:
+            query = query.filter(Order.inserted_at < inserted_to)
+        return query
+
+    def get_page_of_orders(self, query: Query[Order], limit: int | None, cursor: str | None = None) -> Page[Order]:
+        """Get a page of orders by status priority (confirmed, processed, cancelled) and last update."""
+        return self.get_page(query, ORDER_SORT_COLUMNS, limit, cursor)
+
+    def insert_with_items(
+        self,
+        order_id: str,
+        total: Decimal,
+        notes: str | None,
+        items: Sequence[tuple[int, int | None, int, Decimal]],
+    ) -> list[int]:
+        """Insert a confirmed order and its items in a single statement. Returns the ids of the items.
+
+        `items` are (product id, variation id, quantity, unit price) tuples.
+        """
+        orders = cast(Table, Order.__table__)
+        order_items = cast(Table, OrderItem.__table__)
+        new_order = (
+            insert(orders)
+            .values(id=order_id, status=OrderStatus.confirmed, total=total, notes=notes)
+            .returning(orders.c.id)
+            .cte("new_order")
+        )
+        lines = values(
+            column("product_id", sa.BigInteger()),
+            column("variation_id", sa.BigInteger()),
+            column("quantity", sa.Integer()),
+            column("unit_price", sa.Numeric(10, 2)),
+            name="lines",
+        ).data(list(items))
+        statement = insert(order_items).from_select(
+            ["order_id", "product_id", "variation_id", "quantity", "unit_price"],
+            select(
+                new_order.c.id,
+                lines.c.product_id,
+                # Typed even when every item is without variation (all NULLs).
+                sa.cast(lines.c.variation_id, sa.BigInteger()),
+                lines.c.quantity,
+                lines.c.unit_price,
+            ).join_from(new_order, lines, sa.true()),
+        )
+        return list(self.session.execute(statement.returning(order_items.c.id)).scalars())
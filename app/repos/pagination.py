@@ -0,0 +1,87 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Generic, Sequence, TypeVar
+
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import ColumnElement, UnaryExpression
+
+from app.exceptions import InvalidDataError
+
+T = TypeVar("T")
+
+# Sort columns are mapped attributes or selectable columns, ascending, or `column.desc()`.
+SortColumn = InstrumentedAttribute[Any] | ColumnElement[Any] | UnaryExpression[Any]
+SortColumns = Sequence[SortColumn]
+
+
+@dataclass(frozen=True)
+class Page(Generic[T]):
+    items: list[T]
+    next_cursor: str | None
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last item of a page as an opaque cursor."""
+    serialized = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(serialized, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_columns: SortColumns) -> tuple[Any, ...]:
+    """Decode a cursor back into a sort key, typed after the columns it was built from."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(sort_columns):
+            raise ValueError("Cursor doesn't match the sort columns")
+        return tuple(_to_python(value, _unwrap(column)[0]) for value, column in zip(values, sort_columns))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError, ArithmeticError):
+        raise InvalidDataError(f"Invalid cursor {cursor}")
+
+
+def sort_key(item: Any, sort_columns: SortColumns) -> tuple[Any, ...]:
+    return tuple(getattr(item, _unwrap(column)[0].key) for column in sort_columns)
+
+
+def sort_key_columns(sort_columns: SortColumns) -> list[Any]:
+    """Get the sort columns without their direction, to select them."""
+    return [_unwrap(column)[0] for column in sort_columns]
+
+
+def after_sort_key(sort_columns: SortColumns, values: Sequence[Any]) -> ColumnElement[bool]:
+    """Build the condition matching the rows that sort after the given sort key."""
+    columns = [_unwrap(column) for column in sort_columns]
+    if len({descending for _, descending in columns}) == 1:
+        # Single direction: a row-value comparison, which an index on the sort columns can serve directly.
+        row, key = tuple_(*(column for column, _ in columns)), tuple_(*values)
+        return row < key if columns[0][1] else row > key
+
+    # Mixed directions: (c1 > v1) OR (c1 = v1 AND c2 < v2) OR ...
+    conditions = []
+    for index, (column, descending) in enumerate(columns):
+        equal_prefix = [prefix_column == value for (prefix_column, _), value in zip(columns[:index], values)]
+        conditions.append(and_(*equal_prefix, column < values[index] if descending else column > values[index]))
+    return or_(*conditions)
+
+
+def _unwrap(column: SortColumn) -> tuple[Any, bool]:
+    if isinstance(column, UnaryExpression):
+        return column.element, column.modifier is operators.desc_op
+    return column, False
+
+
+def _to_python(value: Any, column: Any) -> Any:
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is Decimal:
+        return Decimal(value)
+    if not isinstance(value, python_type):
+        raise TypeError(f"Expected {python_type.__name__} for {column.key}")
+    return value
@@ -1,11 +1,42 @@
-from sqlalchemy import and_, func, or_
+import re
+from typing import Any, Collection, Iterable, Mapping, cast
+
+import sqlalchemy as sa
+from sqlalchemy import (
+    BigInteger,
+    Integer,
+    Select,
+    Table,
+    and_,
+    column,
+    func,
+    insert,
+    or_,
+    select,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG
 from sqlalchemy.orm import Query
+from sqlalchemy.sql import Values
 from sqlalchemy.sql.elements import ColumnElement
 
+from app.db import mark_written
 from app.models import Product
+from app.models.base import BaseModel
+from app.models.events import CATALOG_KINDS, mark_catalog_changed
 from app.models.product import ProductTranslation, ProductType
-from app.models.tag import EntityTag, EntityType
+from app.models.product_variation import ProductVariation, ProductVariationTranslation
+from app.models.product_search import BASE_LANGUAGE, DEFAULT_SEARCH_CONFIG, SEARCH_CONFIGS, ProductSearchDocument
+from app.models.search_index import SearchChanges, refresh_product_search
+from app.models.tag import EntityTag, EntityType, TagMatch
 from app.repos.base import Repo
+from app.repos.entity_tag import tagged_with
+from app.repos.pagination import Page, SortColumns
+
+# Listing order; `id` breaks ties so keyset pagination has a strict order.
+PRODUCT_SORT_COLUMNS: SortColumns = (Product.order, Product.inserted_at, Product.id)
 
 
 class ProductRepo(Repo[Product]):
@@ -16,7 +47,17 @@ class ProductRepo(Repo[Product]):
         query = self.get_query().filter(Product.is_active.is_(True))
         if product_type:
             query = query.filter(Product.type == product_type)
-        return query.order_by(Product.order, Product.inserted_at)
+        return query.order_by(*PRODUCT_SORT_COLUMNS)
+
+    def get_page_of_products(
+        self,
+        query: Query[Product],
+        limit: int | None,
+        cursor: str | None = None,
+        sort_columns: SortColumns = PRODUCT_SORT_COLUMNS,
+    ) -> Page[Product]:
+        """Get a page of products, in listing order unless other sort columns (e.g. from `search`) are given."""
+        return self.get_page(query, sort_columns, limit, cursor)
 
     def filter_by_type(self, query: Query[Product], product_type: ProductType) -> Query[Product]:
         """Filter products by type."""
@@ -25,34 +66,306 @@ class ProductRepo(Repo[Product]):
     def get_by_ids(self, product_ids: list[int]) -> list[Product]:
         return self.get_query().filter(Product.id.in_(product_ids)).all()
 
-    def filter_by_search(self, query: Query[Product], search_term: str, language: str | None = None) -> Query[Product]:
-        """Filter products by search term in name or translations."""
-        # Join with translations to search in translated names
-        query = query.outerjoin(ProductTranslation, Product.id == ProductTranslation.product_id)
+    def search(
+        self, query: Query[Product], search: str, language: str | None = None
+    ) -> tuple[Query[Product], SortColumns]:
+        """Filter products matching a search term and rank them by relevance.
 
-        # Build search conditions
-        conditions: list[ColumnElement[bool]] = [func.lower(Product.name).like(search_term)]
+        Matches the full-text documents (accent-insensitive, words as prefixes) or, for partial words, any substring
+        of the documents. Searches the base texts and the given language's translations, or every translation if no
+        language is given. Returns the filtered query along with the sort columns that order it by relevance.
+        """
+        term = search.strip()
+        languages = [BASE_LANGUAGE, language] if language else None
+        document = ProductSearchDocument
 
-        if language:
-            # Search only in the specified language translation
-            conditions.append(
-                and_(ProductTranslation.language == language, func.lower(ProductTranslation.name).like(search_term))
-            )
-        else:
-            # Search in any translation
-            conditions.append(func.lower(ProductTranslation.name).like(search_term))
+        # The substring match is served by the trigram index on the unaccented, lowercased document.
+        normalized_term = func.lower(func.unaccent(term))
+        escaped_term = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = func.concat("%", func.lower(func.unaccent(escaped_term)), "%")
+        matches: list[ColumnElement[bool]] = [document.document.like(pattern, escape="\\")]
+        ranks: list[tuple[ColumnElement[bool], ColumnElement[float]]] = []
+
+        words = re.findall(r"\w+", term)
+        if words:
+            # One tsquery per text search configuration, so each condition can use the GIN index.
+            ts_query_text = func.unaccent(" & ".join(f"{word}:*" for word in words))
+            for config, config_languages in _languages_by_config(languages):
+                in_config = (
+                    document.language.in_(config_languages)
+                    if config != DEFAULT_SEARCH_CONFIG or languages
+                    else document.language.not_in(SEARCH_CONFIGS)
+                )
+                ts_query = func.to_tsquery(sa.cast(config, REGCONFIG), ts_query_text)
+                matches.append(and_(in_config, document.search_vector.op("@@")(ts_query)))
+                ranks.append((in_config, func.ts_rank(document.search_vector, ts_query)))
+
+        rank = sa.case(*ranks, else_=0) + func.word_similarity(normalized_term, document.document)
+        ranked = (
+            select(document.product_id, sa.cast(func.max(rank), sa.Float).label("rank"))
+            .where(or_(*matches))
+            .group_by(document.product_id)
+        )
+        if languages:
+            ranked = ranked.where(document.language.in_(languages))
+        ranked_subquery = ranked.subquery("search_ranks")
 
-        return query.filter(or_(*conditions)).distinct()
+        query = query.join(ranked_subquery, ranked_subquery.c.product_id == Product.id)
+        return query, (ranked_subquery.c.rank.desc(), *PRODUCT_SORT_COLUMNS)
 
-    def filter_by_tags(self, query: Query[Product], tag_ids: list[int]) -> Query[Product]:
-        """Filter products that have any of the specified tags."""
+    def filter_by_tags(
+        self, query: Query[Product], tag_ids: list[int], match: TagMatch = TagMatch.any
+    ) -> Query[Product]:
+        """Filter products that have any (or all) of the specified tags."""
         if not tag_ids:
             return query
-        query = query.join(
-            EntityTag,
-            and_(
-                Product.id == EntityTag.entity_id,
-                EntityTag.entity_type == EntityType.product,
-            ),
-        )
-        return query.filter(EntityTag.tag_id.in_(tag_ids)).distinct()
+        return query.filter(tagged_with(Product.id, EntityType.product, tag_ids, match))
+
+    def reserve_stock(
+        self, product_quantities: Mapping[int, int], variation_quantities: Mapping[int, int]
+    ) -> tuple[set[int], set[int]]:
+        """Take units of products and variations out of their stock.
+
+        The tracked rows are locked first (see `_lock_stock`), then every row is decremented in a single statement by a
+        conditional `UPDATE ... SET stock = stock - n WHERE stock >= n`. Concurrent checkouts of an item only queue on
+        its row, and check the condition against the stock left once they get it, so stock never goes negative and no
+        table is locked. Rows whose stock isn't tracked (NULL) are left alone.
+
+        Returns the ids of the products and of the variations short of stock. The reservations that succeeded are
+        then still pending: the caller must roll the transaction back.
+        """
+        shortages = [
+            shortage
+            for shortage in (
+                _reserve_stock(_table(Product), "product", product_quantities),
+                _reserve_stock(_table(ProductVariation), "variation", variation_quantities),
+            )
+            if shortage is not None
+        ]
+        if not shortages:
+            return set(), set()
+
+        self._lock_stock(product_quantities, variation_quantities)
+        rows = self.session.execute(union_all(*shortages) if len(shortages) > 1 else shortages[0]).all()
+        # The statement is a select, so it isn't tracked as a write.
+        mark_written(self.session())
+        return (
+            {row.id for row in rows if row.kind == "product"},
+            {row.id for row in rows if row.kind == "variation"},
+        )
+
+    def release_stock(self, product_quantities: Mapping[int, int], variation_quantities: Mapping[int, int]) -> None:
+        """Put units of products and variations back into their stock, e.g. when an order is cancelled."""
+        self._lock_stock(product_quantities, variation_quantities)
+        for table, quantities in (
+            (_table(Product), product_quantities),
+            (_table(ProductVariation), variation_quantities),
+        ):
+            if not quantities:
+                continue
+            released = values(
+                column("id", BigInteger()), column("quantity", Integer()), name=f"released_{table.name}"
+            ).data(list(quantities.items()))
+            self.session.execute(
+                update(table)
+                .where(table.c.id == released.c.id, table.c.stock.is_not(None))
+                .values(stock=table.c.stock + released.c.quantity)
+            )
+
+    def _lock_stock(self, product_ids: Collection[int], variation_ids: Collection[int]) -> None:
+        """Lock the stock-tracked rows of products, then of variations, in id order.
+
+        Postgres locks the rows of an `UPDATE ... FROM` in whatever order its plan visits them, so two checkouts
+        sharing items could each hold a row the other waits for. Locking them up front in a fixed order makes the
+        later one queue instead.
+        """
+        for table, ids in ((_table(Product), product_ids), (_table(ProductVariation), variation_ids)):
+            if ids:
+                self.session.execute(
+                    select(table.c.id)
+                    .where(table.c.id.in_(sorted(ids)), table.c.stock.is_not(None))
+                    .order_by(table.c.id)
+                    .with_for_update()
+                )
+
+    def clone_products(self, product_ids: Iterable[int]) -> dict[int, int]:
+        """Copy products with their translations, variations (with their translations) and tags.
+
+        Runs set-based `INSERT ... SELECT` statements, as many whatever the number of products and variations. Copies
+        are named "<name> (Copy)" and start inactive so admins can review them before publishing. Copies of items
+        whose stock is tracked start out of stock, since they don't share the originals' units. Returns the id of
+        each copy by the id of the product it was copied from; products that don't exist are skipped.
+        """
+        products = _table(Product)
+        translations = _table(ProductTranslation)
+        variations = _table(ProductVariation)
+        variation_translations = _table(ProductVariationTranslation)
+        entity_tags = _table(EntityTag)
+        connection = self.session.connection()
+
+        product_copies: dict[int, int] = dict(
+            connection.execute(
+                _insert_copies(
+                    products,
+                    select(
+                        products.c.id.label("old_id"),
+                        (products.c.name + " (Copy)").label("name"),
+                        products.c.description,
+                        products.c.price,
+                        products.c.image_url,
+                        products.c.order,
+                        sa.false().label("is_active"),
+                        products.c.type,
+                        _no_stock(products.c.stock),
+                    ).where(products.c.id.in_(set(product_ids))),
+                )
+            )
+            .tuples()
+            .all()
+        )
+        if not product_copies:
+            return {}
+        new_products = _id_pairs("product_copies", product_copies)
+
+        connection.execute(
+            insert(translations).from_select(
+                ["product_id", "language", "name", "description"],
+                select(
+                    new_products.c.new_id,
+                    translations.c.language,
+                    translations.c.name + " (Copy)",
+                    translations.c.description,
+                ).join_from(translations, new_products, new_products.c.old_id == translations.c.product_id),
+            )
+        )
+
+        variation_copies: dict[int, int] = dict(
+            connection.execute(
+                _insert_copies(
+                    variations,
+                    select(
+                        variations.c.id.label("old_id"),
+                        new_products.c.new_id.label("product_id"),
+                        variations.c.name,
+                        variations.c.price,
+                        variations.c.image_url,
+                        variations.c.order,
+                        variations.c.is_active,
+                        _no_stock(variations.c.stock),
+                    ).join_from(variations, new_products, new_products.c.old_id == variations.c.product_id),
+                )
+            )
+            .tuples()
+            .all()
+        )
+        if variation_copies:
+            new_variations = _id_pairs("variation_copies", variation_copies)
+            connection.execute(
+                insert(variation_translations).from_select(
+                    ["variation_id", "language", "name"],
+                    select(
+                        new_variations.c.new_id,
+                        variation_translations.c.language,
+                        variation_translations.c.name,
+                    ).join_from(
+                        variation_translations,
+                        new_variations,
+                        new_variations.c.old_id == variation_translations.c.variation_id,
+                    ),
+                )
+            )
+
+        connection.execute(
+            insert(entity_tags).from_select(
+                ["entity_type", "entity_id", "tag_id"],
+                select(entity_tags.c.entity_type, new_products.c.new_id, entity_tags.c.tag_id).join_from(
+                    entity_tags,
+                    new_products,
+                    and_(
+                        entity_tags.c.entity_type == EntityType.product,
+                        entity_tags.c.entity_id == new_products.c.old_id,
+                    ),
+                ),
+            )
+        )
+
+        # The statements bypass the ORM, so neither the catalog versions nor the search documents follow on their own.
+        mark_catalog_changed(
+            self.session(),
+            [
+                CATALOG_KINDS[model]
+                for model in (Product, ProductTranslation, ProductVariation, ProductVariationTranslation, EntityTag)
+            ],
+        )
+        refresh_product_search(self.session(), SearchChanges(product_ids=set(product_copies.values())))
+        return product_copies
+
+
+def _reserve_stock(table: Table, kind: str, quantities: Mapping[int, int]) -> Select[Any] | None:
+    """Build a select decrementing the stock of `table`'s rows, which returns the (kind, id) pairs short of stock."""
+    if not quantities:
+        return None
+    wanted = values(column("id", BigInteger()), column("quantity", Integer()), name=f"wanted_{table.name}").data(
+        list(quantities.items())
+    )
+    reserved = (
+        update(table)
+        .where(table.c.id == wanted.c.id, table.c.stock >= wanted.c.quantity)
+        .values(stock=table.c.stock - wanted.c.quantity)
+        .returning(table.c.id)
+        .cte(f"reserved_{table.name}")
+    )
+    # The select sees the rows as they were before the statement, so tracked rows that weren't reserved are short.
+    return (
+        select(sa.literal(kind).label("kind"), wanted.c.id)
+        .join_from(wanted, table, table.c.id == wanted.c.id)
+        .where(table.c.stock.is_not(None), wanted.c.id.not_in(select(reserved.c.id)))
+    )
+
+
+def _table(model: type[BaseModel]) -> Table:
+    return cast(Table, model.__table__)
+
+
+def _insert_copies(table: Table, source: Select[Any]) -> Select[tuple[int, int]]:
+    """Build a statement copying the rows `source` selects into `table`, returning their (old id, new id) pairs.
+
+    `source` selects the id of each row to copy as `old_id`, followed by the values of the copy's columns. New ids are
+    drawn from the table's sequence up front, which pairs each copy with its original; `RETURNING` alone can't tell
+    which row a copy came from.
+    """
+    sequence = func.pg_get_serial_sequence(table.name, "id")
+    # A CTE calling the volatile `nextval` is materialized, so both references below see the same ids.
+    copies = source.add_columns(func.nextval(sequence).label("new_id")).cte(f"{table.name}_copies")
+    copied_columns = [copy_column for copy_column in copies.c if copy_column.name not in ("old_id", "new_id")]
+    inserted = (
+        insert(table)
+        .from_select(
+            ["id", *(copy_column.name for copy_column in copied_columns)],
+            select(copies.c.new_id, *copied_columns),
+        )
+        .returning(table.c.id)
+        .cte(f"inserted_{table.name}")
+    )
+    return select(copies.c.old_id, inserted.c.id).join_from(copies, inserted, inserted.c.id == copies.c.new_id)
+
+
+def _no_stock(stock: ColumnElement[Any]) -> ColumnElement[Any]:
+    """Stock of a copy: untracked (NULL) for untracked items, none otherwise."""
+    return sa.case((stock.is_(None), sa.null()), else_=0).label("stock")
+
+
+def _id_pairs(name: str, ids: dict[int, int]) -> Values:
+    """VALUES list of (old_id, new_id) pairs, to join the rows of copied entities to their copies."""
+    return values(column("old_id", BigInteger()), column("new_id", BigInteger()), name=name).data(list(ids.items()))
+
+
+def _languages_by_config(languages: list[str] | None) -> list[tuple[str, list[str]]]:
+    """Group document languages by text search configuration; `None` means every language."""
+    by_config: dict[str, list[str]] = {}
+    for language in languages if languages is not None else SEARCH_CONFIGS:
+        by_config.setdefault(SEARCH_CONFIGS.get(language, DEFAULT_SEARCH_CONFIG), []).append(language)
+    if languages is None:
+        # Languages without a configuration of their own are matched by exclusion.
+        by_config.setdefault(DEFAULT_SEARCH_CONFIG, [])
+    return list(by_config.items())
@@ -1,9 +1,10 @@
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 from sqlalchemy.orm import Query
 
 from app.models.product import Product, ProductType
 from app.models.tag import EntityTag, EntityType, Tag
 from app.models.tip import Tip, TipType
+from app.models.translations import translations_in
 from app.repos.base import Repo
 
 
@@ -23,10 +24,13 @@ class TagRepo(Repo[Tag]):
         """Get a tag by its label."""
         return self.get_query().filter(Tag.label == label).first()
 
-    def get_tags_with_products_by_type(self, product_type: ProductType) -> list[Tag]:
-        """Get tags that have at least one active product of the specified type and are filterable."""
+    def get_tags_with_products_by_type(self, product_type: ProductType, language: str | None) -> list[Tag]:
+        """Get tags that have at least one active product of the specified type and are filterable.
+
+        Only their translations to `language` are loaded.
+        """
         return (
-            self.get_query()
+            self.in_language(self.get_query(), language)
             .join(EntityTag, Tag.id == EntityTag.tag_id)
             .join(
                 Product,
@@ -45,10 +49,31 @@ class TagRepo(Repo[Tag]):
             .all()
         )
 
-    def get_tags_with_tips_by_type(self, tip_type: TipType) -> list[Tag]:
-        """Get tags that have at least one active tip of the specified type and are filterable."""
+    def get_product_facets(self, products: Query[Product], language: str | None) -> list[tuple[Tag, int]]:
+        """Get the filterable tags of the given products, along with how many of those products have each tag.
+
+        Counted in a single aggregate over `entity_tags`; tags none of the products have are left out. Only the tags'
+        translations to `language` are loaded.
+        """
+        product_ids = products.order_by(None).with_entities(Product.id).scalar_subquery()
+        rows = (
+            self.session.query(Tag, func.count(EntityTag.id))
+            .join(EntityTag, and_(Tag.id == EntityTag.tag_id, EntityTag.entity_type == EntityType.product))
+            .filter(EntityTag.entity_id.in_(product_ids), Tag.is_filterable.is_(True))
+            .group_by(Tag.id)
+            .order_by(Tag.order, Tag.label)
+            .options(*translations_in(language))
+            .all()
+        )
+        return [(tag, count) for tag, count in rows]
+
+    def get_tags_with_tips_by_type(self, tip_type: TipType, language: str | None) -> list[Tag]:
+        """Get tags that have at least one active tip of the specified type and are filterable.
+
+        Only their translations to `language` are loaded.
+        """
         return (
-            self.get_query()
+            self.in_language(self.get_query(), language)
             .join(EntityTag, Tag.id == EntityTag.tag_id)
             .join(
                 Tip,
@@ -69,7 +94,5 @@ class TagRepo(Repo[Tag]):
 
     def get_max_order(self) -> int:
         """Get the maximum order value among all tags."""
-        from sqlalchemy import func
-
         result = self.session.query(func.max(Tag.order)).scalar()
         return result if result is not None else -1
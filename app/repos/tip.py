@@ -1,9 +1,9 @@
-from sqlalchemy import and_
 from sqlalchemy.orm import Query
 
-from app.models.tag import EntityTag, EntityType
+from app.models.tag import EntityType, TagMatch
 from app.models.tip import Tip, TipType
 from app.repos.base import Repo
+from app.repos.entity_tag import tagged_with
 
 
 class TipRepo(Repo[Tip]):
@@ -28,18 +28,11 @@ class TipRepo(Repo[Tip]):
             query = query.filter(Tip.tip_type == TipType(tip_type))
         return query.order_by(Tip.order, Tip.inserted_at)
 
-    def filter_by_tags(self, query: Query[Tip], tag_ids: list[int]) -> Query[Tip]:
-        """Filter tips that have any of the specified tags."""
+    def filter_by_tags(self, query: Query[Tip], tag_ids: list[int], match: TagMatch = TagMatch.any) -> Query[Tip]:
+        """Filter tips that have any (or all) of the specified tags."""
         if not tag_ids:
             return query
-        query = query.join(
-            EntityTag,
-            and_(
-                Tip.id == EntityTag.entity_id,
-                EntityTag.entity_type == EntityType.tip,
-            ),
-        )
-        return query.filter(EntityTag.tag_id.in_(tag_ids)).distinct()
+        return query.filter(tagged_with(Tip.id, EntityType.tip, tag_ids, match))
 
     def get_max_order(self) -> int:
         """Get the maximum order value among all tips."""
@@ -1,3 +1,4 @@
 from app.services.cloud_storage import CloudStorageService
+from app.services.shared_cache import SharedMemoryCache
 
-__all__ = ["CloudStorageService"]
+__all__ = ["CloudStorageService", "SharedMemoryCache"]
@@ -0,0 +1,132 @@
+import hashlib
+import logging
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+
+
+class SharedMemoryCache:
+    """Cross-worker cache of rendered payloads backed by memory-mapped files.
+
+    Every gunicorn worker on a machine points at the same tmpfs directory (/dev/shm in production). One worker
+    serializes a payload and writes it to a file named after the catalog version it was rendered from, in a directory
+    named after the cache key; the other workers map that file and copy its bytes out instead of querying the
+    database and re-serializing.
+
+    Keys are capped at `max_entries`: once a worker counts that many, the oldest keys are evicted. Each worker only
+    counts the keys it writes, re-counting every key when it reaches the cap, so the directory may briefly exceed it.
+    """
+
+    def __init__(self, directory: str, enabled: bool = True, max_entries: int = 256) -> None:
+        self._logger = logging.getLogger(__name__)
+        self._directory = os.path.join(directory, "almacen-cache")
+        # Open maps per key digest, along with the filename (and therefore version) they were opened from.
+        self._maps: dict[str, tuple[str, mmap.mmap]] = {}
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        # Keys in the directory as far as this worker knows, counted on its first write.
+        self._entry_count: int | None = None
+        self._enabled = enabled
+        if enabled:
+            try:
+                os.makedirs(self._directory, exist_ok=True)
+            except OSError:
+                self._logger.warning(f"Shared cache directory {self._directory} is not usable, disabling it")
+                self._enabled = False
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def get(self, key: str, version: str) -> bytes | None:
+        """Get the payload stored for a key at the given version, if any worker has rendered it."""
+        if not self._enabled:
+            return None
+
+        key_digest = self._digest(key)
+        filename = self._filename(key_digest, version)
+        with self._lock:
+            entry = self._maps.get(key_digest)
+            # Copied while locked: a newer version of the key closes the map.
+            if entry is not None and entry[0] == filename:
+                return entry[1][:]
+
+            try:
+                with open(filename, "rb") as payload_file:
+                    mapped = mmap.mmap(payload_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (FileNotFoundError, ValueError):
+                return None
+            if entry is not None:
+                entry[1].close()
+                del self._maps[key_digest]
+            elif len(self._maps) >= self._max_entries:
+                # Close the least recently opened map; its key may well have been evicted.
+                self._maps.pop(next(iter(self._maps)))[1].close()
+            self._maps[key_digest] = (filename, mapped)
+            return mapped[:]
+
+    def set(self, key: str, version: str, payload: bytes) -> None:
+        """Publish a rendered payload to the other workers and drop the payloads of older versions of the key."""
+        if not self._enabled or not payload:
+            return
+
+        key_digest = self._digest(key)
+        key_directory = os.path.join(self._directory, key_digest)
+        filename = self._filename(key_digest, version)
+        with self._lock:
+            try:
+                os.mkdir(key_directory)
+            except FileExistsError:
+                stale_filenames = [name for name in os.listdir(key_directory) if name != os.path.basename(filename)]
+            except OSError:
+                self._logger.warning(f"Unable to create shared cache entry {key_directory}", exc_info=True)
+                return
+            else:
+                stale_filenames = []
+                self._count_new_entry(key_digest)
+
+        try:
+            # Write to a temporary file first so readers never map a partially written payload.
+            fd, tmp_filename = tempfile.mkstemp(dir=self._directory, prefix=".tmp-")
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(payload)
+            os.replace(tmp_filename, filename)
+        except OSError:
+            self._logger.warning(f"Unable to write shared cache entry {filename}", exc_info=True)
+            return
+
+        for stale_filename in stale_filenames:
+            try:
+                # Workers that still have the file mapped keep reading it until they close the map.
+                os.remove(os.path.join(key_directory, stale_filename))
+            except FileNotFoundError:
+                pass
+
+    def _count_new_entry(self, key_digest: str) -> None:
+        if self._entry_count is not None and self._entry_count < self._max_entries:
+            self._entry_count += 1
+            return
+
+        # First write, or at the cap: count every worker's keys and evict the oldest (last rendered) ones, leaving
+        # room for a quarter of the cap before counting again.
+        entries = []
+        with os.scandir(self._directory) as directory_entries:
+            for directory_entry in directory_entries:
+                if directory_entry.is_dir(follow_symlinks=False) and directory_entry.name != key_digest:
+                    try:
+                        entries.append((directory_entry.stat().st_mtime, directory_entry.path))
+                    except FileNotFoundError:
+                        pass
+        entries.sort()
+        evicted = max(0, len(entries) + 1 - self._max_entries * 3 // 4)
+        for _, path in entries[:evicted]:
+            shutil.rmtree(path, ignore_errors=True)
+        self._entry_count = len(entries) + 1 - evicted
+
+    def _digest(self, value: str) -> str:
+        return hashlib.sha1(value.encode(), usedforsecurity=False).hexdigest()
+
+    def _filename(self, key_digest: str, version: str) -> str:
+        return os.path.join(self._directory, key_digest, f"{self._digest(version)[:16]}.json")
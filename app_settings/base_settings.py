@@ -1,8 +1,10 @@
-from pydantic import Field
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings
+from typing_extensions import Self
 
 from environment import Environment
 
+from .cache import CacheSettings
 from .google import GoogleCloudSettings
 from .gunicorn import GunicornSettings
 from .log import LoggingSettings
@@ -14,7 +16,30 @@ class Settings(BaseSettings):
     session_key: str = Field(alias="FLASK_SESSION_KEY")
     environment: Environment = Field(alias="ENVIRONMENT")
 
+    cache: CacheSettings = Field(CacheSettings())
     google: GoogleCloudSettings = Field(GoogleCloudSettings())
     gunicorn: GunicornSettings = Field(GunicornSettings())
     logging: LoggingSettings = Field(LoggingSettings())
     sqlalchemy: SQLAlchemySettings = Field(SQLAlchemySettings())
+
+    @model_validator(mode="after")
+    def check_connection_budget(self) -> Self:
+        """Make sure every gunicorn thread can get a connection, without the workers exceeding the database's limit."""
+        threads, workers = self.gunicorn.num_threads, self.gunicorn.num_workers
+        if self.sqlalchemy.null_pool:
+            connections_per_worker = threads
+        else:
+            connections_per_worker = self.sqlalchemy.max_pool_connections
+            if connections_per_worker < threads:
+                raise ValueError(
+                    f"SQLALCHEMY_POOL_SIZE + SQLALCHEMY_MAX_OVERFLOW ({connections_per_worker}) must be at least "
+                    f"GUNICORN_NUM_THREADS ({threads}), or threads wait for connections"
+                )
+
+        max_connections = self.sqlalchemy.max_connections
+        if max_connections and workers * connections_per_worker > max_connections:
+            raise ValueError(
+                f"GUNICORN_NUM_WORKERS ({workers}) x {connections_per_worker} connections per worker exceeds "
+                f"SQLALCHEMY_MAX_CONNECTIONS ({max_connections})"
+            )
+        return self
@@ -0,0 +1,15 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class CacheSettings(BaseSettings):
+    shared_enabled: bool = Field(default=True, alias="CACHE_SHARED_ENABLED")
+    # tmpfs mount shared by every gunicorn worker on the machine.
+    shared_dir: str = Field(default="/dev/shm", alias="CACHE_SHARED_DIR")
+    # How stale catalog versions written by other workers or machines may be before they're re-read.
+    version_ttl_seconds: float = Field(default=1.0, alias="CACHE_VERSION_TTL_SECONDS")
+
+    # Response caching for the public storefront blueprints; everything else is sent with `no-store`.
+    public_max_age_seconds: int = Field(default=60, alias="CACHE_PUBLIC_MAX_AGE_SECONDS")
+    public_stale_while_revalidate_seconds: int = Field(default=600, alias="CACHE_PUBLIC_STALE_WHILE_REVALIDATE_SECONDS")
+    health_max_age_seconds: int = Field(default=5, alias="CACHE_HEALTH_MAX_AGE_SECONDS")
@@ -2,31 +2,56 @@ from typing import Any
 
 from pydantic import Field, ValidationInfo, field_validator
 from pydantic_settings import BaseSettings
+from sqlalchemy.pool import NullPool
 
 
 class SQLAlchemySettings(BaseSettings):
     database_url: str = Field(default=..., alias="DATABASE_URL")
     database_url_test: str = Field(alias="DATABASE_URL_TEST", default="")
+    # Optional read replica serving the storefront's GET requests.
+    database_replica_url: str = Field(alias="DATABASE_REPLICA_URL", default="")
+    # Set on every transaction a request opens, in milliseconds.
     statement_timeout: str = Field(default="10000", alias="SQLALCHEMY_STATEMENT_TIMEOUT")
     idle_in_transaction_session_timeout: str = Field(
         default="10000", alias="SQLALCHEMY_IDLE_IN_TRANSACTION_SESSION_TIMEOUT_MS"
     )
+    # Statement timeouts of the public storefront and of the admin routes, overriding the default one.
+    storefront_statement_timeout: str = Field(default="5000", alias="SQLALCHEMY_STOREFRONT_STATEMENT_TIMEOUT")
+    admin_statement_timeout: str = Field(default="30000", alias="SQLALCHEMY_ADMIN_STATEMENT_TIMEOUT")
+    # Connection pool of each gunicorn worker (and of each engine, when there's a replica).
+    pool_size: int = Field(default=5, ge=1, alias="SQLALCHEMY_POOL_SIZE")
+    max_overflow: int = Field(default=10, ge=0, alias="SQLALCHEMY_MAX_OVERFLOW")
+    pool_timeout: float = Field(default=30.0, gt=0, alias="SQLALCHEMY_POOL_TIMEOUT")
+    # Seconds after which connections are replaced; -1 keeps them forever.
+    pool_recycle: int = Field(default=-1, alias="SQLALCHEMY_POOL_RECYCLE")
+    # Reuse the most recently returned connection, so surplus connections sit idle and can be recycled.
+    pool_use_lifo: bool = Field(default=False, alias="SQLALCHEMY_POOL_USE_LIFO")
+    # Open a connection per checkout instead of pooling, for when pgbouncer pools transactions in front of Postgres.
+    null_pool: bool = Field(default=False, alias="SQLALCHEMY_NULL_POOL")
+    # Connections the database accepts from this app across every worker; 0 skips the check.
+    max_connections: int = Field(default=0, ge=0, alias="SQLALCHEMY_MAX_CONNECTIONS")
+    # Pooled connections idle for longer than this are pinged before being reused.
+    pool_ping_after_seconds: float = Field(default=30.0, alias="SQLALCHEMY_POOL_PING_AFTER_SECONDS")
+    # How many times an idempotent request is replayed after losing its database connection.
+    disconnect_retries: int = Field(default=1, alias="SQLALCHEMY_DISCONNECT_RETRIES")
     engine_options: dict[str, Any] = {}
 
+    @property
+    def max_pool_connections(self) -> int:
+        """Most connections a single engine's pool opens at once."""
+        return self.pool_size + self.max_overflow
+
     @field_validator("engine_options")
     def create_engine_options(cls, v: Any, info: ValidationInfo) -> dict[str, Any]:
-        database_url = info.data.get("database_url", "")
-
-        # PgBouncer (used by fly.io managed Postgres) doesn't support
-        # setting statement_timeout via connect_args
-        if "pgbouncer" in database_url or "flympg.net" in database_url:
-            return {}
-
-        statement_timeout = f"statement_timeout={info.data['statement_timeout']}"
-        idle_in_transaction_session_timeout = (
-            f"idle_in_transaction_session_timeout={info.data['idle_in_transaction_session_timeout']}"
-        )
-        result = {
-            "connect_args": {"options": f"-c {statement_timeout} -c {idle_in_transaction_session_timeout}"},
-        }
+        result: dict[str, Any] = {}
+        if info.data["null_pool"]:
+            result["poolclass"] = NullPool
+        else:
+            result.update(
+                pool_size=info.data["pool_size"],
+                max_overflow=info.data["max_overflow"],
+                pool_timeout=info.data["pool_timeout"],
+                pool_recycle=info.data["pool_recycle"],
+                pool_use_lifo=info.data["pool_use_lifo"],
+            )
         return result
@@ -0,0 +1,121 @@
+"""Compare Flask's default JSON provider with the orjson one on a catalog-sized payload.
+
+Usage: python -m bin.benchmark_json [--products 1000] [--repeat 20]
+"""
+
+import argparse
+import timeit
+from datetime import datetime
+from decimal import Decimal
+from typing import cast
+
+from dotenv import load_dotenv
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
+
+load_dotenv(override=True)
+
+from app.json_provider import OrjsonProvider  # noqa: E402
+from app.models import (  # noqa: E402
+    EntityTag,
+    Product,
+    ProductTranslation,
+    ProductVariation,
+    ProductVariationTranslation,
+    Tag,
+    TagTranslation,
+)
+from app.models.product import ProductType  # noqa: E402
+from app.models.tag import EntityType  # noqa: E402
+
+
+def build_products(count: int) -> list[Product]:
+    now = datetime.now()
+    tags = [
+        Tag(
+            id=tag_id,
+            label=f"tag-{tag_id}",
+            order=tag_id,
+            is_filterable=True,
+            bg_color="#f5f5f4",
+            text_color="#57534e",
+            inserted_at=now,
+            updated_at=now,
+            translations={"en": TagTranslation(id=tag_id, tag_id=tag_id, language="en", label=f"Tag {tag_id}")},
+        )
+        for tag_id in range(1, 21)
+    ]
+    products = []
+    for product_id in range(1, count + 1):
+        product = Product(
+            id=product_id,
+            name=f"Producto {product_id}",
+            description="Descripción del producto " * 8,
+            price=Decimal("12500.00") + product_id,
+            image_url=f"https://storage.googleapis.com/almacen/products/{product_id}.jpg",
+            order=product_id,
+            is_active=True,
+            type=list(ProductType)[product_id % len(ProductType)],
+            inserted_at=now,
+            updated_at=now,
+            translations={
+                "en": ProductTranslation(
+                    id=product_id,
+                    product_id=product_id,
+                    language="en",
+                    name=f"Product {product_id}",
+                    description="Product description " * 8,
+                )
+            },
+            variations=[
+                ProductVariation(
+                    id=product_id * 10 + index,
+                    product_id=product_id,
+                    name=f"Variación {index}",
+                    price=Decimal("13000.00") + index,
+                    image_url=None,
+                    order=index,
+                    is_active=True,
+                    inserted_at=now,
+                    updated_at=now,
+                    translations={
+                        "en": ProductVariationTranslation(
+                            id=product_id * 10 + index,
+                            variation_id=product_id * 10 + index,
+                            language="en",
+                            name=f"Variation {index}",
+                        )
+                    },
+                )
+                for index in range(3)
+            ],
+        )
+        product._entity_tags = [
+            EntityTag(entity_type=EntityType.product, entity_id=product_id, tag_id=tag.id, tag=tag)
+            for tag in tags[product_id % 17 : product_id % 17 + 3]
+        ]
+        products.append(product)
+    return products
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    products = build_products(args.products)
+    payload = {"data": [product.to_dict_with_language("en") for product in products]}
+
+    app = Flask(__name__)
+    providers = {"default": DefaultJSONProvider(app), "orjson": OrjsonProvider(app)}
+    with app.app_context():
+        for name, provider in providers.items():
+            app.json = provider
+            size = len(cast(Response, provider.response(payload)).get_data())
+            seconds = min(timeit.repeat(lambda: provider.response(payload), number=1, repeat=args.repeat))
+            print(f"{name:>8}: {seconds * 1000:8.2f} ms per response, {size / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
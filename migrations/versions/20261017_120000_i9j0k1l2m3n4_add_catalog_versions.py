@@ -0,0 +1,44 @@
+"""Add catalog_versions table for automatic cache invalidation
+
+Revision ID: i9j0k1l2m3n4
+Revises: h8i9j0k1l2m3
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "i9j0k1l2m3n4"
+down_revision = "h8i9j0k1l2m3"
+branch_labels = None
+depends_on = None
+
+CATALOG_KINDS = (
+    "products",
+    "product_translations",
+    "product_variations",
+    "product_variation_translations",
+    "tags",
+    "tag_translations",
+    "entity_tags",
+    "tips",
+    "tip_translations",
+)
+
+
+def upgrade() -> None:
+    catalog_versions = op.create_table(
+        "catalog_versions",
+        sa.Column("kind", sa.String(50), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("kind"),
+    )
+    # Seed one row per catalog kind; the app upserts missing kinds anyway.
+    op.bulk_insert(catalog_versions, [{"kind": kind, "version": 0} for kind in CATALOG_KINDS])
+
+
+def downgrade() -> None:
+    op.drop_table("catalog_versions")
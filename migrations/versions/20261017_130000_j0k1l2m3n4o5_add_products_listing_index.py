@@ -0,0 +1,23 @@
+"""Add index on products listing order for keyset pagination
+
+Revision ID: j0k1l2m3n4o5
+Revises: i9j0k1l2m3n4
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "j0k1l2m3n4o5"
+down_revision = "i9j0k1l2m3n4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_products_order_inserted_at_id", "products", ["order", "inserted_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_products_order_inserted_at_id", table_name="products")
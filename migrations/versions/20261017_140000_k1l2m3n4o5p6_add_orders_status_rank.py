@@ -0,0 +1,42 @@
+"""Add generated status_rank column and admin listing index to orders
+
+Revision ID: k1l2m3n4o5p6
+Revises: j0k1l2m3n4o5
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "k1l2m3n4o5p6"
+down_revision = "j0k1l2m3n4o5"
+branch_labels = None
+depends_on = None
+
+STATUS_RANK_EXPRESSION = (
+    "CASE status WHEN 'confirmed' THEN 0 WHEN 'processed' THEN 1 WHEN 'cancelled' THEN 2 ELSE 3 END"
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "orders",
+        sa.Column(
+            "status_rank",
+            sa.SmallInteger(),
+            sa.Computed(STATUS_RANK_EXPRESSION, persisted=True),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_orders_status_rank_updated_at_id",
+        "orders",
+        ["status_rank", sa.text("updated_at DESC"), sa.text("id DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_orders_status_rank_updated_at_id", table_name="orders")
+    op.drop_column("orders", "status_rank")
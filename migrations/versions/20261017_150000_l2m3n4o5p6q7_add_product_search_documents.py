@@ -0,0 +1,103 @@
+"""Add product_search_documents for full-text and trigram product search
+
+Revision ID: l2m3n4o5p6q7
+Revises: k1l2m3n4o5p6
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "l2m3n4o5p6q7"
+down_revision = "k1l2m3n4o5p6"
+branch_labels = None
+depends_on = None
+
+# Same documents `app.models.search_index` maintains on write, for every existing product.
+BACKFILL_SQL = """
+WITH pieces AS (
+    SELECT id AS product_id, '' AS language, 'A' AS weight, name AS text FROM products
+    UNION ALL
+    SELECT id, '', 'B', description FROM products WHERE description IS NOT NULL
+    UNION ALL
+    SELECT product_id, language, 'A', name FROM product_translations
+    UNION ALL
+    SELECT product_id, language, 'B', description FROM product_translations WHERE description IS NOT NULL
+    UNION ALL
+    SELECT product_id, '', 'C', name FROM product_variations
+    UNION ALL
+    SELECT v.product_id, vt.language, 'C', vt.name
+    FROM product_variations v JOIN product_variation_translations vt ON vt.variation_id = v.id
+    UNION ALL
+    SELECT et.entity_id, '', 'C', t.label
+    FROM entity_tags et JOIN tags t ON t.id = et.tag_id
+    WHERE et.entity_type = 'product'
+    UNION ALL
+    SELECT et.entity_id, tt.language, 'C', tt.label
+    FROM entity_tags et JOIN tag_translations tt ON tt.tag_id = et.tag_id
+    WHERE et.entity_type = 'product'
+),
+configured AS (
+    SELECT
+        pieces.*,
+        CAST(
+            CASE language
+                WHEN '' THEN 'spanish'
+                WHEN 'es' THEN 'spanish'
+                WHEN 'en' THEN 'english'
+                WHEN 'pt' THEN 'portuguese'
+                ELSE 'simple'
+            END AS regconfig
+        ) AS config
+    FROM pieces
+)
+INSERT INTO product_search_documents (product_id, language, document, search_vector)
+SELECT
+    product_id,
+    language,
+    lower(unaccent(string_agg(text, ' '))),
+    setweight(to_tsvector(config, unaccent(coalesce(string_agg(text, ' ') FILTER (WHERE weight = 'A'), ''))), 'A')
+    || setweight(to_tsvector(config, unaccent(coalesce(string_agg(text, ' ') FILTER (WHERE weight = 'B'), ''))), 'B')
+    || setweight(to_tsvector(config, unaccent(coalesce(string_agg(text, ' ') FILTER (WHERE weight = 'C'), ''))), 'C')
+FROM configured
+GROUP BY product_id, language, config
+"""
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.create_table(
+        "product_search_documents",
+        sa.Column("product_id", sa.BigInteger(), nullable=False),
+        sa.Column("language", sa.String(length=5), nullable=False),
+        sa.Column("document", sa.Text(), nullable=False),
+        sa.Column("search_vector", postgresql.TSVECTOR(), nullable=False),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("product_id", "language"),
+    )
+    op.create_index(
+        "ix_product_search_documents_search_vector",
+        "product_search_documents",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_product_search_documents_document_trgm",
+        "product_search_documents",
+        ["document"],
+        postgresql_using="gin",
+        postgresql_ops={"document": "gin_trgm_ops"},
+    )
+
+    op.execute(BACKFILL_SQL)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_product_search_documents_document_trgm", table_name="product_search_documents")
+    op.drop_index("ix_product_search_documents_search_vector", table_name="product_search_documents")
+    op.drop_table("product_search_documents")
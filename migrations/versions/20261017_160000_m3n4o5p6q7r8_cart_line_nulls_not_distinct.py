@@ -0,0 +1,61 @@
+"""Merge duplicate cart lines and make uq_cart_product_variation NULLS NOT DISTINCT
+
+Lines without a variation were never unique, so duplicates are merged first. On large tables, run
+`flask carts merge-duplicate-lines` beforehand: it merges them in batches, leaving this migration little to do while
+it holds its lock.
+
+Revision ID: m3n4o5p6q7r8
+Revises: l2m3n4o5p6q7
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "m3n4o5p6q7r8"
+down_revision = "l2m3n4o5p6q7"
+branch_labels = None
+depends_on = None
+
+# Same merge as `CartItemRepo.merge_duplicate_lines`, for every cart: the oldest line keeps the summed quantity.
+MERGE_DUPLICATE_LINES_SQL = """
+WITH duplicates AS (
+    SELECT min(id) AS keep_id, sum(quantity) AS quantity
+    FROM cart_items
+    WHERE variation_id IS NULL
+    GROUP BY cart_id, product_id
+    HAVING count(*) > 1
+),
+merged AS (
+    UPDATE cart_items
+    SET quantity = duplicates.quantity, updated_at = now()
+    FROM duplicates
+    WHERE cart_items.id = duplicates.keep_id
+    RETURNING cart_items.id, cart_items.cart_id, cart_items.product_id
+)
+DELETE FROM cart_items
+USING merged
+WHERE cart_items.cart_id = merged.cart_id
+    AND cart_items.product_id = merged.product_id
+    AND cart_items.variation_id IS NULL
+    AND cart_items.id != merged.id
+"""
+
+
+def upgrade() -> None:
+    # Keep new duplicates out between the merge and the new constraint.
+    op.execute("LOCK TABLE cart_items IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(MERGE_DUPLICATE_LINES_SQL)
+    op.drop_constraint("uq_cart_product_variation", "cart_items", type_="unique")
+    op.create_unique_constraint(
+        "uq_cart_product_variation",
+        "cart_items",
+        ["cart_id", "product_id", "variation_id"],
+        postgresql_nulls_not_distinct=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_cart_product_variation", "cart_items", type_="unique")
+    op.create_unique_constraint("uq_cart_product_variation", "cart_items", ["cart_id", "product_id", "variation_id"])
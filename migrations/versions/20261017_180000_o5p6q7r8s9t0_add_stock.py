@@ -0,0 +1,31 @@
+"""Add stock to products and product_variations
+
+Revision ID: o5p6q7r8s9t0
+Revises: n4o5p6q7r8s9
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "o5p6q7r8s9t0"
+down_revision = "n4o5p6q7r8s9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Nullable without default: existing products keep selling without stock tracking, and nothing is rewritten.
+    op.add_column("products", sa.Column("stock", sa.Integer(), nullable=True))
+    op.create_check_constraint("ck_products_stock_non_negative", "products", "stock >= 0")
+    op.add_column("product_variations", sa.Column("stock", sa.Integer(), nullable=True))
+    op.create_check_constraint("ck_product_variations_stock_non_negative", "product_variations", "stock >= 0")
+
+
+def downgrade() -> None:
+    op.drop_constraint("ck_product_variations_stock_non_negative", "product_variations", type_="check")
+    op.drop_column("product_variations", "stock")
+    op.drop_constraint("ck_products_stock_non_negative", "products", type_="check")
+    op.drop_column("products", "stock")
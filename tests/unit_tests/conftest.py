@@ -2,4 +2,91 @@ import os
 import sys
 
 os.environ["APP_ENV"] = "test"
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from typing import Any, Callable, Iterator
+
+import flask
+import flask_migrate
+import jwt
+import pytest
+from flask.testing import FlaskClient
+from sqlalchemy import text
+from sqlalchemy_utils import create_database, database_exists, drop_database
+
+from app.container import ApplicationContainer, get_wire_container
+from app.create_app import create_app
+from app.db import db
+from app.middlewares.admin_auth import JWT_ALGORITHM
+from app_settings import settings
+
+MIGRATIONS_DIRECTORY = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../migrations"))
+
+
+@pytest.fixture(scope="session")
+def container() -> ApplicationContainer:
+    return get_wire_container()
+
+
+@pytest.fixture(scope="session")
+def app(container: ApplicationContainer) -> Iterator[flask.Flask]:
+    """App bound to a fresh test database, migrated to the latest revision."""
+    database_url = settings.sqlalchemy.database_url
+    if database_exists(database_url):
+        drop_database(database_url)
+    create_database(database_url)
+
+    app = create_app()
+    with app.app_context():
+        flask_migrate.upgrade(directory=MIGRATIONS_DIRECTORY)
+    yield app
+
+    with app.app_context():
+        db.engine.dispose()
+    drop_database(database_url)
+
+
+@pytest.fixture(autouse=True)
+def clean_database(app: flask.Flask, container: ApplicationContainer) -> Iterator[None]:
+    """Empty every table after each test, and drop the controllers' in-process caches."""
+    yield
+    container.reset_singletons()
+    with app.app_context():
+        db.session.rollback()
+        tables = ", ".join(f'"{table.name}"' for table in db.metadata.sorted_tables)
+        db.session.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+        db.session.commit()
+
+
+@pytest.fixture
+def app_context(app: flask.Flask) -> Iterator[None]:
+    """App context for tests calling repos and controllers directly.
+
+    Don't send test client requests while it's pushed: they'd share its session instead of getting their own.
+    """
+    with app.app_context():
+        yield
+
+
+@pytest.fixture
+def client(app: flask.Flask) -> FlaskClient:
+    return app.test_client()
+
+
+@pytest.fixture
+def admin_headers() -> dict[str, str]:
+    token = jwt.encode({"sub": "admin"}, settings.session_key, algorithm=JWT_ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def add(app: flask.Flask) -> Callable[..., list[int]]:
+    """Commit new entities, with whatever they cascade to, and get their ids."""
+
+    def add(*entities: Any) -> list[int]:
+        with app.app_context():
+            db.session.add_all(entities)
+            db.session.commit()
+            return [entity.id for entity in entities]
+
+    return add
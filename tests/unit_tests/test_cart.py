@@ -0,0 +1,134 @@
+import threading
+from decimal import Decimal
+from http import HTTPStatus
+from typing import Any, Callable
+
+import flask
+from flask.testing import FlaskClient
+from sqlalchemy import delete, select, text
+
+from app.container import ApplicationContainer
+from app.db import db
+from app.models import Cart, CartItem, Product, ProductVariation
+
+
+def _add_item(client: FlaskClient, token: str, product_id: int, variation_id: int | None, quantity: int) -> Any:
+    return client.post(
+        f"/api/v1/cart/{token}/items",
+        json={"product_id": product_id, "variation_id": variation_id, "quantity": quantity},
+    )
+
+
+def test_add_item_sums_quantities_of_the_same_line(client: FlaskClient, add: Callable[..., list[int]]) -> None:
+    (product_id,) = add(Product(name="Mate", price=Decimal("20.00")))
+    (variation_id,) = add(ProductVariation(product_id=product_id, name="Calabaza"))
+    token = client.post("/api/v1/cart").get_json()["token"]
+
+    for variation, quantity in ((None, 1), (variation_id, 2), (None, 3), (variation_id, 4)):
+        response = _add_item(client, token, product_id, variation, quantity)
+        assert response.status_code == HTTPStatus.OK, response.get_json()
+
+    cart = client.get(f"/api/v1/cart/{token}").get_json()
+    assert cart["token"] == token
+    assert {item["variation_id"]: item["quantity"] for item in cart["items"]} == {None: 4, variation_id: 6}
+
+
+def test_add_item_to_an_unknown_cart_creates_one(client: FlaskClient, add: Callable[..., list[int]]) -> None:
+    (product_id,) = add(Product(name="Yerba", price=Decimal("10.00")))
+
+    response = _add_item(client, "unknown", product_id, None, 2)
+
+    assert response.status_code == HTTPStatus.OK, response.get_json()
+    assert response.get_json()["token"] != "unknown"
+    assert [item["quantity"] for item in response.get_json()["items"]] == [2]
+
+
+def test_add_item_unavailable(client: FlaskClient, add: Callable[..., list[int]]) -> None:
+    inactive_id, product_id, other_id = add(
+        Product(name="Yerba", price=Decimal("10.00"), is_active=False),
+        Product(name="Mate", price=Decimal("20.00")),
+        Product(name="Termo", price=Decimal("30.00")),
+    )
+    inactive_variation_id, other_variation_id = add(
+        ProductVariation(product_id=product_id, name="Calabaza", is_active=False),
+        ProductVariation(product_id=other_id, name="Acero"),
+    )
+    token = client.post("/api/v1/cart").get_json()["token"]
+
+    for product, variation in (
+        (inactive_id, None),
+        (product_id, inactive_variation_id),
+        (product_id, other_variation_id),
+        (other_id + 100, None),
+    ):
+        response = _add_item(client, token, product, variation, 1)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (product, variation)
+
+    assert client.get(f"/api/v1/cart/{token}").get_json()["items"] == []
+
+
+def test_merge_duplicate_lines(
+    app_context: None, add: Callable[..., list[int]], container: ApplicationContainer
+) -> None:
+    (product_id,) = add(
+        Product(name="Mate", price=Decimal("20.00"), variations=[ProductVariation(name="Calabaza")]),
+    )
+    cart_id, other_cart_id = add(Cart(token="a"), Cart(token="b"))
+    variation_id = db.session.execute(select(ProductVariation.id)).scalar_one()
+    # Duplicates can only exist in carts from before the constraint treated NULL variations as equal.
+    db.session.execute(text("ALTER TABLE cart_items DROP CONSTRAINT uq_cart_product_variation"))
+    db.session.add_all(
+        [
+            CartItem(cart_id=cart_id, product_id=product_id, variation_id=None, quantity=1),
+            CartItem(cart_id=cart_id, product_id=product_id, variation_id=None, quantity=2),
+            CartItem(cart_id=cart_id, product_id=product_id, variation_id=None, quantity=3),
+            CartItem(cart_id=cart_id, product_id=product_id, variation_id=variation_id, quantity=4),
+            CartItem(cart_id=other_cart_id, product_id=product_id, variation_id=None, quantity=5),
+            CartItem(cart_id=other_cart_id, product_id=product_id, variation_id=None, quantity=6),
+        ]
+    )
+    db.session.flush()
+
+    merged = container.repos.cart_item().merge_duplicate_lines([cart_id])
+
+    assert merged == 2
+    lines = db.session.execute(
+        select(CartItem.cart_id, CartItem.variation_id, CartItem.quantity).order_by(CartItem.id)
+    ).all()
+    assert [tuple(line) for line in lines] == [
+        (cart_id, None, 6),
+        (cart_id, variation_id, 4),
+        (other_cart_id, None, 5),
+        (other_cart_id, None, 6),
+    ]
+    db.session.rollback()
+
+
+def test_add_item_waits_for_a_checkout_of_the_cart(
+    app: flask.Flask, client: FlaskClient, add: Callable[..., list[int]]
+) -> None:
+    (product_id,) = add(Product(name="Yerba", price=Decimal("10.00")))
+    token = client.post("/api/v1/cart").get_json()["token"]
+    responses: list[Any] = []
+    add_item = threading.Thread(
+        target=lambda: responses.append(
+            client.post(f"/api/v1/cart/{token}/items", json={"product_id": product_id, "quantity": 1})
+        )
+    )
+
+    with app.app_context(), db.engine.connect() as checkout:
+        # Lock and delete the cart like a checkout does, while an item is being added to it.
+        cart_id = checkout.execute(select(Cart.id).where(Cart.token == token).with_for_update()).scalar_one()
+        add_item.start()
+        add_item.join(timeout=0.5)
+        assert add_item.is_alive()
+        checkout.execute(delete(CartItem).where(CartItem.cart_id == cart_id))
+        checkout.execute(delete(Cart).where(Cart.id == cart_id))
+        checkout.commit()
+    add_item.join()
+
+    (response,) = responses
+    assert response.status_code == HTTPStatus.OK, response.get_json()
+    # The checked out cart is gone, so the item went into a new one.
+    assert response.get_json()["token"] != token
+    assert [item["quantity"] for item in response.get_json()["items"]] == [1]
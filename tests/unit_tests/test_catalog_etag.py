@@ -0,0 +1,100 @@
+from decimal import Decimal
+from http import HTTPStatus
+from typing import Callable
+
+from flask.testing import FlaskClient
+from werkzeug.test import TestResponse
+
+from app.models import Product, Tag, Tip
+
+
+def _get(client: FlaskClient, path: str, etag: str | None = None) -> TestResponse:
+    return client.get(path, headers={"If-None-Match": f'"{etag}"'} if etag else {})
+
+
+def _etag(response: TestResponse) -> str:
+    etag = response.get_etag()[0]
+    assert etag
+    return etag
+
+
+def _assert_not_modified(client: FlaskClient, path: str, etag: str) -> None:
+    response = _get(client, path, etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert _etag(response) == etag
+
+
+def _assert_modified(client: FlaskClient, path: str, etag: str) -> str:
+    """Check the resource changed since the ETag and return its new one."""
+    response = _get(client, path, etag)
+    assert response.status_code == HTTPStatus.OK, response.get_json()
+    new_etag = _etag(response)
+    assert new_etag != etag
+    return new_etag
+
+
+def test_catalog_etags(client: FlaskClient, add: Callable[..., list[int]]) -> None:
+    (product_id,) = add(Product(name="Yerba", price=Decimal("10.00")))
+
+    response = _get(client, "/api/v1/products")
+
+    assert response.status_code == HTTPStatus.OK
+    etag = _etag(response)
+    _assert_not_modified(client, "/api/v1/products", etag)
+    # Each route and query string has its own ETag.
+    assert _get(client, "/api/v1/products?language=es", etag).status_code == HTTPStatus.OK
+    assert _get(client, f"/api/v1/products/{product_id}", etag).status_code == HTTPStatus.OK
+
+
+def test_catalog_writes_invalidate_etags(
+    client: FlaskClient, add: Callable[..., list[int]], admin_headers: dict[str, str]
+) -> None:
+    product_id, other_id = add(
+        Product(name="Yerba", price=Decimal("10.00"), order=0),
+        Product(name="Mate", price=Decimal("20.00"), order=1),
+    )
+    etag = _etag(_get(client, "/api/v1/products"))
+
+    client.put(f"/api/v1/admin/products/{product_id}", json={"price": "12.00"}, headers=admin_headers)
+
+    response = _get(client, "/api/v1/products", etag)
+    assert response.status_code == HTTPStatus.OK
+    assert [Decimal(product["price"]) for product in response.get_json()["data"]] == [
+        Decimal("12.00"),
+        Decimal("20.00"),
+    ]
+    etag = _assert_modified(client, "/api/v1/products", etag)
+
+    # Writes that bypass the ORM bump the catalog versions too.
+    client.patch(
+        "/api/v1/admin/products/reorder",
+        json={"items": [{"id": product_id, "order": 1}, {"id": other_id, "order": 0}]},
+        headers=admin_headers,
+    )
+    etag = _assert_modified(client, "/api/v1/products", etag)
+    client.post(f"/api/v1/admin/products/{product_id}/clone", headers=admin_headers)
+    etag = _assert_modified(client, "/api/v1/products", etag)
+    _assert_not_modified(client, "/api/v1/products", etag)
+
+
+def test_catalog_etags_ignore_unrelated_writes(
+    client: FlaskClient, add: Callable[..., list[int]], admin_headers: dict[str, str]
+) -> None:
+    (product_id,) = add(Product(name="Yerba", price=Decimal("10.00"), stock=5))
+    (tip_id,) = add(Tip(title="Cebar", description="Con agua a 80 grados"))
+    products_etag = _etag(_get(client, "/api/v1/products"))
+    tips_etag = _etag(_get(client, "/api/v1/tips"))
+
+    # Stock isn't part of the catalog payloads, so checkouts don't invalidate them.
+    token = client.post("/api/v1/cart").get_json()["token"]
+    client.post(f"/api/v1/cart/{token}/items", json={"product_id": product_id, "quantity": 2})
+    assert client.post("/api/v1/orders", json={"cart_token": token}).status_code == HTTPStatus.CREATED
+    _assert_not_modified(client, "/api/v1/products", products_etag)
+
+    client.put(f"/api/v1/admin/tips/{tip_id}", json={"title": "Cebar bien"}, headers=admin_headers)
+    _assert_not_modified(client, "/api/v1/products", products_etag)
+    tips_etag = _assert_modified(client, "/api/v1/tips", tips_etag)
+
+    add(Tag(label="Organic"))
+    _assert_modified(client, "/api/v1/products", products_etag)
+    _assert_modified(client, "/api/v1/tips", tips_etag)
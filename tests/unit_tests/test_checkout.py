@@ -0,0 +1,96 @@
+from decimal import Decimal
+from http import HTTPStatus
+from typing import Callable
+
+import flask
+from flask.testing import FlaskClient
+
+from app.db import db
+from app.models import Cart, IdempotencyKey, Order, Product
+
+
+def _cart(client: FlaskClient, product_id: int, quantity: int) -> str:
+    token: str = client.post("/api/v1/cart").get_json()["token"]
+    client.post(f"/api/v1/cart/{token}/items", json={"product_id": product_id, "quantity": quantity})
+    return token
+
+
+def _stock(app: flask.Flask, product_id: int) -> int | None:
+    with app.app_context():
+        product = db.session.get(Product, product_id)
+        assert product is not None
+        return product.stock
+
+
+def test_checkout(app: flask.Flask, client: FlaskClient, add: Callable[..., list[int]]) -> None:
+    (product_id,) = add(Product(name="Yerba", price=Decimal("10.50"), stock=5))
+    token = _cart(client, product_id, 2)
+
+    response = client.post("/api/v1/orders", json={"cart_token": token, "notes": "Sin TACC"})
+
+    assert response.status_code == HTTPStatus.CREATED, response.get_json()
+    order = response.get_json()
+    assert (order["status"], Decimal(order["total"]), order["notes"]) == ("confirmed", Decimal("21.00"), "Sin TACC")
+    assert [(item["product_id"], item["quantity"]) for item in order["items"]] == [(product_id, 2)]
+    assert client.get(f"/api/v1/orders/{order['id']}").get_json()["id"] == order["id"]
+    with app.app_context():
+        assert db.session.query(Cart).count() == 0
+
+    # The cart is gone with the checkout.
+    response = client.post("/api/v1/orders", json={"cart_token": token})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_checkout_retried_with_the_same_key_is_replayed(
+    app: flask.Flask, client: FlaskClient, add: Callable[..., list[int]]
+) -> None:
+    (product_id,) = add(Product(name="Yerba", price=Decimal("10.00"), stock=5))
+    token = _cart(client, product_id, 2)
+    headers = {"Idempotency-Key": "checkout-1"}
+
+    first = client.post("/api/v1/orders", json={"cart_token": token}, headers=headers)
+    retry = client.post("/api/v1/orders", json={"cart_token": token}, headers=headers)
+
+    assert first.status_code == retry.status_code == HTTPStatus.CREATED, retry.get_json()
+    assert retry.get_json() == first.get_json()
+    assert "Idempotent-Replayed" not in first.headers
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert _stock(app, product_id) == 3
+    with app.app_context():
+        assert db.session.query(Order).count() == 1
+
+
+def test_checkout_key_reused_for_another_request(client: FlaskClient, add: Callable[..., list[int]]) -> None:
+    (product_id,) = add(Product(name="Yerba", price=Decimal("10.00")))
+    headers = {"Idempotency-Key": "checkout-1"}
+    client.post("/api/v1/orders", json={"cart_token": _cart(client, product_id, 1)}, headers=headers)
+
+    response = client.post("/api/v1/orders", json={"cart_token": _cart(client, product_id, 1)}, headers=headers)
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_failed_checkout_can_be_retried_with_the_same_key(
+    app: flask.Flask, client: FlaskClient, add: Callable[..., list[int]]
+) -> None:
+    (product_id,) = add(Product(name="Yerba", price=Decimal("10.00"), stock=1))
+    token = _cart(client, product_id, 2)
+    headers = {"Idempotency-Key": "checkout-1"}
+
+    response = client.post("/api/v1/orders", json={"cart_token": token}, headers=headers)
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    # The key was claimed in the failed request's transaction, so it was rolled back with it.
+    with app.app_context():
+        assert db.session.query(IdempotencyKey).count() == 0
+
+    with app.app_context():
+        product = db.session.get(Product, product_id)
+        assert product is not None
+        product.stock = 2
+        db.session.commit()
+    response = client.post("/api/v1/orders", json={"cart_token": token}, headers=headers)
+
+    assert response.status_code == HTTPStatus.CREATED, response.get_json()
+    assert "Idempotent-Replayed" not in response.headers
+    assert _stock(app, product_id) == 0
@@ -0,0 +1,117 @@
+from decimal import Decimal
+from http import HTTPStatus
+from typing import Any, Callable
+
+import flask
+from flask.testing import FlaskClient
+
+from app.db import db
+from app.models import (
+    EntityTag,
+    EntityType,
+    Product,
+    ProductTranslation,
+    ProductVariation,
+    ProductVariationTranslation,
+    Tag,
+)
+
+
+def _add_products(add: Callable[..., list[int]]) -> tuple[int, int]:
+    """Add a product with translations, variations and a tag, and a bare one. Returns their ids."""
+    (tag_id,) = add(Tag(label="Organic"))
+    product_id, bare_id = add(
+        Product(
+            name="Yerba",
+            description="Mild",
+            price=Decimal("10.00"),
+            stock=5,
+            translations={"es": ProductTranslation(language="es", name="Yerba mate", description="Suave")},
+            variations=[
+                ProductVariation(
+                    name="500g",
+                    price=Decimal("10.00"),
+                    stock=2,
+                    translations={"es": ProductVariationTranslation(language="es", name="500 g")},
+                ),
+                ProductVariation(name="1kg", price=Decimal("18.00"), order=1),
+            ],
+        ),
+        Product(name="Termo", price=Decimal("30.00")),
+    )
+    add(EntityTag(entity_type=EntityType.product, entity_id=product_id, tag_id=tag_id))
+    return product_id, bare_id
+
+
+def _assert_is_clone(clone: dict[str, Any], original_id: int) -> None:
+    assert clone["id"] != original_id
+    assert clone["name"] == "Yerba (Copy)"
+    assert clone["description"] == "Mild"
+    assert clone["is_active"] is False
+    # Tracked stock isn't shared with the original.
+    assert clone["stock"] == 0
+    assert clone["translations"] == [{"language": "es", "name": "Yerba mate (Copy)", "description": "Suave"}]
+    assert [(v["name"], v["stock"], v["translations"]) for v in clone["variations"]] == [
+        ("500g", 0, [{"language": "es", "name": "500 g"}]),
+        ("1kg", None, []),
+    ]
+    assert [tag["label"] for tag in clone["tags"]] == ["Organic"]
+
+
+def test_clone_product(
+    app: flask.Flask, client: FlaskClient, add: Callable[..., list[int]], admin_headers: dict[str, str]
+) -> None:
+    product_id, _ = _add_products(add)
+
+    response = client.post(f"/api/v1/admin/products/{product_id}/clone", headers=admin_headers)
+
+    assert response.status_code == HTTPStatus.CREATED, response.get_json()
+    _assert_is_clone(response.get_json(), product_id)
+    with app.app_context():
+        original = db.session.get(Product, product_id)
+        assert original is not None
+        assert (original.name, original.stock, [v.stock for v in original.variations]) == ("Yerba", 5, [2, None])
+
+
+def test_clone_missing_product(client: FlaskClient, admin_headers: dict[str, str]) -> None:
+    response = client.post("/api/v1/admin/products/1/clone", headers=admin_headers)
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_clone_products(
+    app: flask.Flask, client: FlaskClient, add: Callable[..., list[int]], admin_headers: dict[str, str]
+) -> None:
+    product_id, bare_id = _add_products(add)
+
+    response = client.post(
+        "/api/v1/admin/products/clone", json={"product_ids": [bare_id, product_id, bare_id]}, headers=admin_headers
+    )
+
+    assert response.status_code == HTTPStatus.CREATED, response.get_json()
+    bare_clone, clone = response.get_json()["data"]
+    _assert_is_clone(clone, product_id)
+    assert (bare_clone["name"], bare_clone["stock"], bare_clone["variations"], bare_clone["tags"]) == (
+        "Termo (Copy)",
+        None,
+        [],
+        [],
+    )
+    with app.app_context():
+        assert db.session.query(Product).count() == 4
+
+
+def test_clone_products_with_a_missing_one_clones_none(
+    app: flask.Flask, client: FlaskClient, add: Callable[..., list[int]], admin_headers: dict[str, str]
+) -> None:
+    product_id, _ = _add_products(add)
+
+    response = client.post(
+        "/api/v1/admin/products/clone", json={"product_ids": [product_id, product_id + 100]}, headers=admin_headers
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    with app.app_context():
+        assert db.session.query(Product).count() == 2
+        assert db.session.query(ProductVariation).count() == 2
+        assert db.session.query(EntityTag).count() == 1
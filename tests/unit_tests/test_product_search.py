@@ -0,0 +1,71 @@
+from decimal import Decimal
+from http import HTTPStatus
+from typing import Callable
+
+from flask.testing import FlaskClient
+
+from app.models import EntityTag, EntityType, Product, Tag
+
+
+def _search(client: FlaskClient, term: str, language: str | None = None) -> list[str]:
+    params = {"search": term, **({"language": language} if language else {})}
+    response = client.get("/api/v1/products", query_string=params)
+    assert response.status_code == HTTPStatus.OK, response.get_json()
+    return [product["name"] for product in response.get_json()["data"]]
+
+
+def test_search_follows_product_writes(client: FlaskClient, admin_headers: dict[str, str]) -> None:
+    response = client.post(
+        "/api/v1/admin/products",
+        json={"name": "Yerba Canarias", "description": "Molienda gruesa", "price": "10.00"},
+        headers=admin_headers,
+    )
+    assert response.status_code == HTTPStatus.CREATED, response.get_json()
+    product_id = response.get_json()["id"]
+
+    assert _search(client, "canar") == ["Yerba Canarias"]
+    assert _search(client, "molienda") == ["Yerba Canarias"]
+
+    client.put(f"/api/v1/admin/products/{product_id}", json={"name": "Yerba Rosamonte"}, headers=admin_headers)
+
+    assert _search(client, "canarias") == []
+    assert _search(client, "rosamonte") == ["Yerba Rosamonte"]
+
+    client.post(
+        f"/api/v1/admin/products/{product_id}/translations",
+        json={"language": "en", "name": "Rosamonte Café Yerba"},
+        headers=admin_headers,
+    )
+
+    # Translations are searched accent-insensitively in their language, or in every language when none is given.
+    assert _search(client, "cafe", "en") == ["Rosamonte Café Yerba"]
+    assert _search(client, "cafe") == ["Yerba Rosamonte"]
+    assert _search(client, "cafe", "es") == []
+
+
+def test_search_follows_variation_and_tag_writes(
+    client: FlaskClient, add: Callable[..., list[int]], admin_headers: dict[str, str]
+) -> None:
+    (tag_id,) = add(Tag(label="Organic"))
+    product_id, _ = add(Product(name="Mate", price=Decimal("20.00")), Product(name="Termo", price=Decimal("30.00")))
+    add(EntityTag(entity_type=EntityType.product, entity_id=product_id, tag_id=tag_id))
+
+    assert _search(client, "organic") == ["Mate"]
+
+    client.post(f"/api/v1/admin/products/{product_id}/variations", json={"name": "Calabaza"}, headers=admin_headers)
+    client.put(f"/api/v1/admin/tags/{tag_id}", json={"label": "Artesanal"}, headers=admin_headers)
+
+    assert _search(client, "calabaza") == ["Mate"]
+    assert _search(client, "organic") == []
+    assert _search(client, "artesanal") == ["Mate"]
+
+
+def test_search_finds_clones(client: FlaskClient, add: Callable[..., list[int]], admin_headers: dict[str, str]) -> None:
+    (product_id,) = add(Product(name="Bombilla", price=Decimal("5.00")))
+
+    client.post(f"/api/v1/admin/products/{product_id}/clone", headers=admin_headers)
+
+    # Clones start inactive, so only admins find them.
+    response = client.get("/api/v1/admin/products", query_string={"search": "copy"}, headers=admin_headers)
+    assert [product["name"] for product in response.get_json()["data"]] == ["Bombilla (Copy)"]
+    assert _search(client, "bombilla") == ["Bombilla"]
@@ -0,0 +1,89 @@
+from decimal import Decimal
+from http import HTTPStatus
+from typing import Any, Callable
+
+import flask
+import pytest
+from flask.testing import FlaskClient
+from sqlalchemy import select
+
+from app.db import db
+from app.models import Product, ProductVariation, Tag, Tip
+
+
+@pytest.mark.parametrize(
+    ("path", "model", "entities"),
+    [
+        (
+            "/api/v1/admin/products/reorder",
+            Product,
+            lambda: [Product(name=name, price=Decimal("1.00"), order=i) for i, name in enumerate("abc")],
+        ),
+        ("/api/v1/admin/tags/reorder", Tag, lambda: [Tag(label=label, order=i) for i, label in enumerate("abc")]),
+        (
+            "/api/v1/admin/tips/reorder",
+            Tip,
+            lambda: [Tip(title=title, description=title, order=i) for i, title in enumerate("abc")],
+        ),
+    ],
+)
+def test_reorder(
+    app: flask.Flask,
+    client: FlaskClient,
+    add: Callable[..., list[int]],
+    admin_headers: dict[str, str],
+    path: str,
+    model: type[Product] | type[Tag] | type[Tip],
+    entities: Callable[[], list[Any]],
+) -> None:
+    first_id, second_id, third_id = add(*entities())
+
+    response = client.patch(
+        path,
+        json={"items": [{"id": first_id, "order": 2}, {"id": second_id, "order": 1}, {"id": third_id, "order": 0}]},
+        headers=admin_headers,
+    )
+
+    assert response.status_code == HTTPStatus.OK, response.get_json()
+    # Only the records that moved are updated.
+    assert sorted(response.get_json()["updated_ids"]) == [first_id, third_id]
+    with app.app_context():
+        orders = db.session.execute(select(model.id, model.order).order_by(model.id)).all()
+        assert [tuple(row) for row in orders] == [(first_id, 2), (second_id, 1), (third_id, 0)]
+
+
+def test_reorder_variations_of_a_product(
+    app: flask.Flask, client: FlaskClient, add: Callable[..., list[int]], admin_headers: dict[str, str]
+) -> None:
+    product_id, other_id = add(
+        Product(name="Mate", price=Decimal("20.00")),
+        Product(name="Termo", price=Decimal("30.00")),
+    )
+    first_id, second_id, other_variation_id = add(
+        ProductVariation(product_id=product_id, name="Calabaza", order=0),
+        ProductVariation(product_id=product_id, name="Madera", order=1),
+        ProductVariation(product_id=other_id, name="Acero", order=0),
+    )
+
+    response = client.patch(
+        f"/api/v1/admin/products/{product_id}/variations/reorder",
+        json={
+            "items": [
+                {"id": first_id, "order": 1},
+                {"id": second_id, "order": 0},
+                {"id": other_variation_id, "order": 5},
+            ]
+        },
+        headers=admin_headers,
+    )
+
+    assert response.status_code == HTTPStatus.OK, response.get_json()
+    assert sorted(response.get_json()["updated_ids"]) == [first_id, second_id]
+    with app.app_context():
+        product = db.session.get(Product, product_id)
+        assert product is not None
+        assert [variation.name for variation in product.variations] == ["Madera", "Calabaza"]
+        # Variations of other products are left alone.
+        other_variation = db.session.get(ProductVariation, other_variation_id)
+        assert other_variation is not None
+        assert other_variation.order == 0
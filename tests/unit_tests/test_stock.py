@@ -0,0 +1,148 @@
+from decimal import Decimal
+from http import HTTPStatus
+from typing import Any, Callable
+
+import flask
+from flask.testing import FlaskClient
+
+from app.container import ApplicationContainer
+from app.db import db
+from app.models import Order, OrderStatus, Product, ProductVariation
+
+CartLine = tuple[int, int | None, int]
+
+
+def _checkout(client: FlaskClient, lines: list[CartLine]) -> tuple[str, Any]:
+    token = client.post("/api/v1/cart").get_json()["token"]
+    for product_id, variation_id, quantity in lines:
+        response = client.post(
+            f"/api/v1/cart/{token}/items",
+            json={"product_id": product_id, "variation_id": variation_id, "quantity": quantity},
+        )
+        assert response.status_code == HTTPStatus.OK, response.get_json()
+    return token, client.post("/api/v1/orders", json={"cart_token": token})
+
+
+def _stocks(app: flask.Flask, product_ids: list[int], variation_ids: list[int]) -> list[int | None]:
+    with app.app_context():
+        products = [db.session.get(Product, product_id) for product_id in product_ids]
+        variations = [db.session.get(ProductVariation, variation_id) for variation_id in variation_ids]
+        return [entity.stock for entity in [*products, *variations] if entity is not None]
+
+
+def _add_catalog(add: Callable[..., list[int]]) -> tuple[int, int, int, int]:
+    """Add a tracked product, an untracked one, and a product with a tracked variation. Returns their ids."""
+    tracked_id, untracked_id, with_variation_id = add(
+        Product(name="Yerba", price=Decimal("10.00"), stock=5),
+        Product(name="Termo", price=Decimal("30.00")),
+        Product(
+            name="Mate",
+            price=Decimal("20.00"),
+            variations=[ProductVariation(name="Calabaza", price=Decimal("25.00"), stock=3)],
+        ),
+    )
+    (variation_id,) = add(ProductVariation(product_id=with_variation_id, name="Madera", stock=1))
+    return tracked_id, untracked_id, with_variation_id, variation_id
+
+
+def test_checkout_takes_stock(app: flask.Flask, client: FlaskClient, add: Callable[..., list[int]]) -> None:
+    tracked_id, untracked_id, with_variation_id, variation_id = _add_catalog(add)
+
+    _, response = _checkout(
+        client, [(tracked_id, None, 2), (untracked_id, None, 50), (with_variation_id, variation_id, 1)]
+    )
+
+    assert response.status_code == HTTPStatus.CREATED, response.get_json()
+    assert _stocks(app, [tracked_id, untracked_id], [variation_id]) == [3, None, 0]
+
+
+def test_checkout_short_of_stock_takes_nothing(
+    app: flask.Flask, client: FlaskClient, add: Callable[..., list[int]]
+) -> None:
+    tracked_id, _, with_variation_id, variation_id = _add_catalog(add)
+
+    token, response = _checkout(client, [(tracked_id, None, 2), (with_variation_id, variation_id, 2)])
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.get_json()["error_description"] == "Not enough stock of variation 'Madera'"
+    # The reservation of the product was rolled back along with the checkout.
+    assert _stocks(app, [tracked_id], [variation_id]) == [5, 1]
+    assert len(client.get(f"/api/v1/cart/{token}").get_json()["items"]) == 2
+    with app.app_context():
+        assert db.session.query(Order).count() == 0
+
+
+def test_cancelling_releases_stock(
+    app: flask.Flask, client: FlaskClient, add: Callable[..., list[int]], admin_headers: dict[str, str]
+) -> None:
+    tracked_id, untracked_id, with_variation_id, variation_id = _add_catalog(add)
+    _, response = _checkout(
+        client, [(tracked_id, None, 2), (untracked_id, None, 1), (with_variation_id, variation_id, 1)]
+    )
+    order_id = response.get_json()["id"]
+
+    response = client.patch(
+        f"/api/v1/admin/orders/{order_id}/status", json={"status": "cancelled"}, headers=admin_headers
+    )
+
+    assert response.status_code == HTTPStatus.OK, response.get_json()
+    assert response.get_json()["status"] == "cancelled"
+    assert _stocks(app, [tracked_id, untracked_id], [variation_id]) == [5, None, 1]
+
+    # Cancelling it again doesn't release the stock twice.
+    response = client.patch(
+        f"/api/v1/admin/orders/{order_id}/status", json={"status": "cancelled"}, headers=admin_headers
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert _stocks(app, [tracked_id], [variation_id]) == [5, 1]
+
+
+def test_cancel_order_releases_stock(
+    app: flask.Flask, client: FlaskClient, add: Callable[..., list[int]], container: ApplicationContainer
+) -> None:
+    tracked_id, _, _, _ = _add_catalog(add)
+    _, response = _checkout(client, [(tracked_id, None, 4)])
+    order_id = response.get_json()["id"]
+
+    with app.app_context():
+        order = container.controllers.order().cancel_order(order_id)
+        db.session.commit()
+        assert order.status == OrderStatus.cancelled
+
+    assert _stocks(app, [tracked_id], []) == [5]
+
+
+def test_restoring_a_cancelled_order_takes_stock_again(
+    app: flask.Flask, client: FlaskClient, add: Callable[..., list[int]], admin_headers: dict[str, str]
+) -> None:
+    tracked_id, _, with_variation_id, variation_id = _add_catalog(add)
+    _, response = _checkout(client, [(tracked_id, None, 2), (with_variation_id, variation_id, 1)])
+    order_id = response.get_json()["id"]
+    client.patch(f"/api/v1/admin/orders/{order_id}/status", json={"status": "cancelled"}, headers=admin_headers)
+
+    response = client.patch(
+        f"/api/v1/admin/orders/{order_id}/status", json={"status": "processed"}, headers=admin_headers
+    )
+
+    assert response.status_code == HTTPStatus.OK, response.get_json()
+    assert response.get_json()["status"] == "processed"
+    assert _stocks(app, [tracked_id], [variation_id]) == [3, 0]
+
+
+def test_restoring_a_cancelled_order_fails_without_stock(
+    app: flask.Flask, client: FlaskClient, add: Callable[..., list[int]], admin_headers: dict[str, str]
+) -> None:
+    tracked_id, _, _, _ = _add_catalog(add)
+    _, response = _checkout(client, [(tracked_id, None, 2)])
+    order_id = response.get_json()["id"]
+    client.patch(f"/api/v1/admin/orders/{order_id}/status", json={"status": "cancelled"}, headers=admin_headers)
+    # Sold elsewhere in the meantime.
+    _checkout(client, [(tracked_id, None, 4)])
+
+    response = client.patch(
+        f"/api/v1/admin/orders/{order_id}/status", json={"status": "confirmed"}, headers=admin_headers
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert _stocks(app, [tracked_id], []) == [1]
+    assert client.get(f"/api/v1/admin/orders/{order_id}", headers=admin_headers).get_json()["status"] == "cancelled"